@@ -0,0 +1,93 @@
+"""doubles pair key
+
+Revision ID: 8d3b6a2f41c7
+Revises: 5c0e1f7a9b21
+Create Date: 2026-10-17 10:00:41.117305
+
+"""
+import collections
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d3b6a2f41c7'
+down_revision: Union[str, None] = '5c0e1f7a9b21'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _pair_player(order: str) -> str:
+    return (
+        "(SELECT player.id FROM player_doubles_association "
+        "JOIN player ON player.id = player_doubles_association.player_id "
+        "WHERE player_doubles_association.pair_id = doubles_pair.id "
+        f"ORDER BY player.url {order} LIMIT 1)"
+    )
+
+
+def _merge_duplicate_pairs() -> None:
+    """Keep only the lowest id of the pairs with the same two players, the unique key needs it."""
+    connection = op.get_bind()
+    players = collections.defaultdict(set)
+    for pair_id, player_id in connection.execute(
+        sa.text('SELECT pair_id, player_id FROM player_doubles_association')
+    ):
+        players[pair_id].add(player_id)
+    keep = {}
+    for pair_id in sorted(players):
+        if len(players[pair_id]) == 2:
+            keep.setdefault(frozenset(players[pair_id]), pair_id)
+    duplicates = {
+        pair_id: keep[frozenset(members)]
+        for pair_id, members in players.items()
+        if len(members) == 2 and keep[frozenset(members)] != pair_id
+    }
+    for duplicate, kept in duplicates.items():
+        ids = {'duplicate': duplicate, 'kept': kept}
+        for table in ('home_pair_result', 'away_pair_result'):
+            connection.execute(
+                sa.text(f'UPDATE {table} SET doubles_pair_id = :kept WHERE doubles_pair_id = :duplicate'),
+                ids,
+            )
+        connection.execute(
+            sa.text(
+                'INSERT OR IGNORE INTO pair_teams_association (team_id, pair_id) '
+                'SELECT team_id, :kept FROM pair_teams_association WHERE pair_id = :duplicate'
+            ),
+            ids,
+        )
+        for table in ('pair_teams_association', 'player_doubles_association'):
+            connection.execute(sa.text(f'DELETE FROM {table} WHERE pair_id = :duplicate'), ids)
+        connection.execute(sa.text('DELETE FROM doubles_pair WHERE id = :duplicate'), ids)
+
+
+def upgrade() -> None:
+    _merge_duplicate_pairs()
+    # ### commands auto generated by Alembic - please adjust! ###
+    with op.batch_alter_table('doubles_pair') as batch_op:
+        batch_op.add_column(sa.Column('player_a_id', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('player_b_id', sa.Integer(), nullable=True))
+        batch_op.create_unique_constraint(batch_op.f('uq_doubles_pair_player_a_id'), ['player_a_id', 'player_b_id'])
+        batch_op.create_foreign_key(batch_op.f('fk_doubles_pair_player_a_id_player'), 'player', ['player_a_id'], ['id'])
+        batch_op.create_foreign_key(batch_op.f('fk_doubles_pair_player_b_id_player'), 'player', ['player_b_id'], ['id'])
+    # ### end Alembic commands ###
+    op.execute(
+        f"UPDATE doubles_pair SET player_a_id = {_pair_player('ASC')}, "
+        f"player_b_id = {_pair_player('DESC')} "
+        "WHERE (SELECT count(*) FROM player_doubles_association "
+        "WHERE player_doubles_association.pair_id = doubles_pair.id) = 2"
+    )
+
+
+def downgrade() -> None:
+    # ### commands auto generated by Alembic - please adjust! ###
+    with op.batch_alter_table('doubles_pair') as batch_op:
+        batch_op.drop_constraint(batch_op.f('fk_doubles_pair_player_b_id_player'), type_='foreignkey')
+        batch_op.drop_constraint(batch_op.f('fk_doubles_pair_player_a_id_player'), type_='foreignkey')
+        batch_op.drop_constraint(batch_op.f('uq_doubles_pair_player_a_id'), type_='unique')
+        batch_op.drop_column('player_b_id')
+        batch_op.drop_column('player_a_id')
+    # ### end Alembic commands ###
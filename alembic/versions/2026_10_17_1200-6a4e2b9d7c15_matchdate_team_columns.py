@@ -0,0 +1,64 @@
+"""matchdate team columns
+
+Revision ID: 6a4e2b9d7c15
+Revises: 2f7c9e1d5a36
+Create Date: 2026-10-17 12:00:41.204417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6a4e2b9d7c15'
+down_revision: Union[str, None] = '2f7c9e1d5a36'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('matchdate', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('away_team_id', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('home_team_id', sa.Integer(), nullable=True))
+        batch_op.create_index(batch_op.f('ix_matchdate_away_team_id'), ['away_team_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_matchdate_home_team_id'), ['home_team_id'], unique=False)
+        batch_op.create_foreign_key(batch_op.f('fk_matchdate_away_team_id_team'), 'team', ['away_team_id'], ['id'])
+        batch_op.create_foreign_key(batch_op.f('fk_matchdate_home_team_id_team'), 'team', ['home_team_id'], ['id'])
+
+    for side in ('home', 'away'):
+        op.execute(
+            f"UPDATE matchdate SET {side}_team_id = ("
+            f"SELECT team_id FROM matchdate_{side}_team_assoc "
+            f"WHERE matchdate_{side}_team_assoc.match_date_id = matchdate.id)"
+        )
+
+    op.drop_index(op.f('ix_matchdate_home_team_assoc_team_id'), table_name='matchdate_home_team_assoc')
+    op.drop_index(op.f('ix_matchdate_away_team_assoc_team_id'), table_name='matchdate_away_team_assoc')
+    op.drop_table('matchdate_home_team_assoc')
+    op.drop_table('matchdate_away_team_assoc')
+
+
+def downgrade() -> None:
+    for side in ('away', 'home'):
+        op.create_table(f'matchdate_{side}_team_assoc',
+        sa.Column('match_date_id', sa.Integer(), nullable=False),
+        sa.Column('team_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['match_date_id'], ['matchdate.id'], name=op.f(f'fk_matchdate_{side}_team_assoc_match_date_id_matchdate')),
+        sa.ForeignKeyConstraint(['team_id'], ['team.id'], name=op.f(f'fk_matchdate_{side}_team_assoc_team_id_team')),
+        sa.PrimaryKeyConstraint('match_date_id', 'team_id', name=op.f(f'pk_matchdate_{side}_team_assoc'))
+        )
+        op.create_index(op.f(f'ix_matchdate_{side}_team_assoc_team_id'), f'matchdate_{side}_team_assoc', ['team_id', 'match_date_id'], unique=False)
+        op.execute(
+            f"INSERT INTO matchdate_{side}_team_assoc (match_date_id, team_id) "
+            f"SELECT id, {side}_team_id FROM matchdate WHERE {side}_team_id IS NOT NULL"
+        )
+
+    with op.batch_alter_table('matchdate', schema=None) as batch_op:
+        batch_op.drop_constraint(batch_op.f('fk_matchdate_home_team_id_team'), type_='foreignkey')
+        batch_op.drop_constraint(batch_op.f('fk_matchdate_away_team_id_team'), type_='foreignkey')
+        batch_op.drop_index(batch_op.f('ix_matchdate_home_team_id'))
+        batch_op.drop_index(batch_op.f('ix_matchdate_away_team_id'))
+        batch_op.drop_column('home_team_id')
+        batch_op.drop_column('away_team_id')
@@ -0,0 +1,58 @@
+"""matchdate utc epoch and local date
+
+Revision ID: b3c81f0e6d24
+Revises: 6a4e2b9d7c15
+Create Date: 2026-10-17 13:00:12.861530
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import pendulum
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3c81f0e6d24'
+down_revision: Union[str, None] = '6a4e2b9d7c15'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+matchdate = sa.table(
+    'matchdate',
+    sa.column('id', sa.Integer()),
+    sa.column('date_time', sa.DateTime()),
+    sa.column('utc_epoch', sa.Integer()),
+    sa.column('local_date', sa.Date()),
+)
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('matchdate', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('utc_epoch', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('local_date', sa.Date(), nullable=True))
+
+    # stored times are local wall time, convert them the way MatchDate does
+    connection = op.get_bind()
+    for id, date_time in connection.execute(sa.select(matchdate.c.id, matchdate.c.date_time)).all():
+        local = pendulum.instance(date_time, tz=pendulum.local_timezone())
+        connection.execute(
+            matchdate.update()
+            .where(matchdate.c.id == id)
+            .values(utc_epoch=int(local.timestamp()), local_date=local.date())
+        )
+
+    with op.batch_alter_table('matchdate', schema=None) as batch_op:
+        batch_op.alter_column('utc_epoch', existing_type=sa.Integer(), nullable=False)
+        batch_op.alter_column('local_date', existing_type=sa.Date(), nullable=False)
+        batch_op.create_index(batch_op.f('ix_matchdate_local_date'), ['local_date'], unique=False)
+        batch_op.create_index(batch_op.f('ix_matchdate_utc_epoch'), ['utc_epoch'], unique=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('matchdate', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_matchdate_utc_epoch'))
+        batch_op.drop_index(batch_op.f('ix_matchdate_local_date'))
+        batch_op.drop_column('local_date')
+        batch_op.drop_column('utc_epoch')
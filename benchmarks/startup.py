@@ -0,0 +1,66 @@
+"""
+Measure how long ``mada`` takes to start.
+
+Runs every command line in a fresh interpreter a number of times and reports the
+median wall time together with the cumulative import time of ``matchdates`` and of
+the heaviest dependencies, as reported by ``python -X importtime``. Subcommands
+are invoked with ``--help`` so they are loaded without touching the network or
+the database.
+
+    python benchmarks/startup.py [--repeat N]
+"""
+import argparse
+import re
+import statistics
+import subprocess
+import sys
+import time
+
+
+COMMANDS = [
+    ["--help"],
+    ["upcoming", "--help"],
+    ["reload", "--help"],
+]
+TRACKED = ["matchdates", "sqlalchemy", "scrapy", "pendulum", "tabulate", "thefuzz"]
+SCRIPT = "import sys; from matchdates.cli import main; main(sys.argv[1:], prog_name='mada')"
+
+
+def run(args: list[str], importtime: bool = False) -> subprocess.CompletedProcess:
+    flags = ["-X", "importtime"] if importtime else []
+    return subprocess.run(
+        [sys.executable, *flags, "-c", SCRIPT, *args], capture_output=True, text=True
+    )
+
+
+def import_times(stderr: str) -> dict[str, float]:
+    """Cumulative import time in ms of the tracked top level packages."""
+    times = {}
+    for line in stderr.splitlines():
+        if match := re.match(r"import time:\s+\d+ \|\s+(\d+) \|\s?(\s*)(\S+)$", line):
+            cumulative, indent, module = match.groups()
+            if module in TRACKED and module not in times:
+                times[module] = int(cumulative) / 1000
+    return times
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    repeat = parser.parse_args().repeat
+
+    for args in COMMANDS:
+        wall = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            run(args).check_returncode()
+            wall.append((time.perf_counter() - start) * 1000)
+        imports = import_times(run(args, importtime=True).stderr)
+        print(f"mada {' '.join(args)}: {statistics.median(wall):.0f} ms")
+        for module in TRACKED:
+            if module in imports:
+                print(f"  {module:<12} {imports[module]:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,12 @@
-from . import cli, common_data, data2orm, settings
+import importlib
+from typing import Any
 
 
 __all__ = ["cli", "common_data", "data2orm", "settings"]
+
+
+def __getattr__(name: str) -> Any:
+    # submodules are imported on first use to keep ``mada`` startup fast
+    if name in __all__:
+        return importlib.import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,123 @@
+"""
+Compressed, content addressed archive of crawled pages.
+
+Every page body is stored once, gzipped, under its sha256. An index records
+which url was fetched by which spider callback and when, so the latest version
+of every page can be parsed again offline after a parser fix.
+"""
+from __future__ import annotations
+
+import concurrent.futures
+import functools
+import gzip
+import hashlib
+import itertools
+import pathlib
+import sqlite3
+import time
+from typing import Any, Iterator
+
+import scrapy
+
+from . import settings
+
+
+def default_archive_dir() -> pathlib.Path:
+    return settings.get_crawl_datadir() / "archive"
+
+
+class PageArchive:
+    def __init__(self, path: pathlib.Path | str):
+        self.path = pathlib.Path(path)
+        (self.path / "objects").mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(self.path / "index.sqlite")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS pages ("
+            "url TEXT NOT NULL, spider TEXT NOT NULL, callback TEXT NOT NULL, "
+            "body_hash TEXT NOT NULL, encoding TEXT, fetched REAL NOT NULL, "
+            "PRIMARY KEY (url, spider, callback, body_hash))"
+        )
+
+    def object_path(self, body_hash: str) -> pathlib.Path:
+        return self.path / "objects" / body_hash[:2] / f"{body_hash[2:]}.gz"
+
+    def store(
+        self, url: str, body: bytes, *, spider: str, callback: str, encoding: str | None = None
+    ) -> str:
+        """Add a page to the archive, writing the body only if it is not there yet."""
+        body_hash = hashlib.sha256(body).hexdigest()
+        object_path = self.object_path(body_hash)
+        if not object_path.exists():
+            object_path.parent.mkdir(exist_ok=True)
+            tmp_path = object_path.with_suffix(".tmp")
+            tmp_path.write_bytes(gzip.compress(body))
+            tmp_path.replace(object_path)
+        with self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?)",
+                (url, spider, callback, body_hash, encoding, time.time()),
+            )
+        return body_hash
+
+    def load(self, body_hash: str) -> bytes:
+        return gzip.decompress(self.object_path(body_hash).read_bytes())
+
+    def latest(self, spider: str, callback: str) -> list[tuple[str, str, str | None]]:
+        """The (url, body hash, encoding) of the most recent version of every page."""
+        return self.connection.execute(
+            "SELECT url, body_hash, encoding, max(fetched) FROM pages "
+            "WHERE spider = ? AND callback = ? GROUP BY url ORDER BY url",
+            (spider, callback),
+        ).fetchall()
+
+    def close(self) -> None:
+        self.connection.close()
+
+
+@functools.cache
+def _spider(spider_cls: type[scrapy.Spider]) -> scrapy.Spider:
+    return spider_cls()
+
+
+def _parse_page(
+    spider_cls: type[scrapy.Spider],
+    callback: str,
+    url: str,
+    object_path: pathlib.Path,
+    encoding: str | None,
+) -> list[Any]:
+    response = scrapy.http.HtmlResponse(
+        url=url, body=gzip.decompress(object_path.read_bytes()), encoding=encoding or "utf-8"
+    )
+    return [
+        item for item in getattr(_spider(spider_cls), callback)(response)
+        if not isinstance(item, scrapy.http.Request)
+    ]
+
+
+def replay(
+    spider_cls: type[scrapy.Spider],
+    archive: PageArchive | None = None,
+    *,
+    callback: str = "parse_matchdetail",
+    processes: int | None = None,
+) -> Iterator[Any]:
+    """
+    Parse the latest archived version of every page of a spider callback.
+
+    Pages are parsed directly with the spider's callback, without going through
+    the scrapy engine, spread over ``processes`` worker processes (one per CPU
+    by default, ``processes=1`` parses in this process).
+    """
+    archive = archive or PageArchive(default_archive_dir())
+    pages = [
+        (spider_cls, callback, url, archive.object_path(body_hash), encoding)
+        for url, body_hash, encoding, _ in archive.latest(spider_cls.name, callback)
+    ]
+    if processes == 1:
+        yield from itertools.chain.from_iterable(itertools.starmap(_parse_page, pages))
+        return
+    with concurrent.futures.ProcessPoolExecutor(max_workers=processes) as pool:
+        yield from itertools.chain.from_iterable(
+            pool.map(_parse_page, *zip(*pages), chunksize=16) if pages else []
+        )
@@ -0,0 +1,91 @@
+"""
+On disk cache for query and aggregate results.
+
+Results are stored per function and arguments, together with the data generation
+(:mod:`matchdates.orm.generation`) they were computed at. Writing crawled data
+bumps the generation, which invalidates all entries at once, so between crawls
+repeated questions are answered from the cache.
+
+Databases in memory are never cached, their generation means nothing to the
+next process.
+"""
+from __future__ import annotations
+
+import functools
+import hashlib
+import os
+import pathlib
+import pickle
+import tempfile
+from typing import Any, Callable, ParamSpec, TypeVar
+
+from . import orm, settings
+
+
+__all__ = ["cache_dir", "clear", "memoize"]
+
+
+P = ParamSpec("P")
+T = TypeVar("T")
+
+
+def cache_dir() -> pathlib.Path:
+    return settings.get_crawl_datadir() / "cache"
+
+
+def _database() -> str | None:
+    """The database file of the current context, ``None`` if it is in memory."""
+    return orm.db.database_file()
+
+
+def _entry_path(database: str, name: str, args: tuple, kwargs: dict[str, Any]) -> pathlib.Path:
+    key = repr((database, name, args, sorted(kwargs.items())))
+    return cache_dir() / f"{hashlib.sha256(key.encode()).hexdigest()}.pickle"
+
+
+def _load(path: pathlib.Path, generation: int) -> tuple[bool, Any]:
+    try:
+        with path.open("rb") as stream:
+            cached_generation, result = pickle.load(stream)
+    except (OSError, EOFError, pickle.UnpicklingError):
+        return False, None
+    return cached_generation == generation, result
+
+
+def _store(path: pathlib.Path, generation: int, result: Any) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    with os.fdopen(fd, "wb") as stream:
+        pickle.dump((generation, result), stream)
+    os.replace(tmp_name, path)
+
+
+def memoize(func: Callable[P, T]) -> Callable[P, T]:
+    """
+    Cache the results of ``func`` on disk until the data generation changes.
+
+    The arguments must have a stable ``repr`` and the result must be picklable,
+    so pass ids and return plain values rather than ORM instances.
+    """
+    name = f"{func.__module__}.{func.__qualname__}"
+
+    @functools.wraps(func)
+    def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+        database = _database()
+        if database is None:
+            return func(*args, **kwargs)
+        generation = orm.generation.current(orm.db.get_session())
+        path = _entry_path(database, name, args, kwargs)
+        hit, result = _load(path, generation)
+        if not hit:
+            result = func(*args, **kwargs)
+            _store(path, generation, result)
+        return result
+
+    return wrapper
+
+
+def clear() -> None:
+    """Remove all cached results."""
+    for path in cache_dir().glob("*.pickle"):
+        path.unlink(missing_ok=True)
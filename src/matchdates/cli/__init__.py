@@ -1,24 +1,11 @@
+"""
+The ``mada`` command line interface.
+
+Subcommand modules are imported by :class:`main.LazyGroup` when their command is run.
+"""
 from .main import main
-from .reload import reload
-from .scan import scan
-from .on_date import on_date
-from .upcoming import upcoming
-from .list_items import list_items
-from .show import show
-from .move import move
-from . import calendar
-from . import results
 
 
 __all__ = [
     "main",
-    "reload",
-    "scan",
-    "on_date",
-    "upcoming",
-    "list_items",
-    "show",
-    "calendar",
-    "move",
-    "results",
 ]
@@ -59,7 +59,9 @@ def calendar(month, rules, year):
     cal = Month(first=pendulum.now().replace(
         month=month, year=year, day=1))
     matches = orm.MatchDate.filter(
-        orm.MatchDate.date_time > cal.first, orm.MatchDate.date_time < cal.last
+        orm.MatchDate.utc_epoch > orm.matchdate.epoch(cal.first),
+        orm.MatchDate.utc_epoch < orm.matchdate.epoch(cal.last),
+        options=orm.profiles.calendar(),
     )
 
     bcza = orm.Club.one_or_none(name="BC Zürich-Affoltern")
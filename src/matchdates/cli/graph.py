@@ -1,9 +1,11 @@
-import click
+from typing import Iterable
 
+import click
+import sqlalchemy as sqla
 import tabulate
 
-from .. import graph_utils
-from . import main
+from .. import graph_utils, orm, result_graph, settings
+from .main import main
 
 
 @main.group
@@ -14,26 +16,65 @@ def graph():
 @graph.command("update")
 def update():
     """Update the internal denormalized data representation."""
-    graph_utils.update_results()
+    with orm.db.get_session() as session:
+        count = graph_utils.update_results(session)
+    click.echo(f"updated the links of {count} match results")
 
 
 @graph.command("affi-players")
 def affi_players():
     """Display Players by how often they played for who."""
-    affi_teams = list(graph_utils.Team.find({"name": {"$regex": "BC Zürich-Affoltern"}}))
-    links = graph_utils.PlayedMatch.find({"team": {"$in": affi_teams}})
-    data = {}
-    for link in links:
-        entry = data.setdefault(link.start.fetch().name, {})
-        entry.setdefault("teams", set()).add(link.team.fetch().name.rsplit(" ", 1)[-1])
-        entry.setdefault("played", 0)
-        entry["played"] += 1
+    with orm.db.get_session() as session:
+        graph_utils.update_results(session)
+        players = graph_utils.players_by_club(settings.get().display.club_name, session)
     click.echo(
         tabulate.tabulate(
-            sorted(
-                [[k, v["teams"], v["played"]] for k, v in data.items()],
-                key=lambda row: row[2],
-                reverse=True,
-            )
+            [
+                [p.player_name, {name.rsplit(" ", 1)[-1] for name in p.team_names}, p.played]
+                for p in players
+            ]
         )
     )
+
+
+def _player_ids(names: tuple[str, ...]) -> list[int]:
+    ids = []
+    for name in names:
+        player = orm.Player.one_or_none(name=name)
+        if player is None:
+            raise click.BadParameter(f"no player named '{name}'", param_hint="PLAYERS")
+        ids.append(player.id)
+    return ids
+
+
+def _player_names(ids: Iterable[int]) -> dict[int, str]:
+    return dict(
+        orm.db.get_session().execute(
+            sqla.select(orm.Player.id, orm.Player.name).filter(orm.Player.id.in_(list(ids)))
+        ).all()
+    )
+
+
+@graph.command("connect")
+@click.argument("players", nargs=2)
+def connect(players: tuple[str, str]):
+    """Display the shortest chain of players linking two players."""
+    with orm.db.get_session():
+        first, second = _player_ids(players)
+        chain = result_graph.ResultGraph.load_or_build().shortest_connection(first, second)
+        if chain is None:
+            click.echo("not connected")
+            return
+        names = _player_names(chain)
+    click.echo(" - ".join(names[id] for id in chain))
+
+
+@graph.command("common-opponents")
+@click.argument("players", nargs=2)
+def common_opponents(players: tuple[str, str]):
+    """Display the players that both players played against."""
+    with orm.db.get_session():
+        first, second = _player_ids(players)
+        opponents = result_graph.ResultGraph.load_or_build().common_opponents(first, second)
+        names = _player_names(opponents)
+    click.echo("\n".join(sorted(names.values())))
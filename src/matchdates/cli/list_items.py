@@ -1,4 +1,3 @@
-import dataclasses
 from typing import Optional
 
 import click
@@ -6,7 +5,7 @@ import pendulum
 import tabulate
 import sqlalchemy as sqla
 
-from .. import format, orm
+from .. import cache, format, orm, participation, readmodel
 from .main import main
 from . import param_types
 
@@ -30,17 +29,16 @@ def teams():
 @list_items.command("urls")
 def urls():
     """List match urls"""
-    items = [[f"/{m.season.url}/{m.url}"] for m in orm.MatchDate.all()]
-    items.sort(key=lambda item: item[0])
+    with orm.db.get_session() as session:
+        items = [[url] for url in readmodel.match_urls(session)]
     click.echo(tabulate.tabulate(items))
-    session.close()
 
 
 @list_items.command("locations")
 def locations():
     """List Locations"""
-    locations = orm.Location.all()
-    locations.sort(key=lambda loc: loc.name)
+    with orm.db.get_session() as session:
+        locations = readmodel.locations(session)
     click.echo(
         tabulate.tabulate(
             [[location.name, location.address.replace(
@@ -50,7 +48,7 @@ def locations():
     )
 
 
-def player_names(player: orm.Player) -> tuple[str, str]:
+def player_names(player: orm.Player | readmodel.PlayerRow) -> tuple[str, str]:
     match player.name.split(" "):
         case[first, last]:
             return (first, last)
@@ -64,21 +62,42 @@ def player_names(player: orm.Player) -> tuple[str, str]:
             return (player.name, "")
 
 
-def players_by_team(team: Optional[orm.Team]) -> None:
-
-    @dataclasses.dataclass
-    class PlayerRow:
-        last: str
-        first: str
-        player_nr: str
-        events: int
-        matches: int
-
+@cache.memoize
+def team_player_tables() -> dict[int, dict[str, list[list]]]:
+    """Per team and season event and match counts of the players, most active first."""
+    session = orm.db.get_session()
+    counts = participation.ParticipationMatrix.build(session).by_team_and_season()
+    players = {
+        id: (name, url.rsplit("/", 1)[-1])
+        for id, name, url in session.execute(
+            sqla.select(orm.Player.id, orm.Player.name, orm.Player.url)
+        )
+    }
+    seasons = session.execute(
+        sqla.select(orm.Season.id, orm.Season.name).order_by(orm.Season.start_date)
+    ).all()
+    tables: dict[int, dict[str, list[list]]] = {}
+    for season_id, season_name in seasons:
+        for (team_id, team_season_id), team_counts in counts.items():
+            if team_season_id != season_id:
+                continue
+            rows = [
+                [
+                    *players[player_id],
+                    player.events_for_team,
+                    player.events_total,
+                    player.matches_for_team,
+                    player.matches_total,
+                ]
+                for player_id, player in team_counts.items()
+            ]
+            rows.sort(key=lambda row: (row[2], row[4]), reverse=True)
+            tables.setdefault(team_id, {})[season_name] = rows
+    return tables
+
+
+def players_by_team(team: orm.Team) -> None:
     click.echo(f"Players for Team {team}")
-
-    players = orm.Player.filter(orm.player.by_team(team))
-    matches_by_team = orm.MatchDate.filter(orm.matchdate.by_team(team))
-    player_table = {}
     headers = [
         "Name",
         "SB Nr",
@@ -87,39 +106,11 @@ def players_by_team(team: Optional[orm.Team]) -> None:
         "Nr Matches for Team",
         "Nr Matches Total"
     ]
-    for player in players:
-        row = []
-        row.append(player.name)
-        row.append(player.player_nr)
-        filtered_by_player = [
-            m for m in matches_by_team if orm.matchdate.player_in_match_for_team(player, m, team)]
-        row.append(len(filtered_by_player))
-        singles_results = player.home_singles_results + player.away_singles_results
-        singles_events = set(
-            r.singles_result.match_date.id for r in singles_results)
-        doubles_results = [i for j in
-                           [p.home_doubles_results + p.away_doubles_results for p in player.doubles_pairs] for i in j]
-        doubles_events = set(
-            r.doubles_result.match_date.id for r in doubles_results
-        )
-        row.append(len(singles_events | doubles_events))
-        results_for_team = []
-        for m in filtered_by_player:
-            for r in singles_results:
-                if r.singles_result in m.singles_results:
-                    results_for_team.append(r)
-            for d in doubles_results:
-                if d.doubles_result in m.doubles_results:
-                    results_for_team.append(d)
-        row.append(len(results_for_team))
-        row.append(len(singles_results + doubles_results))
-        season_key = str(filtered_by_player[0].season)
-        player_table.setdefault(season_key, [])
-        player_table[season_key].append(row)
-        for k, v in player_table.items():
-            v.sort(key=lambda row: (row[2], row[4]), reverse=True)
-            click.echo(f"\nSeason {k}:")
-            click.echo(tabulate.tabulate(v, headers=headers))
+    with orm.db.get_session():
+        player_table = team_player_tables().get(team.id, {})
+    for k, v in player_table.items():
+        click.echo(f"\nSeason {k}:")
+        click.echo(tabulate.tabulate(v, headers=headers))
 
 
 @list_items.command("players")
@@ -130,15 +121,14 @@ def players(ctx, by_team: orm.Team | None) -> None:
     if by_team:
         players_by_team(by_team)
         ctx.exit(0)
-    with orm.db.get_session():
-        players = orm.Player.all()
-
-        players.sort(key=lambda player: player_names(player)[1])
+    with orm.db.get_session() as session:
+        players = readmodel.players(session)
+    players.sort(key=lambda player: player_names(player)[1])
     click.echo(
         tabulate.tabulate(
             [
                 [(names := player_names(player))[1],
-                 names[0], player.url.rsplit("/", 1)[1]]
+                 names[0], player.player_nr]
                 for player in players
             ],
             headers=["Last", "First", "player_nr"],
@@ -153,20 +143,14 @@ def players(ctx, by_team: orm.Team | None) -> None:
 @click.option("--by-location", type=param_types.location.Location(), default=None)
 def matches(by_team: Optional[orm.Team], by_location: Optional[orm.Location]):
     """List matches"""
-    matches: list[orm.MatchDate]
+    filters = []
+    if by_team:
+        filters.append(readmodel.by_team(by_team.id))
+    elif by_location:
+        filters.append(orm.Location.name == by_location.name)
     with orm.db.get_session() as session:
-        if by_team:
-            matches = orm.MatchDate.filter(
-                orm.MatchDate.home_team.has(id=by_team.id)
-                | orm.MatchDate.away_team.has(id=by_team.id)
-            )
-        elif by_location:
-            location = orm.Location.one(name=by_location.name)
-            matches = orm.MatchDate.filter_by(location=location)
-        else:
-            matches = orm.MatchDate.all()
-        matches.sort(key=lambda m: m.local_date_time)
-        click.echo(format.tabulate_match_dates(matches))
+        matches = readmodel.matches(session, *filters)
+    click.echo(format.tabulate_match_rows(matches))
 
 
 @list_items.command("results")
@@ -174,36 +158,26 @@ def matches(by_team: Optional[orm.Team], by_location: Optional[orm.Location]):
 @click.option("--by-season", type=param_types.season.Season(), default=None)
 def results(by_team: orm.Team | None, by_season: orm.Season | None):
     """List Match results."""
-    results: list[orm.MatchResult]
+    filters = []
+    if by_team:
+        filters.append(readmodel.by_team(by_team.id))
+    if by_season:
+        filters.append(orm.MatchDate.season_id == by_season.id)
     with orm.db.get_session() as session:
-        must_filter = any([by_team, by_season])
-        if must_filter:
-            filters = None
-            if by_team:
-                filters = orm.matchdate.by_team(by_team)
-            if by_season:
-                if filters is None:
-                    filters = orm.matchdate.by_season(by_season)
-                else:
-                    filters &= orm.matchdate.by_season(by_season)
-            matches = orm.MatchDate.filter(
-                filters & orm.MatchDate.match_result)
-
-            results = [m.match_result for m in matches]
-        else:
-            results = orm.MatchResult.all()
-        results.sort(key=lambda r: r.match_date.local_date_time)
-        click.echo(format.tabulate_match_results(results))
+        results = readmodel.results(session, *filters)
+    click.echo(format.tabulate_result_rows(results))
 
 
 @list_items.command("seasons")
 def seasons():
+    with orm.db.get_session() as session:
+        seasons = readmodel.seasons(session)
     click.echo(tabulate.tabulate(
         [
             [
                 s.name,
                 f"{s.start_date} - {s.end_date}",
                 s.url
-            ] for s in orm.Season.all()
+            ] for s in seasons
         ]
     ))
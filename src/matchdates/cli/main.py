@@ -1,6 +1,75 @@
+import importlib
+from typing import Any
+
 import click
 
 
-@click.group("mada")
+class LazyGroup(click.Group):
+    """
+    Command group that imports a subcommand's module only when it is needed.
+
+    ``lazy_subcommands`` maps command names to the module defining them and the
+    short help shown by ``--help``, so that listing the commands imports nothing.
+    The modules register their commands on the group as usual when imported.
+    """
+
+    def __init__(
+        self, *args: Any, lazy_subcommands: dict[str, tuple[str, str]] | None = None, **kwargs: Any
+    ):
+        super().__init__(*args, **kwargs)
+        self.lazy_subcommands = lazy_subcommands or {}
+
+    def list_commands(self, ctx: click.Context) -> list[str]:
+        return sorted(set(super().list_commands(ctx)) | set(self.lazy_subcommands))
+
+    def get_command(self, ctx: click.Context, cmd_name: str) -> click.Command | None:
+        if cmd_name not in self.commands and cmd_name in self.lazy_subcommands:
+            module, _ = self.lazy_subcommands[cmd_name]
+            importlib.import_module(module)
+        return super().get_command(ctx, cmd_name)
+
+    def format_commands(self, ctx: click.Context, formatter: click.HelpFormatter) -> None:
+        limit = formatter.width - 6 - max(len(name) for name in self.list_commands(ctx))
+        rows = []
+        for name in self.list_commands(ctx):
+            if command := self.commands.get(name):
+                if command.hidden:
+                    continue
+                rows.append((name, command.get_short_help_str(limit)))
+            else:
+                rows.append((name, self.lazy_subcommands[name][1]))
+        if rows:
+            with formatter.section("Commands"):
+                formatter.write_dl(rows)
+
+
+@click.group(
+    "mada",
+    cls=LazyGroup,
+    lazy_subcommands={
+        "calendar": ("matchdates.cli.calendar", "Display calendar view of matches."),
+        "graph": ("matchdates.cli.graph", "Manage the denormalized data representation."),
+        "list": ("matchdates.cli.list_items", "List entities."),
+        "move": (
+            "matchdates.cli.move",
+            "Pretend to move a match and show the new and old date in...",
+        ),
+        "on-date": ("matchdates.cli.on_date", "Display matches on DAY"),
+        "reload": ("matchdates.cli.reload", "Grab the dates from online and update the db."),
+        "results": ("matchdates.cli.results", "Work with match results."),
+        "scan": ("matchdates.cli.scan", "Scan for clashes"),
+        "serve": (
+            "matchdates.cli.serve",
+            "Answer mada commands sent by mada-client until interrupted.",
+        ),
+        "show": (
+            "matchdates.cli.show",
+            "Display detailed information about matches and locations",
+        ),
+        "simulate": ("matchdates.cli.simulate", "Simulate the rest of a DRAW's season."),
+        "standings": ("matchdates.cli.standings", "Display the standings of a DRAW."),
+        "upcoming": ("matchdates.cli.upcoming", "Display a certain AMOUNT of matches in the future"),
+    },
+)
 def main():
     """Match Date Management"""
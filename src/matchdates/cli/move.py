@@ -31,8 +31,8 @@ def move(match: orm.MatchDate, date: Optional[pendulum.Date], time: Optional[str
         cal = calendar.Month(first=moved.local_date_time.start_of("month"))
         matches = session.scalars(
             orm.MatchDate.select().filter(
-                (orm.MatchDate.date_time >= cal.first) & (
-                    orm.MatchDate.date_time <= cal.last)
+                (orm.MatchDate.utc_epoch >= orm.matchdate.epoch(cal.first)) & (
+                    orm.MatchDate.utc_epoch <= orm.matchdate.epoch(cal.last))
             )
         )
         for existing_match in matches:
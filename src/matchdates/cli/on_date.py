@@ -12,8 +12,10 @@ from .main import main
 def on_date(day, plusminus):
     """Display matches on DAY"""
     matches = orm.MatchDate.filter(
-        (orm.MatchDate.date_time > day - pendulum.duration(days=plusminus))
-        & (orm.MatchDate.date_time < day + pendulum.duration(days=plusminus + 1))
+        orm.MatchDate.local_date.between(
+            day - pendulum.duration(days=plusminus), day + pendulum.duration(days=plusminus)
+        ),
+        options=orm.profiles.match_listing(),
     )
     matches.sort(key=lambda m: m.local_date_time)
     click.echo(format.tabulate_match_dates(matches))
@@ -1,8 +1,9 @@
 from . import date
+from . import draw
 from . import team
 from . import location
 from . import match
 from . import season
 
 
-__all__ = ["date", "team", "location", "match", "season"]
+__all__ = ["date", "draw", "team", "location", "match", "season"]
@@ -0,0 +1,29 @@
+import click
+import sqlalchemy as sqla
+
+from matchdates import orm
+
+
+class Draw(click.ParamType):
+    name = "Draw"
+
+    def convert(
+        self, value: str | int | orm.Draw, param: click.Parameter, ctx: click.Context
+    ) -> orm.Draw:
+        if isinstance(value, orm.Draw):
+            return value
+
+        try:
+            draw_nr = int(value)
+        except ValueError:
+            self.fail(f"'{value}' is not a draw nr", param, ctx)
+        # the same draw nr can come up in several seasons, take the latest
+        draw = orm.db.get_session().scalars(
+            sqla.select(orm.Draw)
+            .join(orm.Season, orm.Draw.season_id == orm.Season.id)
+            .filter(orm.Draw.url == f"draw/{draw_nr}")
+            .order_by(orm.Season.start_date.desc())
+        ).first()
+        if draw is None:
+            self.fail(f"No draw with nr {value} found!", param, ctx)
+        return draw
@@ -1,33 +1,74 @@
+import datetime
 import json
 import logging
 import pathlib
+from typing import Any, Iterable
 
 import cattrs
 import click
 import pendulum
 import textwrap
+import sqlalchemy as sqla
 from scrapy import crawler
 
-from .. import common_data as cd, data2orm, datespider, settings
+from .. import archive, common_data as cd, data2orm, datespider, middlewares, settings
 from .. import orm
 from .main import main
 from . import constants
 
 
-def recrawl() -> pathlib.Path:
+def known_match_dates() -> dict[str, datetime.datetime]:
+    """Map the urls of the current season's matches to their stored date time."""
+    if not orm.Season.all():
+        return {}
+    season = orm.Season.current()
+    return dict(
+        orm.db.get_session().execute(
+            sqla.select(orm.MatchDate.url, orm.MatchDate.date_time).filter(
+                orm.matchdate.by_season(season)
+            )
+        ).all()
+    )
+
+
+def crawl_settings(
+    datafile: pathlib.Path | None, conditional: bool, log_level: str
+) -> dict[str, Any]:
+    """
+    Scrapy settings for a crawl started from the CLI.
+
+    Without a datafile the items are streamed into the database by the ORM pipeline.
+    """
+    crawl_settings = {
+        "LOG_LEVEL": log_level,
+        "DOWNLOADER_MIDDLEWARES": settings.DOWNLOADER_MIDDLEWARES,
+        "VALIDATOR_STORE_ENABLED": conditional,
+        "ARCHIVE_ENABLED": settings.ARCHIVE_ENABLED,
+    }
+    if datafile:
+        crawl_settings["FEEDS"] = {str(datafile): {"format": "json"}}
+    else:
+        crawl_settings["ITEM_PIPELINES"] = settings.ORM_ITEM_PIPELINES
+    return crawl_settings
+
+
+def recrawl(
+    known_dates: dict[str, datetime.datetime] | None = None,
+    conditional: bool = True,
+    stream: bool = False,
+) -> pathlib.Path | None:
     click.echo("recrawling data")
     logging.getLogger("scrapy.core.scraper").setLevel(logging.WARN)
     logging.getLogger("scrapy.core.engine").setLevel(logging.INFO)
-    new_datafile = (
-        settings.get_crawl_datadir(settings.SETTINGS)
+    new_datafile = None if stream else (
+        settings.get_crawl_datadir()
         / f"matchdates-{pendulum.now().int_timestamp}.json"
     )
 
     process = crawler.CrawlerProcess(
-        settings={
-            "FEEDS": {str(new_datafile): {"format": "json"}}, "LOG_LEVEL": "INFO"}
+        settings=crawl_settings(new_datafile, conditional, "INFO")
     )
-    process.crawl(datespider.MatchDateSpider)
+    process.crawl(datespider.MatchDateSpider, known_dates=known_dates)
     process.start()
     return new_datafile
 
@@ -46,56 +87,122 @@ def datafiles_outdated(datafiles: list[pathlib.Path]) -> bool:
         latest_date = pendulum.from_timestamp(
             int(current_datafile.stem.split("-")[1]))
         click.echo(f"latest data from {latest_date}")
-        return (pendulum.now() - latest_date).total_minutes() >= settings.SETTINGS["crawling"][
-            "data_min_age"
-        ]
+        return (
+            (pendulum.now() - latest_date).total_minutes() >= settings.get().crawling.data_min_age
+        )
+
+
+def changed_since(since: pendulum.DateTime) -> list[orm.MatchDate]:
+    return orm.MatchDate.filter(
+        orm.MatchDate.changelog.any(
+            orm.matchdate.ChangeLogEntry.archived_date_time >= since.naive()
+        )
+    )
+
+
+def report_changes(matchdate: orm.MatchDate) -> None:
+    last_change = matchdate.last_change
+    if last_change.location != matchdate.location:
+        click.echo("Location Change detected:")
+        click.echo(textwrap.indent(
+            str(matchdate), constants.INDENT))
+        click.echo(
+            textwrap.indent(
+                f"Old Location: {last_change.location.name}",
+                constants.INDENT,
+            )
+        )
+    if last_change.date_time != matchdate.date_time:
+        click.echo("Date Change detected:")
+        click.echo(textwrap.indent(
+            str(matchdate), constants.INDENT))
+        click.echo(
+            textwrap.indent(
+                f"Old Date: {last_change.local_date_time}", constants.INDENT
+            )
+        )
 
 
 @main.command("reload")
 @click.option("--allow-rescrape/--no-allow-rescrape", default=True)
-def reload(allow_rescrape: bool) -> None:
-    """Grab the dates from online and update the db."""
-    datadir = settings.get_crawl_datadir(settings.SETTINGS)
-    datafiles = [i for i in datadir.iterdir(
-    ) if i.stem.startswith("matchdates")]
-    current_datafile = latest_datafile(datafiles)
-
-    if datafiles_outdated(datafiles) and allow_rescrape:
-        current_datafile = recrawl()
+@click.option(
+    "--incremental",
+    is_flag=True,
+    default=False,
+    help="Only fetch matches that are new or moved according to the draw listings.",
+)
+@click.option(
+    "--conditional/--unconditional",
+    default=True,
+    help="Skip match pages that did not change since they were last parsed.",
+)
+@click.option(
+    "--replay",
+    is_flag=True,
+    default=False,
+    help="Parse the archived match pages again instead of using crawled data.",
+)
+@click.option(
+    "--stream",
+    is_flag=True,
+    default=False,
+    help="Crawl and load crawled items into the database right away, without a data file.",
+)
+@click.option(
+    "--bulk/--no-bulk",
+    default=True,
+    help="Load all items in one transaction instead of committing each one.",
+)
+def reload(
+    allow_rescrape: bool,
+    incremental: bool,
+    conditional: bool,
+    replay: bool,
+    stream: bool,
+    bulk: bool,
+) -> None:
+    """
+    Grab the dates from online and update the db.
+
+    An incremental reload does not notice location changes of matches that kept their date.
+    """
+    started = pendulum.now()
+    items: Iterable[cd.MatchDate] = []
+    if replay:
+        click.echo("replaying archived pages")
+        items = archive.replay(datespider.MatchDateSpider)
+    elif stream and allow_rescrape:
+        recrawl(
+            known_match_dates() if incremental else None, conditional=conditional, stream=True
+        )
     else:
-        click.echo("using existing data.")
+        datadir = settings.get_crawl_datadir()
+        datafiles = [i for i in datadir.iterdir(
+        ) if i.stem.startswith("matchdates")]
+        current_datafile = latest_datafile(datafiles)
+
+        if datafiles_outdated(datafiles) and allow_rescrape:
+            current_datafile = recrawl(
+                known_match_dates() if incremental else None, conditional=conditional
+            )
+        else:
+            click.echo("using existing data.")
 
-    click.echo("loading crawled data")
-    data = json.loads(current_datafile.read_text())
+        click.echo("loading crawled data")
+        data = json.loads(current_datafile.read_text())
+        items = (cattrs.structure(item, cd.MatchDate) for item in data)
 
     click.echo("updating database")
 
-    converter = data2orm.matchdate.MatchdateToOrm(session=orm.db.get_session())
-    for item in data:
-        matchitem = cattrs.structure(item, cd.MatchDate)
-        matchdate = converter.visit(matchitem)
-        last_change = next(
-            iter(reversed(matchdate.changelog))
-        ) if matchdate.changelog else None
-        if last_change and (
-                pendulum.now() - last_change.archived_date_time
-        ).in_seconds() < 5:
-            if last_change.location != matchdate.location:
-                click.echo("Location Change detected:")
-                click.echo(textwrap.indent(
-                    str(matchdate.match_date), constants.INDENT))
-                click.echo(
-                    textwrap.indent(
-                        f"Old Location: {matchdate.archive_entry.location.name}",
-                        constants.INDENT,
-                    )
-                )
-            if last_change.date_time != matchdate.date_time:
-                click.echo("Date Change detected:")
-                click.echo(textwrap.indent(
-                    str(matchdate.match_date), constants.INDENT))
-                click.echo(
-                    textwrap.indent(
-                        f"Old Date: {matchdate.archive_entry.date_time}", constants.INDENT
-                    )
-                )
+    if bulk:
+        converter = data2orm.matchdate.BulkMatchdateToOrm(session=orm.db.get_session())
+        converter.ingest(items)
+    else:
+        converter = data2orm.matchdate.MatchdateToOrm(session=orm.db.get_session())
+        for item in items:
+            converter.visit(item)
+    if not replay:
+        middlewares.commit_validators()
+
+    for matchdate in changed_since(started):
+        report_changes(matchdate)
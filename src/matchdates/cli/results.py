@@ -2,16 +2,20 @@ from __future__ import annotations
 
 import json
 import pathlib
+from typing import Iterable
 
 import cattrs
 import click
 import click_spinner
 import pendulum
+import sqlalchemy as sqla
 from scrapy import crawler
 
-from matchdates import common_data, marespider, orm, settings, data2orm
+from matchdates import (
+    archive, common_data, marespider, middlewares, orm, queries, ratings, settings, data2orm
+)
 from .main import main
-from .reload import latest_datafile, datafiles_outdated
+from .reload import crawl_settings, latest_datafile, datafiles_outdated
 from . import param_types
 
 
@@ -21,61 +25,129 @@ def results() -> None:
     ...
 
 
-def recrawl(matches: list[orm.MatchDate]) -> pathlib.Path:
+def recrawl(
+    matches: list[orm.MatchDate], conditional: bool = True, stream: bool = False
+) -> pathlib.Path | None:
     click.echo("recrawling data")
     matchnrs = [m.matchnr for m in matches]
     click.secho(f"scraping matches: {matchnrs}", fg="red")
-    new_datafile = (
-        settings.get_crawl_datadir(settings.SETTINGS)
+    new_datafile = None if stream else (
+        settings.get_crawl_datadir()
         / f"matchresults-{pendulum.now().int_timestamp}.json"
     )
     process = crawler.CrawlerProcess(
-        settings={
-            "FEEDS": {str(new_datafile): {"format": "json"}},
-            "LOG_LEVEL": "ERROR",
-        }
+        settings=crawl_settings(new_datafile, conditional, "ERROR")
     )
     process.crawl(marespider.MatchResultSpider,
                   urls=[m.full_url for m in matches])
     with click_spinner.spinner():
         process.start()
+    mark_checked(matches, middlewares.unchanged_urls())
     return new_datafile
 
 
+def mark_checked(matches: list[orm.MatchDate], unchanged_urls: list[str]) -> None:
+    """
+    Record that the results of the ``matches`` at ``unchanged_urls`` were just checked.
+
+    Pages skipped as unchanged never reach the converter, this keeps them from
+    being selected again once the results have settled.
+    """
+    unchanged_urls = set(unchanged_urls)
+    session = orm.db.get_session()
+    session.execute(
+        sqla.update(orm.MatchResult)
+        .where(
+            orm.MatchResult.match_date_id.in_(
+                [m.id for m in matches if m.full_url in unchanged_urls]
+            )
+        )
+        .values(checked_date_time=pendulum.now())
+    )
+    session.commit()
+
+
 @ results.command("load")
 @ click.option("-M", "--match", "matches", type=param_types.match.Match(), multiple=True)
 @ click.option("--all", is_flag=True, default=False)
+@ click.option(
+    "--settle-days",
+    type=int,
+    default=7,
+    help="Refetch results that were fetched less than this many days after the match.",
+)
 @ click.option("--allow-rescrape/--no-allow-rescrape", default=False)
+@ click.option(
+    "--conditional/--unconditional",
+    default=True,
+    help="Skip result pages that did not change since they were last parsed.",
+)
+@ click.option(
+    "--replay",
+    is_flag=True,
+    default=False,
+    help="Parse all archived result pages again instead of using crawled data.",
+)
+@ click.option(
+    "--stream",
+    is_flag=True,
+    default=False,
+    help=(
+        "Crawl and load crawled results into the database right away, without a data file."
+        " Implies --allow-rescrape."
+    ),
+)
 @ click.pass_context
-def load_sqlite(ctx: click.Context, matches: list[orm.MatchDate], all: bool, allow_rescrape: bool) -> None:
+def load_sqlite(
+    ctx: click.Context,
+    matches: list[orm.MatchDate],
+    all: bool,
+    settle_days: int,
+    allow_rescrape: bool,
+    conditional: bool,
+    replay: bool,
+    stream: bool,
+) -> None:
+    """
+    Load match results into the database.
+
+    By default only the current season's played matches are scraped whose result is
+    missing or was fetched less than --settle-days after the match.
+    """
     with orm.db.get_session() as session:
         if not matches:
             if all:
                 matches = orm.MatchDate.all()
             else:
-                matches = orm.MatchDate.filter(season=orm.Season.current())
-        datadir = settings.get_crawl_datadir(settings.SETTINGS)
-        datafiles = [
-            i for i in datadir.iterdir() if i.name.startswith("matchresults")
-        ]
-        current_datafile = latest_datafile(datafiles)
-        if datafiles_outdated(datafiles) and allow_rescrape:
-            current_datafile = recrawl(matches)
+                matches = queries.matches_needing_results(
+                    orm.Season.current(), settle_days=settle_days
+                )
+        items: Iterable[common_data.TeamMatchResult] = []
+        if replay:
+            click.echo("replaying archived pages")
+            items = archive.replay(marespider.MatchResultSpider)
+        elif stream:
+            recrawl(matches, conditional=conditional, stream=True)
         else:
-            click.echo("using existing data.")
-        data = json.loads(current_datafile.read_text())
-
-        # TODO: use the new common_data.results classes
-        for item in data:
-            result = cattrs.structure(item, common_data.TeamMatchResult)
-            url_parts = result.url.split("/")
-            season_url = "/".join(url_parts[-4:-2])
-            matchdate_url = "/".join(url_parts[-2:])
-            click.secho(f"found result for: {matchdate_url}", fg="red")
-            season = orm.Season.one(url=season_url)
-            matchdate = orm.MatchDate.one(url=matchdate_url, season=season)
-            data2orm.results.ResultToOrm(
-                session=session, matchdate=matchdate).visit(result)
+            datadir = settings.get_crawl_datadir()
+            datafiles = [
+                i for i in datadir.iterdir() if i.name.startswith("matchresults")
+            ]
+            current_datafile = latest_datafile(datafiles)
+            if datafiles_outdated(datafiles) and allow_rescrape:
+                current_datafile = recrawl(matches, conditional=conditional)
+            else:
+                click.echo("using existing data.")
+            data = json.loads(current_datafile.read_text())
+            items = (cattrs.structure(item, common_data.TeamMatchResult) for item in data)
+
+        results = data2orm.results.BulkResultToOrm(session=session, replay=replay).ingest(items)
+        if not replay:
+            middlewares.commit_validators()
+        for result in results:
+            click.secho(f"found result for: {result.match_date.url}", fg="red")
+        if days := ratings.update(session):
+            click.echo(f"updated ratings for {days} match days")
 
 
 @ results.command("show")
@@ -9,16 +9,17 @@ from .. import queries, format, orm
 
 
 @main.command("scan")
-def scan():
+@click.option(
+    "--players",
+    is_flag=True,
+    default=False,
+    help="Also scan for players due to play for more than one team on the same day.",
+)
+def scan(players):
     """Scan for clashes"""
     with orm.db.get_session() as session:
-        teams = orm.Team.all()
-
-        for team in sorted(teams, key=lambda t: t.name):
-            for clash_result in sorted(
-                queries.match_clashes(team=team, date=pendulum.today()),
-                key=lambda clash: clash.day,
-            ):
+        for team_clashes in queries.league_clashes(date=pendulum.today()).values():
+            for clash_result in team_clashes:
                 if not all(
                     match.local_date_time.format("HH:mm") == "00:00"
                     for match in clash_result.matches
@@ -40,3 +41,23 @@ def scan():
                             constants.INDENT,
                         )
                     )
+
+        if not players:
+            return
+        for player_clashes in queries.player_clashes(date=pendulum.today()).values():
+            for clash_result in player_clashes:
+                click.echo("")
+                click.echo("=" * 88)
+                teams = ", ".join(format.color_team(name) for name in clash_result.team_names)
+                click.echo(
+                    f"Player {clash_result.player_name} is due for {teams} on the {clash_result.day}:"
+                )
+                click.echo(
+                    textwrap.indent(
+                        click.style(
+                            format.tabulate_match_dates(clash_result.matches),
+                            fg=styling._color_for_severity(clash_result.severity),
+                        ),
+                        constants.INDENT,
+                    )
+                )
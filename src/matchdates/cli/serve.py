@@ -0,0 +1,133 @@
+"""
+Answer ``mada`` commands from a long running process.
+
+The daemon imports all commands, configures the ORM mappers and keeps the database
+engine open, so that commands sent by :mod:`matchdates.client` over a Unix socket
+skip all startup costs. Commands are run one at a time, output is streamed back
+as it is written.
+
+Protocol: the client sends one JSON line ``{"argv": [...], "color": bool}``, the
+daemon answers with JSON lines ``{"out": text}`` or ``{"err": text}`` and finally
+``{"exit": code}``. Commands that crawl are answered with ``{"in_process": true}``
+instead of running them, the client runs those itself: the Twisted reactor of a
+crawl can not be started a second time in the daemon.
+"""
+from __future__ import annotations
+
+import contextlib
+import io
+import json
+import pathlib
+import socketserver
+from typing import Any
+
+import click
+import sqlalchemy as sqla
+import sqlalchemy.orm
+
+from .. import orm, settings
+from .main import main
+
+
+IN_PROCESS_COMMANDS = (["reload"], ["results", "load"])
+
+
+def default_socket_path() -> pathlib.Path:
+    return settings.get_crawl_datadir() / "mada.sock"
+
+
+class _Forward(io.TextIOBase):
+    """Text stream that sends everything written to it to the client."""
+
+    def __init__(self, send: Any, key: str):
+        self.send = send
+        self.key = key
+
+    @property
+    def encoding(self) -> str:
+        return "utf-8"
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        # click probes streams for binary support by writing b""
+        if not isinstance(text, str):
+            raise TypeError(f"write() argument must be str, not {type(text).__name__}")
+        if text:
+            self.send({self.key: text})
+        return len(text)
+
+
+class CommandHandler(socketserver.StreamRequestHandler):
+    def send(self, message: dict[str, Any]) -> None:
+        self.wfile.write(json.dumps(message).encode() + b"\n")
+        self.wfile.flush()
+
+    def handle(self) -> None:
+        request = json.loads(self.rfile.readline())
+        argv = request["argv"]
+        self.send({"exit": self.server.run(argv, self.send, color=request.get("color"))})
+
+
+class CommandServer(socketserver.UnixStreamServer):
+    def __init__(self, path: pathlib.Path):
+        self.path = path
+        super().__init__(str(path), CommandHandler)
+
+    def warm_up(self) -> None:
+        """Import every command and open the database."""
+        ctx = click.Context(main)
+        for name in main.list_commands(ctx):
+            main.get_command(ctx, name)
+        sqla.orm.configure_mappers()
+        with orm.db.get_session() as session:
+            session.execute(sqla.select(orm.MatchDate.id).limit(1)).all()
+
+    def run(self, argv: list[str], send: Any, color: bool | None = None) -> int:
+        if argv[:1] == ["serve"]:
+            send({"err": "The daemon can not start another daemon.\n"})
+            return 2
+        if any(argv[:len(command)] == command for command in IN_PROCESS_COMMANDS):
+            send({"in_process": True})
+            return 0
+        with (
+            contextlib.redirect_stdout(_Forward(send, "out")),
+            contextlib.redirect_stderr(_Forward(send, "err")),
+        ):
+            try:
+                main.main(argv, prog_name="mada", color=color)
+            except SystemExit as exit:
+                if isinstance(exit.code, int):
+                    return exit.code
+                if exit.code is None:
+                    return 0
+                # the interpreter would print the message of sys.exit("...") to stderr
+                send({"err": f"{exit.code}\n"})
+                return 1
+        return 0
+
+    def server_close(self) -> None:
+        super().server_close()
+        self.path.unlink(missing_ok=True)
+
+
+@main.command("serve")
+@click.option(
+    "--socket",
+    "socket_path",
+    type=click.Path(path_type=pathlib.Path),
+    default=None,
+    help="Listen on this Unix socket instead of mada.sock in the data directory.",
+)
+def serve(socket_path: pathlib.Path | None) -> None:
+    """Answer mada commands sent by mada-client until interrupted."""
+    socket_path = socket_path or default_socket_path()
+    socket_path.unlink(missing_ok=True)
+    with CommandServer(socket_path) as server:
+        server.warm_up()
+        click.echo(f"listening on {socket_path}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
@@ -1,11 +1,9 @@
-import collections
-
 import click
 import pendulum
 import tabulate
 import sqlalchemy as sqla
 
-from .. import orm
+from .. import orm, readmodel
 from .main import main
 from . import param_types
 
@@ -52,37 +50,36 @@ def match(match: orm.MatchDate) -> None:
 @click.argument("location", type=param_types.location.Location())
 def location(location: orm.Location) -> None:
     """Display info about a location."""
-    with orm.db.get_session() as session:
-        teams = set(m.home_team.name for m in location.match_dates)
-        times = collections.Counter(m.local_date_time.time()
-                                    for m in location.match_dates)
+    with orm.db.get_session():
+        summary = readmodel.location_summary(location.id)
+    times = summary.times
 
-        time_info: str
-        match len(times):
-            case 1:
-                time_info = str(list(times.keys())[0])
-            case 2 | 3:
-                time_info = tabulate.tabulate(
-                    [
-                        (f"{count}", "x", time.format("HH:mm"))
-                        for time, count in times.most_common()
-                    ],
-                    tablefmt="plain",
-                )
-            case _:
-                time_info = f"{min(times.keys())} - {max(times.keys())}"
-                if (usual_time := times.most_common(1)[0])[1] > times.total() / 5:
-                    time_info += f", usually {usual_time[0]}"
+    time_info: str
+    match len(times):
+        case 1:
+            time_info = str(list(times.keys())[0])
+        case 2 | 3:
+            time_info = tabulate.tabulate(
+                [
+                    (f"{count}", "x", time.format("HH:mm"))
+                    for time, count in times.most_common()
+                ],
+                tablefmt="plain",
+            )
+        case _:
+            time_info = f"{min(times.keys())} - {max(times.keys())}"
+            if (usual_time := times.most_common(1)[0])[1] > times.total() / 5:
+                time_info += f", usually {usual_time[0]}"
 
-    click.echo(click.style(location.name, bold=True, underline=True))
+    click.echo(click.style(summary.name, bold=True, underline=True))
     click.echo("")
     click.echo(
         tabulate.tabulate(
             _style_info_table(
                 [
-                    ("Address:", location.address),
+                    ("Address:", summary.address),
                     ("", ""),
-                    ("Home Teams:", "\n".join(sorted(teams))),
+                    ("Home Teams:", "\n".join(summary.home_teams)),
                     ("", ""),
                     ("Match Times:", time_info),
                 ]
@@ -95,35 +92,27 @@ def location(location: orm.Location) -> None:
 @show.command("team")
 @click.argument("team", type=param_types.team.Team())
 def team(team: orm.Team) -> None:
-    with orm.db.get_session() as session:
-        home_locations = set(m.location.name for m in team.home_dates)
-        all_matches = sorted(
-            [*team.home_dates, *team.away_dates], key=lambda m: m.local_date_time)
-        upcoming = tabulate.tabulate(
-            [
-                (m.local_date_time.format("dd YYYY-MM-DD"), m.full_url)
-                for m in all_matches
-                if m.local_date_time >= pendulum.now()
-            ]
-        )
-        nr_upcoming = len(
-            [m for m in all_matches if m.local_date_time >= pendulum.now()])
-        club = team.club.name
-        seasons = [s.url for s in team.seasons]
+    with orm.db.get_session():
+        summary = readmodel.team_summary(team.id)
+    now = pendulum.now()
+    upcoming_matches = [m for m in summary.matches if m.local_date_time >= now]
+    upcoming = tabulate.tabulate(
+        [(m.local_date_time.format("dd YYYY-MM-DD"), m.full_url) for m in upcoming_matches]
+    )
 
-    click.secho(team.name, bold=True, underline=True)
+    click.secho(summary.name, bold=True, underline=True)
     click.echo("")
     click.echo(
         tabulate.tabulate(
             _style_info_table(
                 [
-                    ("Club:", club),
+                    ("Club:", summary.club),
                     ("", ""),
-                    ("Seasons:", seasons),
+                    ("Seasons:", summary.seasons),
                     ("", ""),
-                    ("Locations", home_locations),
+                    ("Locations", set(summary.home_locations)),
                     ("", ""),
-                    (f"Upcoming Matches ({nr_upcoming})", upcoming),
+                    (f"Upcoming Matches ({len(upcoming_matches)})", upcoming),
                 ]
             )
         )
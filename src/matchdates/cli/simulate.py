@@ -0,0 +1,47 @@
+import click
+import sqlalchemy as sqla
+import tabulate
+
+from .. import graph_utils, orm, ratings, simulation
+from .main import main
+from . import param_types
+
+
+@main.command("simulate")
+@click.argument("draw", type=param_types.draw.Draw())
+@click.option("--runs", type=click.IntRange(min=1), default=100_000, show_default=True)
+@click.option(
+    "--workers", type=click.IntRange(min=1), default=None, help="Processes, default: all cores."
+)
+@click.option("--seed", type=int, default=None)
+def simulate(draw: orm.Draw, runs: int, workers: int | None, seed: int | None):
+    """Simulate the rest of a DRAW's season."""
+    with orm.db.get_session() as session:
+        graph_utils.update_results(session)
+        ratings.update(session)
+        state = simulation.SeasonState.read(session, draw)
+        team_names = dict(
+            session.execute(
+                sqla.select(orm.Team.id, orm.Team.name).filter(orm.Team.id.in_(state.team_ids))
+            ).all()
+        )
+    distribution = simulation.simulate(state, runs, workers=workers, seed=seed)
+    rows = sorted(
+        (
+            [
+                team_names[team_id],
+                f"{distribution.expected_points(team_id):.1f}",
+                *(f"{p:.1%}" for p in distribution.rank_probabilities(team_id)),
+            ]
+            for team_id in state.team_ids
+        ),
+        key=lambda row: float(row[1]),
+        reverse=True,
+    )
+    click.echo(f"{len(state.home)} matches left, {runs} simulations")
+    click.echo(
+        tabulate.tabulate(
+            rows,
+            headers=["Team", "Points", *(f"{rank}." for rank in range(1, len(rows) + 1))],
+        )
+    )
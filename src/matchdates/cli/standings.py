@@ -0,0 +1,33 @@
+import click
+import tabulate
+
+from .. import orm, standings
+from .main import main
+from . import param_types
+
+
+@main.command("standings")
+@click.argument("draw", type=param_types.draw.Draw())
+def show_standings(draw: orm.Draw):
+    """Display the standings of a DRAW."""
+    with orm.db.get_session() as session:
+        rows = standings.table(session, draw.id)
+    click.echo(
+        tabulate.tabulate(
+            [
+                [
+                    rank,
+                    row.team,
+                    row.played,
+                    row.wins,
+                    row.draws,
+                    row.losses,
+                    f"{row.disciplines_won}:{row.disciplines_lost}",
+                    f"{row.sets_won}:{row.sets_lost}",
+                    row.points,
+                ]
+                for rank, row in enumerate(rows, start=1)
+            ],
+            headers=["", "Team", "Played", "W", "D", "L", "Disciplines", "Sets", "Points"],
+        )
+    )
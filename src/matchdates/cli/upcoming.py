@@ -1,15 +1,10 @@
 import click
 import pendulum
-import sqlalchemy as sqla
 
-from .. import format, orm
+from .. import format, orm, readmodel
 from .main import main
 
 
-def by_date(match_date: orm.MatchDate) -> pendulum.DateTime:
-    return match_date.date_time
-
-
 @main.command("upcoming")
 @click.argument("amount", type=int, default=7)
 @click.option(
@@ -20,14 +15,12 @@ def by_date(match_date: orm.MatchDate) -> pendulum.DateTime:
 )
 def upcoming(amount, unit):
     """Display a certain AMOUNT of matches in the future"""
+    today = pendulum.today().date()
     with orm.db.get_session() as session:
-        today = pendulum.today().date()
-        matches = session.scalars(orm.MatchDate.select().filter(
-            (orm.MatchDate.date_time >= today) &
-            (
-                orm.MatchDate.date_time <= today +
-                pendulum.duration(**{unit: amount})
-            )
-        )).all()
-        matches.sort(key=by_date)
-        click.echo(format.tabulate_match_dates(matches))
+        matches = readmodel.matches(
+            session,
+            orm.MatchDate.utc_epoch >= orm.matchdate.epoch(today),
+            orm.MatchDate.utc_epoch
+            <= orm.matchdate.epoch(today + pendulum.duration(**{unit: amount})),
+        )
+    click.echo(format.tabulate_match_rows(matches))
@@ -0,0 +1,79 @@
+"""
+Thin ``mada`` client for the ``mada serve`` daemon.
+
+Forwards the command line to the daemon and prints its output as it arrives. If
+no daemon is listening, or the daemon does not run the command (crawls), the
+command is run in this process instead. Only the
+standard library and the settings are imported before that is known.
+"""
+from __future__ import annotations
+
+import json
+import os
+import pathlib
+import socket
+import sys
+from typing import Any, TextIO
+
+from . import settings
+
+
+def default_socket_path() -> pathlib.Path:
+    return settings.get().crawling.datadir / "mada.sock"
+
+
+def connect(path: pathlib.Path) -> socket.socket | None:
+    if not path.exists():
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(str(path))
+    except (ConnectionRefusedError, FileNotFoundError):
+        sock.close()
+        return None
+    return sock
+
+
+def send(
+    sock: socket.socket,
+    argv: list[str],
+    color: bool | None = None,
+    stdout: TextIO | None = None,
+    stderr: TextIO | None = None,
+) -> int | None:
+    """
+    Run ``argv`` in the daemon, write its output to stdout / stderr, return the exit code.
+
+    ``None`` if the daemon asks to run the command in this process.
+    """
+    stdout = stdout or sys.stdout
+    stderr = stderr or sys.stderr
+    in_process = False
+    with sock, sock.makefile("rwb") as stream:
+        stream.write(json.dumps({"argv": argv, "color": color}).encode() + b"\n")
+        stream.flush()
+        for line in stream:
+            message: dict[str, Any] = json.loads(line)
+            if "out" in message:
+                stdout.write(message["out"])
+                stdout.flush()
+            elif "err" in message:
+                stderr.write(message["err"])
+                stderr.flush()
+            elif "in_process" in message:
+                in_process = True
+            elif "exit" in message:
+                return None if in_process else message["exit"]
+    return 1
+
+
+def main() -> None:
+    argv = sys.argv[1:]
+    path = pathlib.Path(os.environ.get("MADA_SOCKET") or default_socket_path())
+    if sock := connect(path):
+        exit_code = send(sock, argv, color=sys.stdout.isatty() or None)
+        if exit_code is not None:
+            sys.exit(exit_code)
+
+    from .cli import main as cli_main
+    cli_main(argv, prog_name="mada")
@@ -3,9 +3,10 @@ from __future__ import annotations
 import dataclasses
 import enum
 import functools
-from typing import Any
+from typing import Any, Callable, Iterable
 
 import sqlalchemy as sqla
+import sqlalchemy.orm
 
 from matchdates import common_data as cd, orm
 
@@ -22,6 +23,13 @@ def url_segment(url: str, start: int | None, stop: int | None) -> str:
 @dataclasses.dataclass
 class MatchdateToOrm:
     session: sqla.orm.Session
+    autocommit: bool = True
+
+    def get_or_create(
+        self, model: type[orm.base.Base], factory: Callable[[], orm.base.Base], **key: Any
+    ) -> orm.base.Base:
+        """Load the instance of ``model`` identified by ``key`` or create it with ``factory``."""
+        return model.one_or_none(**key) or factory()
 
     @functools.singledispatchmethod
     def visit(self, node: Any, **kwargs: Any) -> orm.Base | None:
@@ -30,12 +38,15 @@ class MatchdateToOrm:
     @visit.register
     def visit_season(self, node: cd.Season, **kwargs: Any) -> orm.Season:
         url = url_segment(node.url, -2, None)
-        season = orm.Season.one_or_none(
-            url=url) or orm.Season(
-            url=url,
-            name=node.name,
-            start_date=node.start_date,
-            end_date=node.end_date
+        season = self.get_or_create(
+            orm.Season,
+            lambda: orm.Season(
+                url=url,
+                name=node.name,
+                start_date=node.start_date,
+                end_date=node.end_date
+            ),
+            url=url
         )
         season.name = node.name
         season.start_date = node.start_date
@@ -52,9 +63,11 @@ class MatchdateToOrm:
         **kwargs: Any
     ) -> orm.Draw:
         url = url_segment(node.url, -2, None)
-        draw = orm.Draw.one_or_none(
+        draw = self.get_or_create(
+            orm.Draw,
+            lambda: orm.Draw(url=url, season=season),
             url=url, season=season
-        ) or orm.Draw(url=url, season=season)
+        )
         self.session.add(draw)
         return draw
 
@@ -62,9 +75,11 @@ class MatchdateToOrm:
     def visit_location(
         self, node: cd.Location, **kwargs: Any
     ) -> orm.Location:
-        location = orm.Location.one_or_none(
+        location = self.get_or_create(
+            orm.Location,
+            lambda: orm.Location(name=node.name, address=node.address),
             name=node.name
-        ) or orm.Location(name=node.name, address=node.address)
+        )
         location.address = node.address
         self.session.add(location)
         return location
@@ -73,20 +88,23 @@ class MatchdateToOrm:
     def visit_team(
         self, node: cd.Team, *, draw: cd.Draw, **kwargs: Any
     ) -> orm.Team:
-        club = orm.Club.one_or_none(
-            name=node.club.name) or orm.Club(name=node.club.name)
+        club = self.get_or_create(
+            orm.Club, lambda: orm.Club(name=node.club.name), name=node.club.name
+        )
 
         last_name_part = node.name.rsplit(" ", 1)[-1]
         team_nr = int(last_name_part) if last_name_part.isdigit() else 1
 
         url = url_segment(node.url, -2, None)
-        team = orm.Team.one_or_none(
+        team = self.get_or_create(
+            orm.Team,
+            lambda: orm.Team(
+                name=node.name,
+                url=url,
+                team_nr=team_nr,
+                club=club
+            ),
             name=node.name
-        ) or orm.Team(
-            name=node.name,
-            url=url,
-            team_nr=team_nr,
-            club=club
         )
         team.url = url
         team.club = club
@@ -108,15 +126,17 @@ class MatchdateToOrm:
         draw = self.visit(node.draw, season=season)
         location = self.visit(node.location)
         url = url_segment(node.url, -2, None)
-        matchdate = orm.MatchDate.one_or_none(
+        matchdate = self.get_or_create(
+            orm.MatchDate,
+            lambda: orm.MatchDate(
+                url=url,
+                date_time=node.date,
+                location=location,
+                season=season,
+                home_team=self.visit(node.home_team, draw=draw),
+                away_team=self.visit(node.away_team, draw=draw)
+            ),
             url=url, season=season
-        ) or orm.MatchDate(
-            url=url,
-            date_time=node.date,
-            location=location,
-            season=season,
-            home_team=self.visit(node.home_team, draw=draw),
-            away_team=self.visit(node.away_team, draw=draw)
         )
 
         matchdate.draw = draw
@@ -126,5 +146,97 @@ class MatchdateToOrm:
         )
 
         self.session.add(matchdate)
-        self.session.commit()
+        orm.generation.bump(self.session)
+        if self.autocommit:
+            self.session.commit()
+        return matchdate
+
+
+def _identity_key(model: type[orm.base.Base], **key: Any) -> tuple:
+    return (
+        model,
+        *(
+            (name, value.url if isinstance(value, orm.Season) else value)
+            for name, value in sorted(key.items())
+        )
+    )
+
+
+@dataclasses.dataclass
+class BulkMatchdateToOrm(MatchdateToOrm):
+    """
+    Convert many match dates in as few transactions as possible.
+
+    All the existing entities are loaded up front into an identity map keyed
+    the same way the per item lookups are, so resolving an item does not touch
+    the database. Changes are committed every ``chunk_size`` items or once at
+    the end if no chunk size is given.
+    """
+
+    autocommit: bool = False
+    chunk_size: int | None = None
+    identity_map: dict[tuple, orm.base.Base] = dataclasses.field(
+        default_factory=dict, init=False, repr=False
+    )
+    pending: int = dataclasses.field(default=0, init=False, repr=False)
+
+    def preload(self) -> None:
+        for season in self.session.scalars(orm.Season.select()):
+            self.identity_map[_identity_key(orm.Season, url=season.url)] = season
+        for draw in self.session.scalars(
+            orm.Draw.select().options(
+                sqla.orm.joinedload(orm.Draw.season),
+                sqla.orm.selectinload(orm.Draw.team_assocs),
+            )
+        ).unique():
+            self.identity_map[_identity_key(orm.Draw, url=draw.url, season=draw.season)] = draw
+        for location in self.session.scalars(orm.Location.select()):
+            self.identity_map[_identity_key(orm.Location, name=location.name)] = location
+        for club in self.session.scalars(
+            orm.Club.select().options(sqla.orm.selectinload(orm.Club.season_assocs))
+        ):
+            self.identity_map[_identity_key(orm.Club, name=club.name)] = club
+        for team in self.session.scalars(
+            orm.Team.select().options(
+                sqla.orm.selectinload(orm.Team.draw_assocs),
+                sqla.orm.selectinload(orm.Team.season_assocs),
+            )
+        ):
+            self.identity_map[_identity_key(orm.Team, name=team.name)] = team
+        for matchdate in self.session.scalars(
+            orm.MatchDate.select().options(
+                sqla.orm.joinedload(orm.MatchDate.season),
+                sqla.orm.selectinload(orm.MatchDate.changelog),
+            )
+        ).unique():
+            self.identity_map[
+                _identity_key(orm.MatchDate, url=matchdate.url, season=matchdate.season)
+            ] = matchdate
+
+    def get_or_create(
+        self, model: type[orm.base.Base], factory: Callable[[], orm.base.Base], **key: Any
+    ) -> orm.base.Base:
+        identity = _identity_key(model, **key)
+        if (instance := self.identity_map.get(identity)) is None:
+            instance = self.identity_map[identity] = factory()
+        return instance
+
+    def add(self, item: cd.MatchDate) -> orm.MatchDate:
+        """Convert one item, committing whenever a chunk is full."""
+        with self.session.no_autoflush:
+            matchdate = self.visit(item)
+        self.pending += 1
+        if self.chunk_size and self.pending >= self.chunk_size:
+            self.session.commit()
+            self.pending = 0
+            # committing expired everything, reload it in bulk
+            self.preload()
         return matchdate
+
+    def ingest(self, items: Iterable[cd.MatchDate]) -> list[orm.MatchDate]:
+        """Convert all ``items`` and commit them in chunks."""
+        self.preload()
+        matchdates = [self.add(item) for item in items]
+        self.session.commit()
+        self.pending = 0
+        return matchdates
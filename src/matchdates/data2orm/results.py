@@ -3,12 +3,18 @@ from __future__ import annotations
 import dataclasses
 import collections
 import functools
+import logging
 import typing
-from typing import Any, Callable
+from typing import Any, Callable, Iterable, Iterator
 
+import pendulum
 import sqlalchemy as sqla
+import sqlalchemy.orm
 
-from matchdates import common_data, orm
+from matchdates import common_data, orm, standings
+
+
+logger = logging.getLogger(__name__)
 
 
 def count_wins(matches: list[common_data.SinglesResult | common_data.DoublesResult]) -> collections.Counter:
@@ -66,10 +72,34 @@ def update_orm_doubles_result(
     )
 
 
+def player_url(node: common_data.Player) -> str:
+    return "/".join(node.url.rsplit("/", 2)[1:])
+
+
+def matchdate_for_url(url: str) -> orm.MatchDate:
+    """Find the match date a crawled team match result url refers to."""
+    url_parts = url.split("/")
+    season = orm.Season.one(url="/".join(url_parts[-4:-2]))
+    return orm.MatchDate.one(url="/".join(url_parts[-2:]), season=season)
+
+
 @dataclasses.dataclass
 class ResultToOrm:
     session: sqla.orm.Session
     matchdate: orm.MatchDate | None = None
+    autocommit: bool = True
+    # results parsed again from the page archive keep the time they were fetched
+    replay: bool = False
+
+    def get_or_create(
+        self, model: type[orm.base.Base], factory: Callable[[], orm.base.Base], **key: Any
+    ) -> orm.base.Base:
+        """Load the instance of ``model`` identified by ``key`` or create it with ``factory``."""
+        return model.one_or_none(**key) or factory()
+
+    def find_pair(self, player_a: orm.Player, player_b: orm.Player) -> orm.DoublesPair:
+        """Load the pair of two players or create it."""
+        return orm.DoublesPair.from_players(player_a, player_b)
 
     @functools.singledispatchmethod
     def visit(self, node: Any, **kwargs: Any) -> orm.Base | None:
@@ -82,16 +112,11 @@ class ResultToOrm:
 
         Responsible for
         - not duplicating MatchResults
+        - keeping the draw's standings up to date
         """
-        url_parts = node.url.split("/")
-        season_url = "/".join(url_parts[:2])
-        matchdate_url = "/".join(url_parts[2:])
         if not self.matchdate:
-            season = orm.Season.one(url=season_url)
-            self.matchdate = orm.MatchDate.one(
-                url=matchdate_url,
-                season=season
-            )
+            self.matchdate = matchdate_for_url(node.url)
+        outcome_before = standings.Outcome.of(self.matchdate)
         singles_results = [
             self.visit(result, category=category) for category, result
             in node.singles.items()
@@ -116,21 +141,30 @@ class ResultToOrm:
             team_points[node.winner] = 3
             team_points[node.winner.opposite] = 0
 
-        result = orm.MatchResult.one_or_none(
+        result = self.get_or_create(
+            orm.MatchResult,
+            lambda: orm.MatchResult(
+                match_date=self.matchdate,
+                winner=winner,
+                home_points=team_points[common_data.Side.HOME],
+                away_points=team_points[common_data.Side.AWAY],
+                walkover=bool(not singles_results and not doubles_results)
+            ),
             match_date=self.matchdate
-        ) or orm.MatchResult(
-            match_date=self.matchdate,
-            winner=winner,
-            home_points=team_points[common_data.Side.HOME],
-            away_points=team_points[common_data.Side.AWAY],
-            walkover=bool(not singles_results and not doubles_results)
         )
 
         result.winner = winner
         result.home_points = team_points[common_data.Side.HOME]
         result.away_points = team_points[common_data.Side.AWAY]
+        if not self.replay:
+            result.fetched_date_time = pendulum.now()
         self.session.add(result)
-        self.session.commit()
+        standings.update(
+            self.session, self.matchdate, outcome_before, standings.Outcome.of(self.matchdate)
+        )
+        orm.generation.bump(self.session)
+        if self.autocommit:
+            self.session.commit()
         return result
 
     @visit.register
@@ -154,9 +188,13 @@ class ResultToOrm:
         away_player = self.visit(
             node.away_player) if node.away_player else None
 
-        result = orm.SinglesResult.one_or_none(match_date=self.matchdate, category=category) or orm.SinglesResult(
-            match_date=self.matchdate,
-            category=category
+        result = self.get_or_create(
+            orm.SinglesResult,
+            lambda: orm.SinglesResult(
+                match_date=self.matchdate,
+                category=category
+            ),
+            match_date=self.matchdate, category=category
         )
 
         if home_player and self.matchdate.home_team not in home_player.teams:
@@ -211,9 +249,11 @@ class ResultToOrm:
                 if self.matchdate.away_team not in player.teams:
                     player.teams.append(self.matchdate.away_team)
 
-        result = orm.DoublesResult.one_or_none(
-            match_date=self.matchdate, category=category
-        ) or orm.DoublesResult(
+        result = self.get_or_create(
+            orm.DoublesResult,
+            lambda: orm.DoublesResult(
+                match_date=self.matchdate, category=category
+            ),
             match_date=self.matchdate, category=category
         )
 
@@ -238,9 +278,10 @@ class ResultToOrm:
         node: common_data.Player,
         **kwargs
     ) -> orm.Player:
-        url = "/".join(node.url.rsplit("/", 2)[1:])
-        player = orm.Player.one_or_none(
-            url=url) or orm.Player(name=node.name, url=url)
+        url = player_url(node)
+        player = self.get_or_create(
+            orm.Player, lambda: orm.Player(name=node.name, url=url), url=url
+        )
         self.session.add(player)
         return player
 
@@ -251,8 +292,146 @@ class ResultToOrm:
         **kwargs
     ) -> orm.DoublesPair | None:
         if node.first and node.second:
-            pair = orm.DoublesPair.from_players(
+            pair = self.find_pair(
                 self.visit(node.first), self.visit(node.second))
             self.session.add(pair)
             return pair
         return None
+
+
+def _identity_key(model: type[orm.base.Base], **key: Any) -> tuple:
+    return (
+        model,
+        *(
+            (name, value.id if isinstance(value, orm.MatchDate) else value)
+            for name, value in sorted(key.items())
+        )
+    )
+
+
+def _data_players(node: common_data.TeamMatchResult) -> Iterator[common_data.Player]:
+    for singles in node.singles.values():
+        yield from (p for p in (singles.home_player, singles.away_player) if p)
+    for doubles in node.doubles.values():
+        for pair in (doubles.home_pair, doubles.away_pair):
+            yield from (p for p in pair or () if p)
+
+
+@dataclasses.dataclass
+class BulkResultToOrm(ResultToOrm):
+    """
+    Convert the results of many team matches in as few queries as possible.
+
+    The existing match results, singles and doubles results, players and pairs
+    touched by a batch of team match results are loaded with a handful of IN
+    queries up front, and every result is then reconciled in memory. All
+    changes are committed together at the end.
+    """
+
+    autocommit: bool = False
+    identity_map: dict[tuple, orm.base.Base] = dataclasses.field(
+        default_factory=dict, init=False, repr=False
+    )
+    pairs: dict[frozenset[str], orm.DoublesPair] = dataclasses.field(
+        default_factory=dict, init=False, repr=False
+    )
+
+    def get_or_create(
+        self, model: type[orm.base.Base], factory: Callable[[], orm.base.Base], **key: Any
+    ) -> orm.base.Base:
+        identity = _identity_key(model, **key)
+        if (instance := self.identity_map.get(identity)) is None:
+            instance = self.identity_map[identity] = factory()
+        return instance
+
+    def find_pair(self, player_a: orm.Player, player_b: orm.Player) -> orm.DoublesPair:
+        key = frozenset((player_a.url, player_b.url))
+        if (pair := self.pairs.get(key)) is None:
+            pair = self.pairs[key] = orm.DoublesPair(players={player_a, player_b})
+        return pair
+
+    def load_matchdates(self, urls: Iterable[str]) -> dict[str, orm.MatchDate]:
+        """Look up the match dates for crawled result urls."""
+        urls = set(urls)
+        seasons = {season.id: season.url for season in orm.Season.all()}
+        wanted = {"/".join(url.split("/")[-2:]): url for url in urls}
+        candidates = self.session.scalars(
+            orm.MatchDate.select()
+            .filter(orm.MatchDate.url.in_(wanted))
+            .options(
+                sqla.orm.joinedload(orm.MatchDate.home_team),
+                sqla.orm.joinedload(orm.MatchDate.away_team),
+                sqla.orm.selectinload(orm.MatchDate.match_result),
+                sqla.orm.selectinload(orm.MatchDate.singles_results).options(
+                    sqla.orm.selectinload(orm.SinglesResult.home_player_result),
+                    sqla.orm.selectinload(orm.SinglesResult.away_player_result),
+                ),
+                sqla.orm.selectinload(orm.MatchDate.doubles_results).options(
+                    sqla.orm.selectinload(orm.DoublesResult.home_pair_result),
+                    sqla.orm.selectinload(orm.DoublesResult.away_pair_result),
+                ),
+            )
+        )
+        matchdates = {}
+        for matchdate in candidates:
+            url = wanted[matchdate.url]
+            if "/".join(url.split("/")[-4:-2]) == seasons[matchdate.season_id]:
+                matchdates[url] = matchdate
+        return matchdates
+
+    def preload(self, matchdates: Iterable[orm.MatchDate], player_urls: Iterable[str]) -> None:
+        """Fill the identity map from match dates loaded by :meth:`load_matchdates`."""
+        for matchdate in matchdates:
+            if matchdate.match_result:
+                self.identity_map[
+                    _identity_key(orm.MatchResult, match_date=matchdate)
+                ] = matchdate.match_result
+            for result in [*matchdate.singles_results, *matchdate.doubles_results]:
+                self.identity_map[
+                    _identity_key(type(result), match_date=matchdate, category=result.category)
+                ] = result
+
+        players = self.session.scalars(
+            orm.Player.select()
+            .filter(orm.Player.url.in_(set(player_urls)))
+            .options(sqla.orm.selectinload(orm.Player.team_assocs))
+        ).all()
+        for player in players:
+            self.identity_map[_identity_key(orm.Player, url=player.url)] = player
+        player_ids = [player.id for player in players]
+        for pair in self.session.scalars(
+            orm.DoublesPair.select()
+            .filter(
+                orm.DoublesPair.player_a_id.in_(player_ids)
+                & orm.DoublesPair.player_b_id.in_(player_ids)
+            )
+            .options(
+                sqla.orm.selectinload(orm.DoublesPair.players),
+                sqla.orm.selectinload(orm.DoublesPair.team_assocs),
+            )
+        ):
+            self.pairs[frozenset((pair.player_a.url, pair.player_b.url))] = pair
+
+    def ingest(self, items: Iterable[common_data.TeamMatchResult]) -> list[orm.MatchResult]:
+        """
+        Convert the results of all ``items`` and commit them together.
+
+        Results of match dates that are not in the database are skipped.
+        """
+        items = list(items)
+        matchdates = self.load_matchdates(item.url for item in items)
+        for item in items:
+            if item.url not in matchdates:
+                logger.warning("skipping result without a match date: %s", item.url)
+        items = [item for item in items if item.url in matchdates]
+        self.preload(
+            matchdates.values(),
+            (player_url(player) for item in items for player in _data_players(item)),
+        )
+        results = []
+        with self.session.no_autoflush:
+            for item in items:
+                self.matchdate = matchdates[item.url]
+                results.append(self.visit(item))
+        self.session.commit()
+        return results
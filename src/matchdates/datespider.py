@@ -1,3 +1,4 @@
+import datetime
 import re
 from typing import Iterator
 
@@ -7,29 +8,51 @@ import scrapy
 from . import common_data as cd, settings
 
 
-SETTINGS = settings.SETTINGS["crawling"]
-
-
 class MatchDateSpider(scrapy.Spider):
     name = "matchdatespider"
-    allowed_domains = [SETTINGS["domain"]]
-    start_urls = [
-        f"https://www.{SETTINGS['domain']}/league/{SETTINGS['league_uuid']}/draw/{i}"
-        for i in SETTINGS["draws"]
-    ]
-    cookies = SETTINGS["cookies"]
     inspect_counter = 0
 
-    def __init__(self, urls: list[str] | None = None):
+    def __init__(
+        self,
+        urls: list[str] | None = None,
+        known_dates: dict[str, datetime.datetime] | None = None,
+    ):
+        """
+        Set up the spider.
+
+        With ``known_dates`` (match url -> stored naive date time) only the
+        matches that are new or moved according to the draw listing are
+        followed to their detail page.
+        """
+        self.known_dates = known_dates
         self.scrape_individual_matches = False
         if urls:
             self.scrape_individual_matches = True
             self.start_urls = urls
+        else:
+            crawling = settings.get().crawling
+            self.start_urls = [
+                f"https://www.{crawling.domain}/league/{crawling.league_uuid}/draw/{i}"
+                for i in crawling.draws
+            ]
+
+    @property
+    def allowed_domains(self) -> list[str]:
+        return [settings.get().crawling.domain]
+
+    @property
+    def cookies(self) -> dict[str, str]:
+        return settings.get().crawling.cookies
 
     def start_requests(self) -> Iterator[scrapy.http.Request]:
         if self.scrape_individual_matches:
             for url in self.start_urls:
-                yield scrapy.http.Request(url, cookies=self.cookies, callback=self.parse_matchdetail)
+                yield scrapy.http.Request(
+                    url,
+                    cookies=self.cookies,
+                    callback=self.parse_matchdetail,
+                    meta={"skip_unchanged": True},
+                )
         else:
             for url in self.start_urls:
                 yield scrapy.http.Request(url, cookies=self.cookies, callback=self.parse_draw)
@@ -37,22 +60,29 @@ class MatchDateSpider(scrapy.Spider):
     def parse_draw(self, response: scrapy.http.Response) -> Iterator[cd.MatchDate]:
         for matchitem in response.css(".match-group__item"):
             url = matchitem.css("a.team-match__wrapper::attr('href')").get()
-            # item = cd.MatchDate(
-            #     date=pendulum.DateTime.fromisoformat(
-            #         matchitem.css("time::attr('datetime')").get()),
-            #     home_team=matchitem.css(
-            #         ".is-team-1").xpath("*//text()").get().strip(),
-            #     away_team=matchitem.css(
-            #         ".is-team-2").xpath("*//text()").get().strip(),
-            #     url=matchitem.css("a.team-match__wrapper::attr('href')").get(),
-            # )
+            if not self.needs_detail(url, matchitem):
+                continue
             yield response.follow(
                 url,
                 callback=self.parse_matchdetail,
                 cookies=self.cookies,
-                # cb_kwargs={"matchdate": item},
+                meta={"skip_unchanged": True},
             )
 
+    def listed_date_time(self, matchitem: scrapy.Selector) -> datetime.datetime | None:
+        raw_date_time = matchitem.css("time::attr('datetime')").get()
+        if not raw_date_time:
+            return None
+        return pendulum.DateTime.fromisoformat(raw_date_time).naive()
+
+    def needs_detail(self, url: str, matchitem: scrapy.Selector) -> bool:
+        """Decide from the draw listing whether the match detail page must be fetched."""
+        if self.known_dates is None:
+            return True
+        known = self.known_dates.get("/".join(url.strip("/").split("/")[-2:]))
+        listed = self.listed_date_time(matchitem)
+        return known is None or listed is None or listed != known
+
     def parse_season(self, season_item: scrapy.Selector) -> cd.Season:
         dates = season_item.xpath(
             "*//li[1]/*//text()").get().strip().split(" - ")
@@ -2,15 +2,12 @@ import re
 
 import click
 import tabulate
-import pendulum
 
 from . import orm
+from . import readmodel
 from . import settings
 
 
-SETTINGS = settings.SETTINGS["display"]
-
-
 def shorten_team_name(team_name: str) -> str:
     """
     Shorten team name to fit into a calendar cell.
@@ -26,7 +23,7 @@ def color_team(team_name: str) -> str:
     """
     Color the team name for CLI output if it is a team from the club of interest.
     """
-    if team_name.startswith(SETTINGS["club_name"]):
+    if team_name.startswith(settings.get().display.club_name):
         return click.style(team_name, bg="blue")
     return team_name
 
@@ -35,7 +32,7 @@ def color_short_team(short_team_name: str) -> str:
     """
     Color the short team name for CLI output if the team is from the club of interest.
     """
-    if short_team_name.startswith(shorten_team_name(SETTINGS["club_name"])):
+    if short_team_name.startswith(shorten_team_name(settings.get().display.club_name)):
         return click.style(short_team_name, bg="blue")
     return short_team_name
 
@@ -44,18 +41,25 @@ def tabulate_match_dates(matches: list[orm.MatchDate]) -> str:
     """
     Format a table for CLI output from a list of match dates.
     """
+    return tabulate_match_rows([readmodel.MatchRow.from_match_date(m) for m in matches])
+
+
+def tabulate_match_rows(matches: list[readmodel.MatchRow]) -> str:
+    """
+    Format a table for CLI output from a list of match rows.
+    """
     headers = ["Weekday", "Date", "Time",
                "Home Team", "Away Team", "Nr", "Location"]
     return tabulate.tabulate(
         [
             (
-                (d := pendulum.instance(m.local_date_time)).format("dd"),
+                (d := m.local_date_time).format("dd"),
                 d.date().isoformat(),
                 d.format("HH:mm"),
-                color_team(m.home_team.name),
-                color_team(m.away_team.name),
-                m.url.rsplit("/", 1)[-1],
-                m.location.name,
+                color_team(m.home_team),
+                color_team(m.away_team),
+                m.matchnr,
+                m.location,
             )
             for m in matches
         ],
@@ -67,6 +71,13 @@ def tabulate_match_results(results: list[orm.MatchResult]) -> str:
     """
     Format a table for CLI output from a list of match results.
     """
+    return tabulate_result_rows([readmodel.ResultRow.from_match_result(r) for r in results])
+
+
+def tabulate_result_rows(results: list[readmodel.ResultRow]) -> str:
+    """
+    Format a table for CLI output from a list of result rows.
+    """
     headers = [
         "Weekday", "Date", "Home Team",
         "", "", "", "Away Team", "URL"
@@ -74,14 +85,14 @@ def tabulate_match_results(results: list[orm.MatchResult]) -> str:
     return tabulate.tabulate(
         [
             (
-                (d := pendulum.instance(r.match_date.local_date_time)).format("dd"),
+                (d := r.match.local_date_time).format("dd"),
                 d.date().isoformat(),
-                color_team(r.match_date.home_team.name),
+                color_team(r.match.home_team),
                 r.home_points,
                 ":",
                 r.away_points,
-                color_team(r.match_date.away_team.name),
-                r.match_date.full_url,
+                color_team(r.match.away_team),
+                r.match.full_url,
             )
             for r in results
         ],
@@ -1,103 +1,157 @@
 """
-This module is there only to record the existing results graph ideas.
+Build the player to team match graph (:mod:`matchdates.orm.graph`) from the results.
 
-The plan is to explore ways to structure the data that certain queries more intuitive:
+The graph makes some questions easy to ask in SQL:
  - player winrates
  - head-to-head histories and stats
  - player eligibilities
  - etc
+
+Updating only rebuilds the links of match results that were fetched again since
+the last update, each step is a single set based statement.
 """
-import umongo
-
-from . import models
-
-
-@models.INSTANCE.register
-class Team(umongo.Document):
-    name = umongo.fields.StringField(required=True, unique=True)
-
-
-@models.INSTANCE.register
-class PlayedTeamMatch(umongo.Document):
-    start = umongo.fields.ReferenceField(models.Player)
-    end = umongo.fields.ReferenceField(models.MatchResult)
-    team = umongo.fields.ReferenceField(Team)
-
-
-@models.INSTANCE.register
-class PlayedMatch(umongo.Document):
-    start = umongo.fields.ReferenceField(models.Player)
-    end = umongo.fields.ReferenceField(models.MatchResult)
-    team = umongo.fields.ReferenceField(Team)
-    event = umongo.fields.StringField(required=True)
-    number = umongo.fields.IntegerField(allow_none=True)
-
-    @property
-    def event_attribute_name(self) -> str:
-        return self.event + (f"_{self.number}" if self.number is not None else "")
-
-    @property
-    def is_home_player(self) -> bool:
-        return self.team.fetch().name == self.end.fetch().match_date.fetch().home_team()
-
-    @property
-    def won(self):
-        home_won = getattr(
-            self.end.fetch(), self.event_attribute_name).fetch().home_won
-        return (home_won and self.is_home_player) or (not home_won and not self.is_home_player)
-
-
-def update_results() -> None:
-    """Go through match results and construct the graph."""
-    for result in models.MatchResult.find({}):
-        update_result_subgraph(result)
-
-
-def update_result_subgraph(result: models.MatchResult) -> None:
-    """Look at one match result and update the subgraph."""
-    unique_players: set[tuple[str, str]] = set()
-    match_date = result.match_date.fetch()
-    for event_name, event in result.event_items:
-        away_team_name = match_date.away_team
-        away_team = Team.find_one({"name": away_team_name})
-        home_team_name = match_date.home_team
-        home_team = Team.find_one({"name": home_team_name})
-        if not away_team:
-            away_team = Team(name=away_team_name)
-            away_team.commit()
-        if not home_team:
-            home_team = Team(name=home_team_name)
-            home_team.commit()
-        for player in event.players["away"]:
-            unique_players.add((player.name, away_team.name))
-            if not PlayedMatch.find_one(
-                {"start": player, "end": result,
-                    "event": event_name[0], "number": event_name[1]}
-            ):
-                PlayedMatch(
-                    start=player,
-                    end=result,
-                    team=away_team,
-                    event=event_name[0],
-                    number=event_name[1],
-                ).commit()
-        for player in event.players["home"]:
-            unique_players.add((player.name, home_team.name))
-            if not PlayedMatch.find_one(
-                {"start": player, "end": result,
-                    "event": event_name[0], "number": event_name[1]}
-            ):
-                PlayedMatch(
-                    start=player,
-                    end=result,
-                    team=home_team,
-                    event=event_name[0],
-                    number=event_name[1],
-                ).commit()
-    for player_name, team_name in unique_players:
-        player = models.Player.find_one({"name": player_name})
-        if not PlayedMatch.find_one({"start": player, "end": result}):
-            PlayedTeamMatch(
-                start=player, end=result, team=Team.find_one(
-                    {"name": team_name})
-            ).commit()
+from __future__ import annotations
+
+import dataclasses
+
+import sqlalchemy as sqla
+import sqlalchemy.orm
+
+from . import orm
+from .orm.graph import PlayedMatch, PlayedResult, PlayedTeamMatch
+
+
+def stale_results() -> sqla.Select:
+    """Ids of the match results whose links are missing or outdated."""
+    return (
+        sqla.select(orm.MatchResult.id)
+        .outerjoin(PlayedResult, PlayedResult.match_result_id == orm.MatchResult.id)
+        .filter(
+            PlayedResult.match_result_id.is_(None)
+            | PlayedResult.fetched_date_time.is_distinct_from(orm.MatchResult.fetched_date_time)
+        )
+    )
+
+
+def _singles_links(side_result: type[orm.base.Base]) -> sqla.Select:
+    home = side_result is orm.result.HomePlayerResult
+    return (
+        sqla.select(
+            side_result.player_id,
+            orm.MatchResult.id,
+            orm.SinglesResult.category,
+            orm.MatchDate.home_team_id if home else orm.MatchDate.away_team_id,
+            sqla.literal(home),
+            side_result.win,
+        )
+        .join(orm.SinglesResult, orm.SinglesResult.id == side_result.singles_result_id)
+        .join(orm.MatchDate, orm.MatchDate.id == orm.SinglesResult.match_date_id)
+        .join(orm.MatchResult, orm.MatchResult.match_date_id == orm.MatchDate.id)
+        .filter(side_result.player_id.is_not(None))
+    )
+
+
+def _doubles_links(
+    side_result: type[orm.base.Base],
+    pair_player: sqla.orm.InstrumentedAttribute[int],
+) -> sqla.Select:
+    home = side_result is orm.result.HomePairResult
+    return (
+        sqla.select(
+            pair_player,
+            orm.MatchResult.id,
+            orm.DoublesResult.category,
+            orm.MatchDate.home_team_id if home else orm.MatchDate.away_team_id,
+            sqla.literal(home),
+            side_result.win,
+        )
+        .join(orm.DoublesPair, orm.DoublesPair.id == side_result.doubles_pair_id)
+        .join(orm.DoublesResult, orm.DoublesResult.id == side_result.doubles_result_id)
+        .join(orm.MatchDate, orm.MatchDate.id == orm.DoublesResult.match_date_id)
+        .join(orm.MatchResult, orm.MatchResult.match_date_id == orm.MatchDate.id)
+        # the members of a pair are only set once it is complete
+        .filter(pair_player.is_not(None))
+    )
+
+
+def update_results(session: sqla.orm.Session | None = None) -> int:
+    """Rebuild the links of all new or changed match results, return how many."""
+    session = session or orm.db.get_session()
+    count = session.scalar(sqla.select(sqla.func.count()).select_from(stale_results().subquery()))
+    if not count:
+        return 0
+    stale = stale_results()
+
+    session.execute(sqla.delete(PlayedMatch).filter(PlayedMatch.match_result_id.in_(stale)))
+    session.execute(
+        sqla.delete(PlayedTeamMatch).filter(PlayedTeamMatch.match_result_id.in_(stale))
+    )
+    links = sqla.union_all(
+        *(
+            select.filter(orm.MatchResult.id.in_(stale))
+            for select in [
+                _singles_links(orm.result.HomePlayerResult),
+                _singles_links(orm.result.AwayPlayerResult),
+                _doubles_links(orm.result.HomePairResult, orm.DoublesPair.player_a_id),
+                _doubles_links(orm.result.HomePairResult, orm.DoublesPair.player_b_id),
+                _doubles_links(orm.result.AwayPairResult, orm.DoublesPair.player_a_id),
+                _doubles_links(orm.result.AwayPairResult, orm.DoublesPair.player_b_id),
+            ]
+        )
+    ).subquery()
+    session.execute(
+        sqla.insert(PlayedMatch).from_select(
+            ["player_id", "match_result_id", "category", "team_id", "home", "won"],
+            sqla.select(links).filter(links.c[3].is_not(None)),
+        )
+    )
+    session.execute(
+        sqla.insert(PlayedTeamMatch).from_select(
+            ["player_id", "match_result_id", "team_id"],
+            sqla.select(PlayedMatch.player_id, PlayedMatch.match_result_id, PlayedMatch.team_id)
+            .filter(PlayedMatch.match_result_id.in_(stale))
+            .distinct(),
+        )
+    )
+
+    session.execute(sqla.delete(PlayedResult).filter(PlayedResult.match_result_id.in_(stale)))
+    session.execute(
+        sqla.insert(PlayedResult).from_select(
+            ["match_result_id", "fetched_date_time"],
+            sqla.select(orm.MatchResult.id, orm.MatchResult.fetched_date_time).filter(
+                orm.MatchResult.id.in_(stale)
+            ),
+        )
+    )
+    session.commit()
+    return count
+
+
+@dataclasses.dataclass(frozen=True, kw_only=True)
+class PlayerTeams:
+    player_name: str
+    team_names: set[str]
+    played: int
+
+
+def players_by_club(club_name: str, session: sqla.orm.Session | None = None) -> list[PlayerTeams]:
+    """The players who played for teams of a club, with the teams and how often, most first."""
+    session = session or orm.db.get_session()
+    played = sqla.func.count().label("played")
+    rows = session.execute(
+        sqla.select(
+            orm.Player.name,
+            sqla.func.group_concat(sqla.distinct(orm.Team.name)),
+            played,
+        )
+        .select_from(PlayedMatch)
+        .join(orm.Player, orm.Player.id == PlayedMatch.player_id)
+        .join(orm.Team, orm.Team.id == PlayedMatch.team_id)
+        .filter(orm.Team.name.startswith(club_name))
+        .group_by(PlayedMatch.player_id)
+        .order_by(played.desc(), orm.Player.name)
+    ).all()
+    return [
+        PlayerTeams(player_name=name, team_names=set(team_names.split(",")), played=count)
+        for name, team_names, count in rows
+    ]
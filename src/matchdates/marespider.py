@@ -13,15 +13,9 @@ from matchdates.common_data import (
 )
 
 
-SETTINGS = settings.SETTINGS["crawling"]
-
-
 class MatchResultSpider(scrapy.Spider):
     name = "matchresultsspider"
-    allowed_domains = [SETTINGS["domain"]]
     start_urls = []
-    cookies = SETTINGS["cookies"]
-    # cookies = None
     inspect_counter = 0
     event_cat_map = {
         "HE1": ResultCategory.HE1,
@@ -39,17 +33,31 @@ class MatchResultSpider(scrapy.Spider):
     }
 
     def __init__(self, matchnrs: Optional[list[int]] = None, urls: Optional[list[str]] = None):
+        crawling = settings.get().crawling
         self.start_urls = [
-            f"https://www.{SETTINGS['domain']}/league/{SETTINGS['league_uuid']}/team-match/{i}"
+            f"https://www.{crawling.domain}/league/{crawling.league_uuid}/team-match/{i}"
             for i in matchnrs or []
         ] + (urls or [])
 
+    @property
+    def allowed_domains(self) -> list[str]:
+        return [settings.get().crawling.domain]
+
+    @property
+    def cookies(self) -> dict[str, str]:
+        return settings.get().crawling.cookies
+
     def start_requests(self) -> Iterator[scrapy.http.Request]:
         for url in self.start_urls:
             cookies = self.cookies
             if url.startswith("file:"):
                 cookies = None
-            yield scrapy.http.Request(url, cookies=cookies, callback=self.parse_matchdetail)
+            yield scrapy.http.Request(
+                url,
+                cookies=cookies,
+                callback=self.parse_matchdetail,
+                meta={"skip_unchanged": True},
+            )
 
     def parse_matchdetail(
         self,
@@ -0,0 +1,258 @@
+"""
+Scrapy downloader middlewares.
+
+The validator store remembers the HTTP validators (ETag, Last-Modified) and a
+hash of the body of every page whose items made it into the database, one store
+per database. Requests marked with ``meta["skip_unchanged"]`` are sent
+conditionally and dropped before parsing if the page did not change since. The
+validators of a newly parsed page stay pending until its items are committed:
+by the ORM pipeline (:data:`matchdates.pipelines.items_committed`) when
+streaming, or by :func:`commit_validators` after loading a feed file. The urls
+found unchanged by the last crawl are kept as well (:func:`unchanged_urls`).
+
+The archive middleware stores every fetched page in the page archive.
+
+Both must sit below ``HttpCompressionMiddleware`` (590) so they see decoded
+bodies, and the archive must come before the validator store so that it still
+sees the pages the validator store drops.
+"""
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+import pathlib
+import sqlite3
+from typing import Any, Self
+
+import scrapy
+import scrapy.crawler
+import scrapy.exceptions
+import scrapy.signals
+import scrapy.statscollectors
+
+from . import archive, orm, pipelines, settings
+
+
+@dataclasses.dataclass(frozen=True)
+class Validators:
+    etag: str | None
+    last_modified: str | None
+    body_hash: str
+
+
+class ValidatorStore:
+    """Persistent map from url to the validators of the last ingested response."""
+
+    def __init__(self, path: pathlib.Path | str):
+        self.connection = sqlite3.connect(path)
+        for table in ("validators", "pending"):
+            self.connection.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} ("
+                "url TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, body_hash TEXT NOT NULL)"
+            )
+        self.connection.execute("CREATE TABLE IF NOT EXISTS unchanged (url TEXT PRIMARY KEY)")
+
+    @classmethod
+    def for_database(cls, database: str) -> Self:
+        """The store of the database file ``database``."""
+        path = settings.get_crawl_datadir() / "validators"
+        path.mkdir(exist_ok=True)
+        return cls(path / f"{hashlib.sha256(database.encode()).hexdigest()}.sqlite")
+
+    def get(self, url: str) -> Validators | None:
+        row = self.connection.execute(
+            "SELECT etag, last_modified, body_hash FROM validators WHERE url = ?", (url,)
+        ).fetchone()
+        return Validators(*row) if row else None
+
+    def put(self, url: str, validators: Validators) -> None:
+        self._insert("validators", url, validators)
+
+    def stage(self, url: str, validators: Validators) -> None:
+        """Remember ``validators`` as pending until :meth:`commit`."""
+        self._insert("pending", url, validators)
+
+    def _insert(self, table: str, url: str, validators: Validators) -> None:
+        with self.connection:
+            self.connection.execute(
+                f"INSERT OR REPLACE INTO {table} VALUES (?, ?, ?, ?)",
+                (url, validators.etag, validators.last_modified, validators.body_hash),
+            )
+
+    def commit(self) -> None:
+        """Make the pending validators count, once the items of their pages are stored."""
+        with self.connection:
+            self.connection.execute("INSERT OR REPLACE INTO validators SELECT * FROM pending")
+            self.connection.execute("DELETE FROM pending")
+
+    def start_crawl(self) -> None:
+        """Forget the pending validators and unchanged urls of the previous crawl."""
+        with self.connection:
+            self.connection.execute("DELETE FROM pending")
+            self.connection.execute("DELETE FROM unchanged")
+
+    def mark_unchanged(self, url: str) -> None:
+        with self.connection:
+            self.connection.execute("INSERT OR IGNORE INTO unchanged VALUES (?)", (url,))
+
+    def unchanged(self) -> list[str]:
+        """The urls found not modified or unchanged since the start of the crawl."""
+        return [url for url, in self.connection.execute("SELECT url FROM unchanged")]
+
+    def close(self) -> None:
+        self.connection.close()
+
+
+def _current_store() -> ValidatorStore | None:
+    database = orm.db.database_file()
+    return None if database is None else ValidatorStore.for_database(database)
+
+
+def commit_validators() -> None:
+    """Commit the pending validators of the current database, after loading a feed file."""
+    if (store := _current_store()) is None:
+        return
+    try:
+        store.commit()
+    finally:
+        store.close()
+
+
+def unchanged_urls() -> list[str]:
+    """The urls the last crawl into the current database found unchanged."""
+    if (store := _current_store()) is None:
+        return []
+    try:
+        return store.unchanged()
+    finally:
+        store.close()
+
+
+def _header(response: scrapy.http.Response, name: str) -> str | None:
+    value = response.headers.get(name)
+    return value.decode("latin-1") if value else None
+
+
+class ValidatorStoreMiddleware:
+    """
+    Send conditional requests and skip parsing of unchanged pages.
+
+    The validators of a changed page are passed along in ``meta["validators"]``
+    and staged once an item scraped from it passed the item pipelines.
+
+    Databases in memory get no store, their pages are always parsed.
+    """
+
+    def __init__(self, store: ValidatorStore, stats: scrapy.statscollectors.StatsCollector):
+        self.store = store
+        self.stats = stats
+
+    @classmethod
+    def from_crawler(cls, crawler: scrapy.crawler.Crawler) -> Self:
+        if not crawler.settings.getbool("VALIDATOR_STORE_ENABLED"):
+            raise scrapy.exceptions.NotConfigured
+        if path := crawler.settings.get("VALIDATOR_STORE_PATH"):
+            store = ValidatorStore(path)
+        elif database := orm.db.database_file():
+            store = ValidatorStore.for_database(database)
+        else:
+            raise scrapy.exceptions.NotConfigured
+        middleware = cls(store, crawler.stats)
+        crawler.signals.connect(middleware.spider_opened, signal=scrapy.signals.spider_opened)
+        crawler.signals.connect(middleware.item_scraped, signal=scrapy.signals.item_scraped)
+        crawler.signals.connect(middleware.items_committed, signal=pipelines.items_committed)
+        crawler.signals.connect(middleware.spider_closed, signal=scrapy.signals.spider_closed)
+        return middleware
+
+    def spider_opened(self, spider: scrapy.Spider) -> None:
+        # pending validators left over are from a crawl whose items never got loaded
+        self.store.start_crawl()
+
+    def item_scraped(
+        self, item: Any, response: scrapy.http.Response, spider: scrapy.Spider
+    ) -> None:
+        if validators := response.meta.get("validators"):
+            self.store.stage(response.request.url, validators)
+
+    def items_committed(self) -> None:
+        self.store.commit()
+
+    def spider_closed(self, spider: scrapy.Spider) -> None:
+        self.store.close()
+
+    @staticmethod
+    def applies_to(request: scrapy.http.Request) -> bool:
+        return bool(request.meta.get("skip_unchanged")) and request.url.startswith("http")
+
+    def process_request(
+        self, request: scrapy.http.Request, spider: scrapy.Spider
+    ) -> None:
+        if not self.applies_to(request):
+            return None
+        if validators := self.store.get(request.url):
+            if validators.etag:
+                request.headers.setdefault("If-None-Match", validators.etag)
+            if validators.last_modified:
+                request.headers.setdefault("If-Modified-Since", validators.last_modified)
+        return None
+
+    def process_response(
+        self, request: scrapy.http.Request, response: scrapy.http.Response, spider: scrapy.Spider
+    ) -> scrapy.http.Response:
+        if not self.applies_to(request):
+            return response
+        if response.status == 304:
+            self.stats.inc_value("validators/not_modified")
+            self.store.mark_unchanged(request.url)
+            raise scrapy.exceptions.IgnoreRequest(f"Not modified: {request.url}")
+        if response.status != 200:
+            return response
+
+        body_hash = hashlib.sha256(response.body).hexdigest()
+        previous = self.store.get(request.url)
+        if previous and previous.body_hash == body_hash:
+            self.stats.inc_value("validators/unchanged")
+            self.store.mark_unchanged(request.url)
+            raise scrapy.exceptions.IgnoreRequest(f"Unchanged: {request.url}")
+        request.meta["validators"] = Validators(
+            etag=_header(response, "ETag"),
+            last_modified=_header(response, "Last-Modified"),
+            body_hash=body_hash,
+        )
+        return response
+
+
+class ArchiveMiddleware:
+    """Store every successfully fetched page in the page archive."""
+
+    def __init__(self, page_archive: archive.PageArchive):
+        self.archive = page_archive
+
+    @classmethod
+    def from_crawler(cls, crawler: scrapy.crawler.Crawler) -> Self:
+        if not crawler.settings.getbool("ARCHIVE_ENABLED"):
+            raise scrapy.exceptions.NotConfigured
+        path = crawler.settings.get("ARCHIVE_DIR") or archive.default_archive_dir()
+        middleware = cls(archive.PageArchive(path))
+        crawler.signals.connect(middleware.spider_closed, signal=scrapy.signals.spider_closed)
+        return middleware
+
+    def spider_closed(self, spider: scrapy.Spider) -> None:
+        self.archive.close()
+
+    def process_response(
+        self, request: scrapy.http.Request, response: scrapy.http.Response, spider: scrapy.Spider
+    ) -> scrapy.http.Response:
+        if (
+            response.status == 200
+            and request.url.startswith("http")
+            and isinstance(response, scrapy.http.TextResponse)
+        ):
+            self.archive.store(
+                response.url,
+                response.body,
+                spider=spider.name,
+                callback=getattr(request.callback, "__name__", "parse"),
+                encoding=response.encoding,
+            )
+        return response
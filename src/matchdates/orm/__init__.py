@@ -9,6 +9,11 @@ from . import matchdate
 from . import player
 from . import result
 from . import errors
+from . import profiles
+from . import generation
+from . import graph
+from . import rating
+from . import standing
 from .db import get_db
 from .club import Club
 from .draw import Draw
@@ -45,5 +50,10 @@ __all__ = [
     "matchdate",
     "player",
     "result",
-    "errors"
+    "errors",
+    "profiles",
+    "generation",
+    "graph",
+    "rating",
+    "standing",
 ]
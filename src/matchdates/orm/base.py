@@ -1,4 +1,4 @@
-from typing import Any, Self, Iterator
+from typing import Any, Self, Iterator, Sequence
 
 import sqlalchemy as sqla
 import sqlalchemy.orm
@@ -27,8 +27,8 @@ class Base(sqla.orm.MappedAsDataclass, sqla.orm.DeclarativeBase):
         return sqla.select(cls)
 
     @classmethod
-    def all(cls: type[Self]) -> Iterator[Self]:
-        return db.get_session().scalars(cls.select()).all()
+    def all(cls: type[Self], options: Sequence[sqla.orm.interfaces.ORMOption] = ()) -> Iterator[Self]:
+        return db.get_session().scalars(cls.select().options(*options)).all()
 
     @classmethod
     def get(cls: type[Self], id: Any) -> Self:
@@ -39,8 +39,10 @@ class Base(sqla.orm.MappedAsDataclass, sqla.orm.DeclarativeBase):
         return db.get_session().scalars(cls.select().filter_by(**filters)).all()
 
     @classmethod
-    def filter(cls: type[Self], *filters: Any) -> list[Self]:
-        return db.get_session().scalars(cls.select().filter(*filters)).all()
+    def filter(
+        cls: type[Self], *filters: Any, options: Sequence[sqla.orm.interfaces.ORMOption] = ()
+    ) -> list[Self]:
+        return db.get_session().scalars(cls.select().filter(*filters).options(*options)).all()
 
     @classmethod
     def one(cls: type[Self], **filters: Any) -> Self:
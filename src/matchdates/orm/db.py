@@ -1,3 +1,4 @@
+import pathlib
 import typing
 import sqlalchemy as sqla
 import sqlalchemy.orm
@@ -6,9 +7,6 @@ from typing import Self
 from matchdates import settings
 
 
-SETTINGS = settings.SETTINGS["database"]
-
-
 class DbContext:
     __stack: typing.ClassVar[list[Self]] = []
 
@@ -56,7 +54,7 @@ class DbContext:
     @classmethod
     def top(cls) -> Self:
         if not cls.__stack:
-            cls.push(f"sqlite:///{SETTINGS['sqlite_path']}")
+            cls.push(f"sqlite:///{settings.get().database.sqlite_path}")
         return cls.__stack[-1]
 
 
@@ -70,3 +68,11 @@ def get_db() -> sqla.Engine:
 
 def get_session() -> sqla.orm.Session:
     return current_context().session
+
+
+def database_file() -> str | None:
+    """The database file of the current context, ``None`` if it is in memory."""
+    database = get_db().url.database
+    if not database or database == ":memory:":
+        return None
+    return str(pathlib.Path(database).absolute())
@@ -0,0 +1,70 @@
+"""
+Data generation counter.
+
+Every commit that writes crawled data through the data2orm visitors increases the
+generation by one, so anything derived from the data can tell whether it is
+still current by comparing generations.
+"""
+from __future__ import annotations
+
+from typing import Any
+
+import sqlalchemy as sqla
+import sqlalchemy.orm
+from sqlalchemy.orm import Mapped
+
+from . import base
+
+
+__all__ = ["Generation", "bump", "current"]
+
+
+_PENDING = "matchdates.generation.pending"
+_CHANGED = "matchdates.generation.changed"
+
+
+class Generation(base.IDMixin, base.Base):
+    """The single row holding the current data generation."""
+
+    __tablename__ = "generation"
+    value: Mapped[int] = sqla.orm.mapped_column(default=0)
+
+
+def current(session: sqla.orm.Session) -> int:
+    return session.scalar(sqla.select(Generation.value)) or 0
+
+
+def bump(session: sqla.orm.Session) -> None:
+    """
+    Increase the generation once when ``session`` next commits.
+
+    Nothing happens if the commit turns out not to change any data, so that
+    loading the same data again keeps the generation.
+    """
+    session.info[_PENDING] = True
+
+
+@sqla.event.listens_for(sqla.orm.Session, "after_flush")
+def _note_changes(session: sqla.orm.Session, flush_context: Any) -> None:
+    if session.info.get(_PENDING):
+        session.info[_CHANGED] = True
+
+
+@sqla.event.listens_for(sqla.orm.Session, "before_commit")
+def _bump_pending(session: sqla.orm.Session) -> None:
+    if not session.info.pop(_PENDING, False):
+        return
+    changed = session.info.pop(_CHANGED, False) or any(
+        session.is_modified(instance) for instance in [*session.new, *session.dirty, *session.deleted]
+    )
+    if not changed:
+        return
+    updated = session.execute(sqla.update(Generation).values(value=Generation.value + 1))
+    if not updated.rowcount:
+        session.add(Generation(value=1))
+
+
+@sqla.event.listens_for(sqla.orm.Session, "after_soft_rollback")
+def _discard_pending(session: sqla.orm.Session, previous_transaction: Any) -> None:
+    session.info.pop(_PENDING, None)
+    session.info.pop(_CHANGED, None)
@@ -0,0 +1,60 @@
+"""
+Player to team match graph, derived from the match results.
+
+``PlayedMatch`` links a player to a team match result for every event (result
+category) they played in it, ``PlayedTeamMatch`` once per team match. Both record
+the team the player played for. ``PlayedResult`` remembers which version of each
+match result the links were derived from, so that :mod:`matchdates.graph_utils`
+only has to rebuild the links of results that changed.
+"""
+from __future__ import annotations
+
+import datetime
+
+import sqlalchemy as sqla
+import sqlalchemy.orm
+from sqlalchemy.orm import Mapped
+
+from matchdates import common_data
+from . import base
+
+
+__all__ = ["PlayedMatch", "PlayedResult", "PlayedTeamMatch"]
+
+
+class PlayedMatch(base.Base):
+    __tablename__ = "played_match"
+    __table_args__ = (sqla.Index(None, "team_id", "player_id"),)
+
+    player_id: Mapped[int] = sqla.orm.mapped_column(
+        sqla.ForeignKey("player.id"), primary_key=True
+    )
+    match_result_id: Mapped[int] = sqla.orm.mapped_column(
+        sqla.ForeignKey("match_result.id"), primary_key=True, index=True
+    )
+    category: Mapped[common_data.ResultCategory] = sqla.orm.mapped_column(primary_key=True)
+    team_id: Mapped[int] = sqla.orm.mapped_column(sqla.ForeignKey("team.id"))
+    home: Mapped[bool]
+    won: Mapped[bool | None]
+
+
+class PlayedTeamMatch(base.Base):
+    __tablename__ = "played_team_match"
+    __table_args__ = (sqla.Index(None, "team_id", "player_id"),)
+
+    player_id: Mapped[int] = sqla.orm.mapped_column(
+        sqla.ForeignKey("player.id"), primary_key=True
+    )
+    match_result_id: Mapped[int] = sqla.orm.mapped_column(
+        sqla.ForeignKey("match_result.id"), primary_key=True, index=True
+    )
+    team_id: Mapped[int] = sqla.orm.mapped_column(sqla.ForeignKey("team.id"))
+
+
+class PlayedResult(base.Base):
+    __tablename__ = "played_result"
+
+    match_result_id: Mapped[int] = sqla.orm.mapped_column(
+        sqla.ForeignKey("match_result.id"), primary_key=True
+    )
+    fetched_date_time: Mapped[datetime.datetime | None] = sqla.orm.mapped_column(sqla.DateTime)
@@ -1,12 +1,12 @@
 from __future__ import annotations
 
+import datetime
 import typing
 
 import pendulum
 import sqlalchemy as sqla
 import sqlalchemy.orm
 from sqlalchemy.orm import Mapped
-from sqlalchemy.ext.associationproxy import AssociationProxy, association_proxy
 
 from . import base
 from .location import Location
@@ -26,26 +26,25 @@ class MatchDate(base.IDMixin, base.Base):
     __tablename__ = "matchdate"
     url: Mapped[str]
     date_time: Mapped[pendulum.DateTime] = sqla.orm.mapped_column(
-        sqla.DateTime)
+        sqla.DateTime, index=True)
+    # derived from date_time, for integer range filters and grouping by day
+    utc_epoch: Mapped[int] = sqla.orm.mapped_column(init=False, repr=False, index=True)
+    local_date: Mapped[datetime.date] = sqla.orm.mapped_column(
+        sqla.Date, init=False, repr=False, index=True
+    )
 
-    away_team_assoc: Mapped[AwayTeamAssociation] = sqla.orm.relationship(
-        back_populates="match_date", cascade="all, delete-orphan", init=False, repr=False
+    away_team_id: Mapped[int | None] = sqla.orm.mapped_column(
+        sqla.ForeignKey("team.id"), init=False, repr=False, index=True
     )
-    away_team: AssociationProxy[Team] = association_proxy(
-        "away_team_assoc",
-        "team",
-        creator=lambda team_obj: AwayTeamAssociation(team=team_obj),
-        default=None,
+    away_team: Mapped[Team] = sqla.orm.relationship(
+        foreign_keys=[away_team_id], back_populates="away_dates", default=None
     )
 
-    home_team_assoc: Mapped[HomeTeamAssociation] = sqla.orm.relationship(
-        back_populates="match_date", cascade="all, delete-orphan", init=False, repr=False
+    home_team_id: Mapped[int | None] = sqla.orm.mapped_column(
+        sqla.ForeignKey("team.id"), init=False, repr=False, index=True
     )
-    home_team: AssociationProxy[Team] = association_proxy(
-        "home_team_assoc",
-        "team",
-        creator=lambda team_obj: HomeTeamAssociation(team=team_obj),
-        default=None,
+    home_team: Mapped[Team] = sqla.orm.relationship(
+        foreign_keys=[home_team_id], back_populates="home_dates", default=None
     )
 
     location_id: Mapped[int] = sqla.orm.mapped_column(
@@ -87,9 +86,22 @@ class MatchDate(base.IDMixin, base.Base):
         sqla.UniqueConstraint("url", "season_id"),
     )
 
+    @sqla.orm.validates("date_time")
+    def validate_date_time(self, key: str, date_time: datetime.datetime) -> datetime.datetime:
+        local = to_local(date_time)
+        self.utc_epoch = int(local.timestamp())
+        self.local_date = local.date()
+        self.__dict__["_local_date_time"] = (date_time, local)
+        return date_time
+
     @property
     def local_date_time(self) -> pendulum.DateTime:
-        return pendulum.instance(self.date_time, tz=pendulum.local_timezone())
+        # cached until date_time changes, rows loaded from the database fill it on first use
+        date_time, local = self.__dict__.get("_local_date_time", (None, None))
+        if date_time is not self.date_time:
+            local = to_local(self.date_time)
+            self.__dict__["_local_date_time"] = (self.date_time, local)
+        return local
 
     @property
     def last_change(self) -> ChangeLogEntry:
@@ -121,36 +133,6 @@ class MatchDate(base.IDMixin, base.Base):
         return self.url.rsplit("/", 1)[1]
 
 
-class AwayTeamAssociation(base.Base):
-    __tablename__ = "matchdate_away_team_assoc"
-    match_date_id: Mapped[int] = sqla.orm.mapped_column(
-        sqla.ForeignKey("matchdate.id"), primary_key=True, init=False
-    )
-    team_id: Mapped[int] = sqla.orm.mapped_column(
-        sqla.ForeignKey("team.id"), primary_key=True, init=False
-    )
-    match_date: Mapped[MatchDate] = sqla.orm.relationship(
-        back_populates="away_team_assoc", default=None
-    )
-    team: Mapped[Team] = sqla.orm.relationship(
-        back_populates="away_date_assocs", default=None)
-
-
-class HomeTeamAssociation(base.Base):
-    __tablename__ = "matchdate_home_team_assoc"
-    match_date_id: Mapped[int] = sqla.orm.mapped_column(
-        sqla.ForeignKey("matchdate.id"), primary_key=True, init=False
-    )
-    team_id: Mapped[int] = sqla.orm.mapped_column(
-        sqla.ForeignKey("team.id"), primary_key=True, init=False
-    )
-    match_date: Mapped[MatchDate] = sqla.orm.relationship(
-        back_populates="home_team_assoc", default=None
-    )
-    team: Mapped[Team] = sqla.orm.relationship(
-        back_populates="home_date_assocs", default=None)
-
-
 class ChangeLogEntry(base.Base):
     __tablename__ = "matchdate_changelog"
     match_date_id: Mapped[int] = sqla.orm.mapped_column(
@@ -172,7 +154,23 @@ class ChangeLogEntry(base.Base):
 
     @property
     def local_date_time(self) -> pendulum.DateTime:
-        return pendulum.instance(self.date_time, tz=pendulum.local_timezone())
+        return to_local(self.date_time)
+
+
+def to_local(date_time: datetime.datetime) -> pendulum.DateTime:
+    """Interpret a stored, naive match time as local wall time."""
+    return pendulum.instance(date_time, tz=pendulum.local_timezone())
+
+
+def epoch(moment: datetime.date | datetime.datetime) -> int:
+    """
+    UTC epoch seconds of a date or time, to compare against ``MatchDate.utc_epoch``.
+
+    Dates are taken as local midnight, naive times as local wall time.
+    """
+    if not isinstance(moment, datetime.datetime):
+        moment = datetime.datetime(moment.year, moment.month, moment.day)
+    return int(to_local(moment).timestamp())
 
 
 def by_team(team: Team) -> sqla.sql.elements.BooleanClauseList:
@@ -55,7 +55,7 @@ class Player(base.IDMixin, base.Base):
             raise ValueError(
                 f"Doubles pair {doubles_pair} already has two players.")
         elif len(doubles_pair) == 1:
-            if existing := DoublesPair.find(self, doubles_pair.players[0]):
+            if existing := DoublesPair.find(self, next(iter(doubles_pair.players))):
                 raise ValueError(
                     f"Doubles pair {existing} already exists."
                 )
@@ -76,10 +76,25 @@ class DoublesPair(base.IDMixin, base.Base):
     """A Doubles or Mixed Doubles Pair."""
 
     __tablename__ = "doubles_pair"
+    __table_args__ = (sqla.UniqueConstraint("player_a_id", "player_b_id"),)
     players: Mapped[set[Player]] = sqla.orm.relationship(
         secondary="player_doubles_association",
         back_populates="doubles_pairs"
-    )  # TODO: this is easy to duplicate?
+    )
+
+    # canonical key: the two players ordered by url, set once the pair is complete
+    player_a_id: Mapped[int | None] = sqla.orm.mapped_column(
+        sqla.ForeignKey(Player.id), init=False, repr=False, compare=False
+    )
+    player_b_id: Mapped[int | None] = sqla.orm.mapped_column(
+        sqla.ForeignKey(Player.id), init=False, repr=False, compare=False
+    )
+    player_a: Mapped[Player | None] = sqla.orm.relationship(
+        foreign_keys=[player_a_id], init=False, repr=False, compare=False
+    )
+    player_b: Mapped[Player | None] = sqla.orm.relationship(
+        foreign_keys=[player_b_id], init=False, repr=False, compare=False
+    )
 
     away_doubles_results: Mapped[list[AwayPairResult]] = sqla.orm.relationship(
 
@@ -112,16 +127,27 @@ class DoublesPair(base.IDMixin, base.Base):
         elif len(self.players) == 2:
             if (existing := self.find(*self.players)):
                 raise ValueError(f"Doubles pair {existing} already exists")
+            self.set_key(*self.players)
 
     @sqla.orm.validates("players")
     def validate_players(self, key: int, player: Player) -> Player:
         if len(self.players) > 1:
             raise ValueError(f"Doubles pair {self} already has two players!")
         elif len(self.players) == 1:
-            if (existing := self.find(self.players[0], player)):
+            other = next(iter(self.players))
+            if (existing := self.find(other, player)):
                 raise ValueError(f"Doubles pair {existing} already exists")
+            self.set_key(other, player)
         return player
 
+    @staticmethod
+    def ordered(player_a: Player, player_b: Player) -> tuple[Player, Player]:
+        """The players of a pair in canonical order."""
+        return (player_a, player_b) if player_a.url <= player_b.url else (player_b, player_a)
+
+    def set_key(self, player_a: Player, player_b: Player) -> None:
+        self.player_a, self.player_b = self.ordered(player_a, player_b)
+
     def __str__(self) -> str:
         return " / ".join(sorted(p.name for p in self.players))
 
@@ -131,13 +157,11 @@ class DoublesPair(base.IDMixin, base.Base):
     @classmethod
     def find(cls, player_a: Player, player_b: Player) -> Self | None:
         session = db.get_session()
+        player_a, player_b = cls.ordered(player_a, player_b)
         if player_a.id is None or player_b.id is None:
             return None
         return session.scalars(
-            cls.select().filter(
-                cls.players.contains(player_a)
-                & cls.players.contains(player_b)
-            )
+            cls.select().filter_by(player_a_id=player_a.id, player_b_id=player_b.id)
         ).one_or_none()
 
     @classmethod
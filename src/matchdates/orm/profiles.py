@@ -0,0 +1,38 @@
+"""
+Named eager loading profiles.
+
+Each profile returns the loader options for everything a listing or detail view
+touches, so that rendering it does not lazy load per row. Pass them to
+``Select.options()``.
+"""
+from __future__ import annotations
+
+import sqlalchemy as sqla
+import sqlalchemy.orm
+from sqlalchemy.orm.interfaces import ORMOption
+
+from .matchdate import MatchDate
+from .team import Team
+
+
+Profile = tuple[ORMOption, ...]
+
+
+def match_listing() -> Profile:
+    """Teams, location and season of match dates, as used by ``format.tabulate_match_dates``."""
+    return (
+        sqla.orm.joinedload(MatchDate.home_team),
+        sqla.orm.joinedload(MatchDate.away_team),
+        sqla.orm.joinedload(MatchDate.location),
+        sqla.orm.joinedload(MatchDate.season),
+    )
+
+
+def calendar() -> Profile:
+    """The match listing plus the teams' clubs, as checked by the calendar rules."""
+    return (
+        sqla.orm.joinedload(MatchDate.home_team).joinedload(Team.club),
+        sqla.orm.joinedload(MatchDate.away_team).joinedload(Team.club),
+        sqla.orm.joinedload(MatchDate.location),
+        sqla.orm.joinedload(MatchDate.season),
+    )
@@ -0,0 +1,40 @@
+"""
+Player rating snapshots, derived from the singles and doubles results.
+
+``PlayerRating`` holds a player's rating at the end of every match day on which
+it changed. ``RatedResult`` remembers a hash of the content of each match result
+the ratings include, so that :mod:`matchdates.ratings` only has to replay the
+match days from the earliest result that changed.
+"""
+from __future__ import annotations
+
+import datetime
+
+import sqlalchemy as sqla
+import sqlalchemy.orm
+from sqlalchemy.orm import Mapped
+
+from . import base
+
+
+__all__ = ["PlayerRating", "RatedResult"]
+
+
+class PlayerRating(base.Base):
+    __tablename__ = "player_rating"
+
+    player_id: Mapped[int] = sqla.orm.mapped_column(
+        sqla.ForeignKey("player.id"), primary_key=True
+    )
+    local_date: Mapped[datetime.date] = sqla.orm.mapped_column(primary_key=True, index=True)
+    rating: Mapped[float]
+    played: Mapped[int]
+
+
+class RatedResult(base.Base):
+    __tablename__ = "rated_result"
+
+    match_result_id: Mapped[int] = sqla.orm.mapped_column(
+        sqla.ForeignKey("match_result.id"), primary_key=True
+    )
+    content_hash: Mapped[str]
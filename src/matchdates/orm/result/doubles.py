@@ -14,6 +14,7 @@ from .common import PlayerResultBase
 class DoublesResult(base.IDMixin, base.Base):
 
     __tablename__ = "doubles_result"
+    __table_args__ = (sqla.Index(None, "match_date_id", "category"),)
     match_date_id: Mapped[int] = sqla.orm.mapped_column(
         sqla.ForeignKey(MatchDate.id), init=False, repr=False
     )
@@ -96,7 +97,7 @@ class HomePairResult(PlayerResultBase, base.Base):
     )
     doubles_result_id: Mapped[int] = sqla.orm.mapped_column(
         sqla.ForeignKey(DoublesResult.id), init=False, repr=False,
-        primary_key=True
+        primary_key=True, index=True
     )
 
     doubles_pair: Mapped[DoublesPair] = sqla.orm.relationship(
@@ -116,7 +117,7 @@ class AwayPairResult(PlayerResultBase, base.Base):
     )
     doubles_result_id: Mapped[int] = sqla.orm.mapped_column(
         sqla.ForeignKey(DoublesResult.id), init=False, repr=False,
-        primary_key=True
+        primary_key=True, index=True
     )
 
     doubles_pair: Mapped[DoublesPair] = sqla.orm.relationship(
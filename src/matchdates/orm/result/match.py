@@ -4,6 +4,7 @@ import enum
 import tabulate
 import textwrap
 
+import pendulum
 import sqlalchemy as sqla
 from sqlalchemy.orm import Mapped
 
@@ -35,7 +36,7 @@ class MatchResult(base.IDMixin, base.Base):
 
     __tablename__ = "match_result"
     match_date_id: Mapped[int] = sqla.orm.mapped_column(
-        sqla.ForeignKey(MatchDate.id), init=False, repr=False
+        sqla.ForeignKey(MatchDate.id), init=False, repr=False, index=True
     )
     match_date: Mapped[MatchDate] = sqla.orm.relationship(
         back_populates="match_result"
@@ -44,6 +45,13 @@ class MatchResult(base.IDMixin, base.Base):
     walkover: Mapped[bool]
     home_points: Mapped[int]
     away_points: Mapped[int]
+    fetched_date_time: Mapped[pendulum.DateTime | None] = sqla.orm.mapped_column(
+        sqla.DateTime, default=None, repr=False
+    )
+    # last time a crawl found the result page unchanged, it was not parsed then
+    checked_date_time: Mapped[pendulum.DateTime | None] = sqla.orm.mapped_column(
+        sqla.DateTime, default=None, repr=False
+    )
 
     def render(self) -> str:
         results = sorted(
@@ -14,6 +14,7 @@ from .common import PlayerResultBase
 class SinglesResult(base.IDMixin, base.Base):
 
     __tablename__ = "singles_result"
+    __table_args__ = (sqla.Index(None, "match_date_id", "category"),)
     match_date_id: Mapped[int] = sqla.orm.mapped_column(
         sqla.ForeignKey(MatchDate.id), init=False, repr=False
     )
@@ -96,7 +97,8 @@ class HomePlayerResult(PlayerResultBase, base.Base):
     )
 
     singles_result_id: Mapped[int] = sqla.orm.mapped_column(
-        sqla.ForeignKey(SinglesResult.id), init=False, repr=False, primary_key=True
+        sqla.ForeignKey(SinglesResult.id), init=False, repr=False, primary_key=True,
+        index=True
     )
 
     player: Mapped[Player] = sqla.orm.relationship(
@@ -115,7 +117,8 @@ class AwayPlayerResult(PlayerResultBase, base.Base):
     )
 
     singles_result_id: Mapped[int] = sqla.orm.mapped_column(
-        sqla.ForeignKey(SinglesResult.id), init=False, repr=False, primary_key=True
+        sqla.ForeignKey(SinglesResult.id), init=False, repr=False, primary_key=True,
+        index=True
     )
 
     player: Mapped[Player] = sqla.orm.relationship(
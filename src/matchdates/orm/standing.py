@@ -0,0 +1,32 @@
+"""
+Per draw standings, kept up to date by :mod:`matchdates.standings`.
+
+One row per team and draw with the sums over the team's match results in the
+draw, so that a standings table is a single lookup by draw.
+"""
+from __future__ import annotations
+
+import sqlalchemy as sqla
+import sqlalchemy.orm
+from sqlalchemy.orm import Mapped
+
+from . import base
+
+
+__all__ = ["Standing"]
+
+
+class Standing(base.Base):
+    __tablename__ = "standing"
+
+    draw_id: Mapped[int] = sqla.orm.mapped_column(sqla.ForeignKey("draw.id"), primary_key=True)
+    team_id: Mapped[int] = sqla.orm.mapped_column(sqla.ForeignKey("team.id"), primary_key=True)
+    played: Mapped[int] = sqla.orm.mapped_column(default=0)
+    points: Mapped[int] = sqla.orm.mapped_column(default=0)
+    wins: Mapped[int] = sqla.orm.mapped_column(default=0)
+    draws: Mapped[int] = sqla.orm.mapped_column(default=0)
+    losses: Mapped[int] = sqla.orm.mapped_column(default=0)
+    disciplines_won: Mapped[int] = sqla.orm.mapped_column(default=0)
+    disciplines_lost: Mapped[int] = sqla.orm.mapped_column(default=0)
+    sets_won: Mapped[int] = sqla.orm.mapped_column(default=0)
+    sets_lost: Mapped[int] = sqla.orm.mapped_column(default=0)
@@ -18,22 +18,10 @@ __all__ = ["Team"]
 
 
 if typing.TYPE_CHECKING:
-    from .matchdate import MatchDate, AwayTeamAssociation, HomeTeamAssociation
+    from .matchdate import MatchDate
     from .player import DoublesPair, Player, TeamAssociation, TeamPairAssociation
 
 
-def create_away_team_assoc(match_date_obj: MatchDate) -> AwayTeamAssociation:
-    from .matchdate import AwayTeamAssociation
-
-    return AwayTeamAssociation(match_date=match_date_obj)
-
-
-def create_home_team_assoc(match_date_obj: MatchDate) -> HomeTeamAssociation:
-    from .matchdate import HomeTeamAssociation
-
-    return HomeTeamAssociation(match_date=match_date_obj)
-
-
 def create_player_team_assoc(player_obj: Player) -> TeamAssociation:
     from .player import TeamAssociation
 
@@ -81,24 +69,16 @@ class Team(base.IDMixin, base.Base):
         repr=False,
     )
 
-    away_date_assocs: Mapped[list[AwayTeamAssociation]] = sqla.orm.relationship(
-        back_populates="team", cascade="all, delete-orphan", init=False, repr=False
-    )
-    away_dates: AssociationProxy[list[MatchDate]] = association_proxy(
-        "away_date_assocs",
-        "match_date",
-        creator=create_away_team_assoc,
+    away_dates: Mapped[list[MatchDate]] = sqla.orm.relationship(
+        back_populates="away_team",
+        foreign_keys="MatchDate.away_team_id",
         default_factory=list,
         repr=False,
     )
 
-    home_date_assocs: Mapped[list[HomeTeamAssociation]] = sqla.orm.relationship(
-        back_populates="team", cascade="all, delete-orphan", init=False, repr=False
-    )
-    home_dates: AssociationProxy[list[MatchDate]] = association_proxy(
-        "home_date_assocs",
-        "match_date",
-        creator=create_home_team_assoc,
+    home_dates: Mapped[list[MatchDate]] = sqla.orm.relationship(
+        back_populates="home_team",
+        foreign_keys="MatchDate.home_team_id",
         default_factory=list,
         repr=False,
     )
@@ -0,0 +1,152 @@
+"""
+Player participation matrix.
+
+A sparse player x match date matrix holding, for every match date (event) a
+player played in, the number of matches (singles and doubles results) they
+played and the team they played for. It is read with one query over all
+results, home and away, and the per team, per season and total counts of every
+player are reductions over its rows.
+"""
+from __future__ import annotations
+
+import array
+import collections
+import dataclasses
+from typing import Self
+
+import sqlalchemy as sqla
+import sqlalchemy.orm
+
+from . import orm
+from .sparse import Csr
+
+
+@dataclasses.dataclass(frozen=True, kw_only=True)
+class PlayerCounts:
+    """How often a player played: events and matches, for one team and in total."""
+
+    events_for_team: int
+    events_total: int
+    matches_for_team: int
+    matches_total: int
+
+
+def _singles_sides(side_result: type[orm.base.Base], home: bool) -> sqla.Select:
+    return (
+        sqla.select(
+            side_result.player_id.label("player_id"),
+            orm.MatchDate.id.label("match_date_id"),
+            (orm.MatchDate.home_team_id if home else orm.MatchDate.away_team_id).label("team_id"),
+            orm.MatchDate.season_id.label("season_id"),
+        )
+        .select_from(side_result)
+        .join(orm.SinglesResult, orm.SinglesResult.id == side_result.singles_result_id)
+        .join(orm.MatchDate, orm.MatchDate.id == orm.SinglesResult.match_date_id)
+        .filter(side_result.player_id.is_not(None))
+    )
+
+
+def _doubles_sides(
+    side_result: type[orm.base.Base], home: bool, pair_player: sqla.orm.InstrumentedAttribute[int]
+) -> sqla.Select:
+    return (
+        sqla.select(
+            pair_player.label("player_id"),
+            orm.MatchDate.id.label("match_date_id"),
+            (orm.MatchDate.home_team_id if home else orm.MatchDate.away_team_id).label("team_id"),
+            orm.MatchDate.season_id.label("season_id"),
+        )
+        .select_from(side_result)
+        .join(orm.DoublesPair, orm.DoublesPair.id == side_result.doubles_pair_id)
+        .join(orm.DoublesResult, orm.DoublesResult.id == side_result.doubles_result_id)
+        .join(orm.MatchDate, orm.MatchDate.id == orm.DoublesResult.match_date_id)
+        .filter(pair_player.is_not(None))
+    )
+
+
+@dataclasses.dataclass(frozen=True)
+class ParticipationMatrix:
+    """Rows are players, columns match dates; data ``matches`` and ``team`` (a team id)."""
+
+    player_ids: array.array
+    match_ids: array.array
+    match_seasons: array.array
+    matrix: Csr
+
+    @classmethod
+    def build(cls, session: sqla.orm.Session | None = None) -> Self:
+        session = session or orm.db.get_session()
+        result = orm.result
+        sides = sqla.union_all(
+            _singles_sides(result.HomePlayerResult, home=True),
+            _singles_sides(result.AwayPlayerResult, home=False),
+            _doubles_sides(result.HomePairResult, True, orm.DoublesPair.player_a_id),
+            _doubles_sides(result.HomePairResult, True, orm.DoublesPair.player_b_id),
+            _doubles_sides(result.AwayPairResult, False, orm.DoublesPair.player_a_id),
+            _doubles_sides(result.AwayPairResult, False, orm.DoublesPair.player_b_id),
+        ).subquery()
+        rows = session.execute(
+            sqla.select(
+                sides.c.player_id,
+                sides.c.match_date_id,
+                sides.c.team_id,
+                sides.c.season_id,
+                sqla.func.count(),
+            )
+            .group_by(
+                sides.c.player_id, sides.c.match_date_id, sides.c.team_id, sides.c.season_id
+            )
+            .order_by(sides.c.player_id, sides.c.match_date_id)
+        ).all()
+
+        player_ids = sorted({row[0] for row in rows})
+        match_seasons = dict(sorted({(row[1], row[3]) for row in rows}))
+        player_nodes = {id: node for node, id in enumerate(player_ids)}
+        match_nodes = {id: node for node, id in enumerate(match_seasons)}
+        return cls(
+            player_ids=array.array("q", player_ids),
+            match_ids=array.array("q", match_seasons.keys()),
+            match_seasons=array.array("q", match_seasons.values()),
+            matrix=Csr.from_edges(
+                len(player_ids),
+                ((player_nodes[row[0]], match_nodes[row[1]]) for row in rows),
+                matches=(row[4] for row in rows),
+                team=(row[2] or 0 for row in rows),
+            ),
+        )
+
+    def totals(self) -> tuple[array.array, array.array]:
+        """Number of events and of matches every player played, by row."""
+        indptr, matches = self.matrix.indptr, self.matrix.data["matches"]
+        rows = range(len(self.player_ids))
+        events_total = array.array("q", (indptr[row + 1] - indptr[row] for row in rows))
+        matches_total = array.array(
+            "q", (sum(matches[indptr[row]:indptr[row + 1]]) for row in rows)
+        )
+        return events_total, matches_total
+
+    def by_team_and_season(self) -> dict[tuple[int, int], dict[int, PlayerCounts]]:
+        """Counts per ``(team id, season id)`` and player id, for every team and season."""
+        events_total, matches_total = self.totals()
+        matrix = self.matrix
+        teams, matches = matrix.data["team"], matrix.data["matches"]
+        per_team: dict[tuple[int, int], dict[int, list[int]]] = collections.defaultdict(dict)
+        for row, player_id in enumerate(self.player_ids):
+            for edge in matrix.edges(row):
+                key = (teams[edge], self.match_seasons[matrix.indices[edge]])
+                counts = per_team[key].setdefault(player_id, [0, 0])
+                counts[0] += 1
+                counts[1] += matches[edge]
+        player_rows = {id: row for row, id in enumerate(self.player_ids)}
+        return {
+            key: {
+                player_id: PlayerCounts(
+                    events_for_team=team_events,
+                    events_total=events_total[player_rows[player_id]],
+                    matches_for_team=team_matches,
+                    matches_total=matches_total[player_rows[player_id]],
+                )
+                for player_id, (team_events, team_matches) in players.items()
+            }
+            for key, players in per_team.items()
+        }
@@ -0,0 +1,90 @@
+"""
+Scrapy item pipelines.
+
+The ORM pipeline hands every crawled item to the data2orm visitors while the
+crawl is still running, instead of collecting them in a feed file first. The
+items are converted and committed in chunks, to keep the crawl's reactor thread
+from waiting on the database for every item. It sends :data:`items_committed`
+whenever the items it received so far are committed.
+"""
+from __future__ import annotations
+
+from typing import Any, Self
+
+import scrapy
+import scrapy.crawler
+import scrapy.exceptions
+import scrapy.signalmanager
+import sqlalchemy as sqla
+
+from . import common_data as cd, data2orm, orm
+
+
+items_committed = object()
+
+
+class OrmPipeline:
+    """Convert match dates and team match results into the current database."""
+
+    def __init__(
+        self, chunk_size: int, signals: scrapy.signalmanager.SignalManager | None = None
+    ):
+        self.chunk_size = chunk_size
+        self.signals = signals
+
+    @classmethod
+    def from_crawler(cls, crawler: scrapy.crawler.Crawler) -> Self:
+        return cls(
+            chunk_size=crawler.settings.getint("ORM_PIPELINE_CHUNK_SIZE", 100),
+            signals=crawler.signals,
+        )
+
+    def open_spider(self, spider: scrapy.Spider) -> None:
+        self.session = orm.db.get_session()
+        self.matchdate_converter = data2orm.matchdate.BulkMatchdateToOrm(
+            session=self.session, chunk_size=self.chunk_size
+        )
+        self.matchdate_converter.preload()
+        self.known_matchdates = set(
+            self.session.execute(
+                sqla.select(orm.Season.url, orm.MatchDate.url).join(
+                    orm.Season, orm.Season.id == orm.MatchDate.season_id
+                )
+            ).tuples()
+        )
+        self.results: list[cd.TeamMatchResult] = []
+
+    def close_spider(self, spider: scrapy.Spider) -> None:
+        self.flush_results()
+        self.session.commit()
+        self.committed()
+
+    def committed(self) -> None:
+        if self.signals:
+            self.signals.send_catch_log(signal=items_committed)
+
+    def flush_results(self) -> None:
+        if not self.results:
+            return
+        # the match dates of this crawl must be committed before the results are matched up
+        self.session.commit()
+        data2orm.results.BulkResultToOrm(session=self.session).ingest(self.results)
+        self.results = []
+        self.committed()
+
+    def process_item(self, item: Any, spider: scrapy.Spider) -> Any:
+        match item:
+            case cd.MatchDate():
+                matchdate = self.matchdate_converter.add(item)
+                self.known_matchdates.add((matchdate.season.url, matchdate.url))
+                if not self.matchdate_converter.pending:
+                    self.committed()
+            case cd.TeamMatchResult():
+                url_parts = item.url.split("/")
+                key = ("/".join(url_parts[-4:-2]), "/".join(url_parts[-2:]))
+                if key not in self.known_matchdates:
+                    raise scrapy.exceptions.DropItem(f"No match date for result {item.url}")
+                self.results.append(item)
+                if len(self.results) >= self.chunk_size:
+                    self.flush_results()
+        return item
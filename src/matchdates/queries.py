@@ -1,7 +1,9 @@
+import collections
 import dataclasses
+import datetime
 import enum
 import itertools
-from typing import Any, Iterator
+from typing import Any, Iterable, Iterator
 
 import pendulum
 import sqlalchemy as sqla
@@ -16,6 +18,24 @@ class MatchClashSeverity(enum.IntEnum):
     PROBABLY_INTENTIONAL = 1
 
 
+def clash_severity(matches: list[orm.MatchDate]) -> MatchClashSeverity:
+    combinations = itertools.combinations(
+        [pendulum.instance(m.date_time) for m in matches], 2
+    )
+    time_between = [abs(c[0] - c[1]).total_hours() for c in combinations]
+    # not enough time in between matches
+    if any([dt < 2.25 for dt in time_between]):
+        return MatchClashSeverity.UNPLAYABLE
+    # multiple locations on same day but potentially enough time if they are close
+    elif len(set(m.location.id for m in matches)) > 1:
+        # not enough time in the general case
+        if any([dt < 3.75 for dt in time_between]):
+            return MatchClashSeverity.UNPLAYABLE
+        return MatchClashSeverity.WARNING
+    # if we get to here it's in the same place with enough time
+    return MatchClashSeverity.PROBABLY_INTENTIONAL
+
+
 @dataclasses.dataclass(frozen=True, kw_only=True)
 class MatchClashResult:
     day: pendulum.Date
@@ -24,21 +44,19 @@ class MatchClashResult:
 
     @property
     def severity(self):
-        combinations = itertools.combinations(
-            [pendulum.instance(m.date_time) for m in self.matches], 2
-        )
-        time_between = [abs(c[0] - c[1]).total_hours() for c in combinations]
-        # not enough time in between matches
-        if any([dt < 2.25 for dt in time_between]):
-            return MatchClashSeverity.UNPLAYABLE
-        # multiple locations on same day but potentially enough time if they are close
-        elif len(set(m.location.id for m in self.matches)) > 1:
-            # not enough time in the general case
-            if any([dt < 3.75 for dt in time_between]):
-                return MatchClashSeverity.UNPLAYABLE
-            return MatchClashSeverity.WARNING
-        # if we get to here it's in the same place with enough time
-        return MatchClashSeverity.PROBABLY_INTENTIONAL
+        return clash_severity(self.matches)
+
+
+@dataclasses.dataclass(frozen=True, kw_only=True)
+class PlayerClashResult:
+    day: pendulum.Date
+    player_name: str
+    team_names: list[str]
+    matches: list[orm.MatchDate]
+
+    @property
+    def severity(self):
+        return clash_severity(self.matches)
 
 
 def match_clashes(team: orm.Team, date=pendulum.Date) -> Iterator[MatchClashResult]:
@@ -46,23 +64,213 @@ def match_clashes(team: orm.Team, date=pendulum.Date) -> Iterator[MatchClashResu
         groups = list(
             session.execute(
                 sqla.select(
-                    sqla.func.strftime("%Y-%m-%d", orm.MatchDate.date_time),
+                    orm.MatchDate.local_date,
                     sqla.func.aggregate_strings(orm.MatchDate.id, ", "),
                 )
                 .filter(
                     ((orm.MatchDate.home_team == team) |
                      (orm.MatchDate.away_team == team))
-                    & (orm.MatchDate.date_time > date_utils.season_start(date).naive())
-                    & (orm.MatchDate.date_time <= date_utils.season_end(date).naive())
+                    & _season_range(date)
                 )
-                .group_by(sqla.func.strftime("%Y-%m-%d", orm.MatchDate.date_time))
+                .group_by(orm.MatchDate.local_date)
                 .having(sqla.func.count() > 1)
             )
         )
-        for date_str, match_ids in groups:
+        for local_date, match_ids in groups:
             yield MatchClashResult(
-                day=pendulum.from_format(date_str, "YYYY-MM-DD"),
+                day=_day(local_date),
                 team_name=team.name,
                 matches=[session.get(orm.MatchDate, int(id))
                          for id in match_ids.split(", ")],
             )
+
+
+def _day(local_date: datetime.date) -> pendulum.DateTime:
+    return pendulum.datetime(local_date.year, local_date.month, local_date.day)
+
+
+def _season_range(date: pendulum.Date) -> sqla.ColumnElement[bool]:
+    return (
+        (orm.MatchDate.utc_epoch > orm.matchdate.epoch(date_utils.season_start(date)))
+        & (orm.MatchDate.utc_epoch <= orm.matchdate.epoch(date_utils.season_end(date)))
+    )
+
+
+def _team_sides() -> sqla.Subquery:
+    """Every (team_id, match_date_id) a team plays in, home or away."""
+    return sqla.union_all(
+        sqla.select(
+            orm.MatchDate.home_team_id.label("team_id"), orm.MatchDate.id.label("match_date_id")
+        ),
+        sqla.select(
+            orm.MatchDate.away_team_id.label("team_id"), orm.MatchDate.id.label("match_date_id")
+        ),
+    ).subquery()
+
+
+def load_matches(ids: Iterable[int]) -> dict[int, orm.MatchDate]:
+    """Fetch match dates by id in one go, with what is needed to display them."""
+    return {
+        match.id: match
+        for match in orm.db.get_session().scalars(
+            orm.MatchDate.select()
+            .filter(orm.MatchDate.id.in_(set(ids)))
+            .options(
+                sqla.orm.joinedload(orm.MatchDate.location),
+                sqla.orm.joinedload(orm.MatchDate.home_team),
+                sqla.orm.joinedload(orm.MatchDate.away_team),
+            )
+        )
+    }
+
+
+def league_clashes(date: pendulum.Date) -> dict[str, list[MatchClashResult]]:
+    """
+    Find the days on which any team of the league plays more than once.
+
+    All clashes of the season around ``date`` are found with a single grouped query,
+    the clashing matches are then loaded together. Clashes are grouped by team name,
+    teams and days in order.
+    """
+    session = orm.db.get_session()
+    sides = _team_sides()
+    day = orm.MatchDate.local_date
+    rows = session.execute(
+        sqla.select(
+            orm.Team.name,
+            day,
+            sqla.func.aggregate_strings(orm.MatchDate.id, ", "),
+        )
+        .select_from(sides)
+        .join(orm.MatchDate, orm.MatchDate.id == sides.c.match_date_id)
+        .join(orm.Team, orm.Team.id == sides.c.team_id)
+        .filter(_season_range(date))
+        .group_by(sides.c.team_id, day)
+        .having(sqla.func.count() > 1)
+        .order_by(orm.Team.name, day)
+    ).all()
+    groups = [
+        (team_name, local_date, [int(id) for id in ids.split(", ")])
+        for team_name, local_date, ids in rows
+    ]
+    matches = load_matches(itertools.chain.from_iterable(ids for *_, ids in groups))
+
+    clashes: dict[str, list[MatchClashResult]] = {}
+    for team_name, local_date, ids in groups:
+        clashes.setdefault(team_name, []).append(
+            MatchClashResult(
+                day=_day(local_date),
+                team_name=team_name,
+                matches=[matches[id] for id in ids],
+            )
+        )
+    return clashes
+
+
+def player_clashes(date: pendulum.Date) -> dict[str, list[PlayerClashResult]]:
+    """
+    Find the days on which a player affiliated with several teams is due for more than one.
+
+    Players' team affiliations and the season's matches are read with one query each,
+    the matches are then swept in date order, one day at a time, collecting for every
+    multi-team player the matches of their teams on that day. Clashes are grouped by
+    player name, players and days in order.
+    """
+    session = orm.db.get_session()
+    player_teams: dict[int, set[int]] = collections.defaultdict(set)
+    player_names: dict[int, str] = {}
+    for player_id, player_name, team_id in session.execute(
+        sqla.select(orm.Player.id, orm.Player.name, orm.player.TeamAssociation.team_id)
+        .join(orm.player.TeamAssociation)
+    ):
+        player_teams[player_id].add(team_id)
+        player_names[player_id] = player_name
+    team_players: dict[int, list[int]] = collections.defaultdict(list)
+    for player_id, team_ids in player_teams.items():
+        if len(team_ids) > 1:
+            for team_id in team_ids:
+                team_players[team_id].append(player_id)
+
+    sides = _team_sides()
+    rows = session.execute(
+        sqla.select(orm.MatchDate.local_date, sides.c.team_id, orm.MatchDate.id)
+        .select_from(sides)
+        .join(orm.MatchDate, orm.MatchDate.id == sides.c.match_date_id)
+        .filter(_season_range(date) & sides.c.team_id.in_(team_players))
+        .order_by(orm.MatchDate.utc_epoch)
+    ).all()
+
+    found: list[tuple[datetime.date, int, dict[int, list[int]]]] = []
+    for local_date, day_rows in itertools.groupby(rows, key=lambda row: row[0]):
+        due: dict[int, dict[int, list[int]]] = collections.defaultdict(dict)
+        for _, team_id, match_id in day_rows:
+            for player_id in team_players[team_id]:
+                due[player_id].setdefault(team_id, []).append(match_id)
+        found.extend(
+            (local_date, player_id, matches_by_team)
+            for player_id, matches_by_team in due.items()
+            # two of the player's teams playing each other is not a clash
+            if len(matches_by_team) > 1
+            and len({id for ids in matches_by_team.values() for id in ids}) > 1
+        )
+
+    matches = load_matches(
+        id for *_, matches_by_team in found for ids in matches_by_team.values() for id in ids
+    )
+    team_names = dict(
+        session.execute(
+            sqla.select(orm.Team.id, orm.Team.name).filter(
+                orm.Team.id.in_({id for *_, by_team in found for id in by_team})
+            )
+        ).all()
+    )
+    clashes: dict[str, list[PlayerClashResult]] = {}
+    for local_date, player_id, matches_by_team in sorted(
+        found, key=lambda clash: (player_names[clash[1]], clash[1], clash[0])
+    ):
+        clashes.setdefault(player_names[player_id], []).append(
+            PlayerClashResult(
+                day=_day(local_date),
+                player_name=player_names[player_id],
+                team_names=sorted(team_names[id] for id in matches_by_team),
+                matches=sorted(
+                    (
+                        matches[id]
+                        for id in {id for ids in matches_by_team.values() for id in ids}
+                    ),
+                    key=lambda match: match.date_time,
+                ),
+            )
+        )
+    return clashes
+
+
+def matches_needing_results(
+    season: orm.Season, settle_days: int, now: pendulum.DateTime | None = None
+) -> list[orm.MatchDate]:
+    """
+    Select the played matches of a season whose result is missing or may still change.
+
+    A result may still change if it was last fetched, or last found unchanged, less than
+    ``settle_days`` after the match.
+    """
+    now = now or pendulum.now()
+    fetched, checked = orm.MatchResult.fetched_date_time, orm.MatchResult.checked_date_time
+    # sqlite's max() of several values is NULL if any of them is
+    last_seen = sqla.func.max(
+        sqla.func.coalesce(fetched, checked), sqla.func.coalesce(checked, fetched)
+    )
+    return orm.db.get_session().scalars(
+        orm.MatchDate.select()
+        .outerjoin(orm.MatchResult)
+        .filter(
+            orm.matchdate.by_season(season)
+            & (orm.MatchDate.utc_epoch < orm.matchdate.epoch(now))
+            & (
+                orm.MatchResult.id.is_(None)
+                | last_seen.is_(None)
+                | (last_seen < sqla.func.datetime(orm.MatchDate.date_time, f"+{settle_days} days"))
+            )
+        )
+        .order_by(orm.MatchDate.utc_epoch)
+    ).all()
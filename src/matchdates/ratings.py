@@ -0,0 +1,289 @@
+"""
+Elo ratings of players, from all singles and doubles results.
+
+The result history is read with one query into columns of ``array.array``: the
+match day, the home and away players (two per side for doubles, the second one
+``0`` for singles) and the score of the home side, from the win flags or else
+from the sets won. Ratings are then computed one match day at a time: all
+results of a day are scored against the ratings at the start of the day and the
+changes are applied together at its end. A doubles pair plays with the mean
+rating of its players and both players get the full change.
+
+The ratings after every match day are saved as snapshots
+(:mod:`matchdates.orm.rating`). Updating replays only the match days from the
+earliest new or changed result on, starting from the snapshots before it. A
+result changed if the hash of what the ratings take from it did.
+"""
+from __future__ import annotations
+
+import array
+import collections
+import dataclasses
+import datetime
+import hashlib
+import statistics
+from typing import Iterator, NamedTuple, Self
+
+import sqlalchemy as sqla
+import sqlalchemy.orm
+
+from . import orm
+from .orm.rating import PlayerRating, RatedResult
+
+
+__all__ = ["Rating", "ResultHistory", "expected_score", "rate", "snapshot", "update"]
+
+
+INITIAL_RATING = 1500.0
+K_FACTOR = 32.0
+SCALE = 400.0
+
+
+class Rating(NamedTuple):
+    rating: float = INITIAL_RATING
+    played: int = 0
+
+
+def expected_score(rating: float, other: float) -> float:
+    """The expected score, or win probability, of a side rated ``rating`` against ``other``."""
+    return 1 / (1 + 10 ** ((other - rating) / SCALE))
+
+
+def _outcome(home: type[orm.base.Base], away: type[orm.base.Base]) -> list[sqla.ColumnElement]:
+    return [
+        home.win,
+        away.win,
+        home.set_1_points,
+        home.set_2_points,
+        home.set_3_points,
+        away.set_1_points,
+        away.set_2_points,
+        away.set_3_points,
+    ]
+
+
+def _home_score(
+    home_win: bool | None, away_win: bool | None, *points: int | None
+) -> float | None:
+    """1 for a home win, 0 for an away win, ``None`` if the result was not decided."""
+    if bool(home_win) != bool(away_win):
+        return 1.0 if home_win else 0.0
+    sets = [home > away for home, away in zip(points[:3], points[3:]) if None not in (home, away)]
+    if sum(sets) * 2 == len(sets):
+        return None
+    return 1.0 if sum(sets) * 2 > len(sets) else 0.0
+
+
+def _singles_history(since: datetime.date | None) -> sqla.Select:
+    home, away = orm.result.HomePlayerResult, orm.result.AwayPlayerResult
+    select = (
+        sqla.select(
+            orm.MatchDate.local_date,
+            home.player_id,
+            sqla.literal(0),
+            away.player_id,
+            sqla.literal(0),
+            *_outcome(home, away),
+        )
+        .select_from(orm.SinglesResult)
+        .join(home, home.singles_result_id == orm.SinglesResult.id)
+        .join(away, away.singles_result_id == orm.SinglesResult.id)
+        .join(orm.MatchDate, orm.MatchDate.id == orm.SinglesResult.match_date_id)
+        .filter(home.player_id.is_not(None), away.player_id.is_not(None))
+    )
+    return select if since is None else select.filter(orm.MatchDate.local_date >= since)
+
+
+def _doubles_history(since: datetime.date | None) -> sqla.Select:
+    home, away = orm.result.HomePairResult, orm.result.AwayPairResult
+    home_pair = sqla.orm.aliased(orm.DoublesPair)
+    away_pair = sqla.orm.aliased(orm.DoublesPair)
+    select = (
+        sqla.select(
+            orm.MatchDate.local_date,
+            home_pair.player_a_id,
+            sqla.func.coalesce(home_pair.player_b_id, 0),
+            away_pair.player_a_id,
+            sqla.func.coalesce(away_pair.player_b_id, 0),
+            *_outcome(home, away),
+        )
+        .select_from(orm.DoublesResult)
+        .join(home, home.doubles_result_id == orm.DoublesResult.id)
+        .join(away, away.doubles_result_id == orm.DoublesResult.id)
+        .join(home_pair, home_pair.id == home.doubles_pair_id)
+        .join(away_pair, away_pair.id == away.doubles_pair_id)
+        .join(orm.MatchDate, orm.MatchDate.id == orm.DoublesResult.match_date_id)
+        # the members of a pair are only set once it is complete
+        .filter(home_pair.player_a_id.is_not(None), away_pair.player_a_id.is_not(None))
+    )
+    return select if since is None else select.filter(orm.MatchDate.local_date >= since)
+
+
+@dataclasses.dataclass(frozen=True)
+class ResultHistory:
+    """Decided results as columns, by match day (stored as a date ordinal)."""
+
+    day: array.array
+    home_a: array.array
+    home_b: array.array
+    away_a: array.array
+    away_b: array.array
+    score: array.array
+
+    @classmethod
+    def read(cls, session: sqla.orm.Session, since: datetime.date | None = None) -> Self:
+        """All results with a winner, from match day ``since`` on if given."""
+        history = sqla.union_all(_singles_history(since), _doubles_history(since)).subquery()
+        rows = session.execute(sqla.select(history).order_by(history.c[0])).all()
+        scores = [_home_score(*row[5:]) for row in rows]
+        decided = [row for row, score in zip(rows, scores) if score is not None]
+        return cls(
+            day=array.array("q", (_day_nr(row[0]) for row in decided)),
+            home_a=array.array("q", (row[1] or 0 for row in decided)),
+            home_b=array.array("q", (row[2] or 0 for row in decided)),
+            away_a=array.array("q", (row[3] or 0 for row in decided)),
+            away_b=array.array("q", (row[4] or 0 for row in decided)),
+            score=array.array("d", (score for score in scores if score is not None)),
+        )
+
+    def days(self) -> Iterator[tuple[datetime.date, range]]:
+        """Every match day with the positions of its results."""
+        start = 0
+        for stop in range(1, len(self.day) + 1):
+            if stop == len(self.day) or self.day[stop] != self.day[start]:
+                yield datetime.date.fromordinal(self.day[start]), range(start, stop)
+                start = stop
+
+
+def _day_nr(day: datetime.date | str) -> int:
+    # the dates of a union come back from sqlite as strings
+    if isinstance(day, str):
+        day = datetime.date.fromisoformat(day)
+    return day.toordinal()
+
+
+def rate(
+    history: ResultHistory, ratings: dict[int, Rating]
+) -> Iterator[tuple[datetime.date, dict[int, Rating]]]:
+    """Apply ``history`` to ``ratings`` in place, yield the changed ratings after every day."""
+    for day, results in history.days():
+        home = [
+            [player for player in (history.home_a[nr], history.home_b[nr]) if player]
+            for nr in results
+        ]
+        away = [
+            [player for player in (history.away_a[nr], history.away_b[nr]) if player]
+            for nr in results
+        ]
+        strength = [
+            (
+                statistics.fmean(ratings.get(player, Rating()).rating for player in home_side),
+                statistics.fmean(ratings.get(player, Rating()).rating for player in away_side),
+            )
+            for home_side, away_side in zip(home, away)
+        ]
+        changes: dict[int, float] = collections.defaultdict(float)
+        played: collections.Counter[int] = collections.Counter()
+        for nr, home_side, away_side, (home_rating, away_rating) in zip(
+            results, home, away, strength
+        ):
+            change = K_FACTOR * (history.score[nr] - expected_score(home_rating, away_rating))
+            for player in home_side:
+                changes[player] += change
+            for player in away_side:
+                changes[player] -= change
+            played.update(home_side + away_side)
+        for player, change in changes.items():
+            before = ratings.get(player, Rating())
+            ratings[player] = Rating(before.rating + change, before.played + played[player])
+        yield day, {player: ratings[player] for player in changes}
+
+
+def snapshot(session: sqla.orm.Session, before: datetime.date | None = None) -> dict[int, Rating]:
+    """The latest rating of every rated player, only from match days before ``before`` if given."""
+    latest = sqla.select(
+        PlayerRating.player_id, sqla.func.max(PlayerRating.local_date).label("local_date")
+    ).group_by(PlayerRating.player_id)
+    if before is not None:
+        latest = latest.filter(PlayerRating.local_date < before)
+    latest = latest.subquery()
+    rows = session.execute(
+        sqla.select(PlayerRating.player_id, PlayerRating.rating, PlayerRating.played).join(
+            latest,
+            (latest.c.player_id == PlayerRating.player_id)
+            & (latest.c.local_date == PlayerRating.local_date),
+        )
+    )
+    return {player_id: Rating(rating, played) for player_id, rating, played in rows}
+
+
+def result_contents(session: sqla.orm.Session) -> dict[int, str]:
+    """A hash of everything the ratings take from every match result, by match result id."""
+    disciplines = sqla.union_all(
+        _singles_history(None).add_columns(
+            orm.SinglesResult.match_date_id, orm.SinglesResult.category
+        ),
+        _doubles_history(None).add_columns(
+            orm.DoublesResult.match_date_id, orm.DoublesResult.category
+        ),
+    ).subquery()
+    by_match_date: dict[int, list[str]] = collections.defaultdict(list)
+    for *row, match_date_id, category in session.execute(sqla.select(disciplines)):
+        by_match_date[match_date_id].append(repr((str(category), *map(str, row))))
+    results = session.execute(
+        sqla.select(
+            orm.MatchResult.id,
+            orm.MatchResult.match_date_id,
+            orm.MatchResult.home_points,
+            orm.MatchResult.away_points,
+        )
+    )
+    return {
+        id: hashlib.sha256(
+            repr((home_points, away_points, sorted(by_match_date[match_date_id]))).encode()
+        ).hexdigest()
+        for id, match_date_id, home_points, away_points in results
+    }
+
+
+def stale_results(session: sqla.orm.Session, contents: dict[int, str]) -> list[int]:
+    """Ids of the match results that are not rated yet or whose content changed since."""
+    rated = dict(
+        session.execute(sqla.select(RatedResult.match_result_id, RatedResult.content_hash)).all()
+    )
+    return [id for id, content in contents.items() if rated.get(id) != content]
+
+
+def update(session: sqla.orm.Session | None = None) -> int:
+    """Rate again from the earliest new or changed result on, return how many match days."""
+    session = session or orm.db.get_session()
+    contents = result_contents(session)
+    stale = stale_results(session, contents)
+    since = session.scalar(
+        sqla.select(sqla.func.min(orm.MatchDate.local_date))
+        .join(orm.MatchResult, orm.MatchResult.match_date_id == orm.MatchDate.id)
+        .filter(orm.MatchResult.id.in_(stale))
+    )
+    if since is None:
+        return 0
+
+    session.execute(sqla.delete(PlayerRating).filter(PlayerRating.local_date >= since))
+    ratings = snapshot(session, before=since)
+    days = 0
+    for day, changed in rate(ResultHistory.read(session, since), ratings):
+        session.execute(
+            sqla.insert(PlayerRating),
+            [
+                {"player_id": player_id, "local_date": day, "rating": rating, "played": played}
+                for player_id, (rating, played) in changed.items()
+            ],
+        )
+        days += 1
+
+    session.execute(sqla.delete(RatedResult).filter(RatedResult.match_result_id.in_(stale)))
+    session.execute(
+        sqla.insert(RatedResult),
+        [{"match_result_id": id, "content_hash": contents[id]} for id in stale],
+    )
+    session.commit()
+    return days
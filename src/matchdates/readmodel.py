@@ -0,0 +1,243 @@
+"""
+Read only queries for listings.
+
+The listing commands only print a few strings per row. Instead of loading full
+ORM instances with their relationships, these queries select exactly the columns
+a listing shows, joined in SQL, and return plain named tuples. Nothing is added
+to the session's identity map.
+"""
+from __future__ import annotations
+
+import collections
+import datetime
+from typing import NamedTuple, Self
+
+import pendulum
+import sqlalchemy as sqla
+import sqlalchemy.orm
+
+from . import cache, orm
+
+
+__all__ = [
+    "LocationRow",
+    "LocationSummary",
+    "MatchRow",
+    "PlayerRow",
+    "ResultRow",
+    "SeasonRow",
+    "TeamSummary",
+    "by_team",
+    "location_summary",
+    "locations",
+    "match_urls",
+    "matches",
+    "players",
+    "results",
+    "seasons",
+    "team_summary",
+]
+
+
+class MatchRow(NamedTuple):
+    url: str
+    date_time: datetime.datetime
+    local_date_time: pendulum.DateTime
+    home_team: str
+    away_team: str
+    location: str
+    season_url: str
+
+    @property
+    def matchnr(self) -> str:
+        return self.url.rsplit("/", 1)[-1]
+
+    @property
+    def full_url(self) -> str:
+        return f"https://sb.tournamentsoftware.com/{self.season_url}/{self.url}"
+
+    @classmethod
+    def from_row(cls, row: sqla.Row) -> Self:
+        """Build from a ``_match_select`` row, converting to local time once."""
+        url, date_time, *names = row
+        return cls(url, date_time, orm.matchdate.to_local(date_time), *names)
+
+    @classmethod
+    def from_match_date(cls, match: orm.MatchDate) -> Self:
+        return cls(
+            url=match.url,
+            date_time=match.date_time,
+            local_date_time=match.local_date_time,
+            home_team=match.home_team.name,
+            away_team=match.away_team.name,
+            location=match.location.name,
+            season_url=match.season.url,
+        )
+
+
+class ResultRow(NamedTuple):
+    match: MatchRow
+    home_points: int
+    away_points: int
+
+    @classmethod
+    def from_match_result(cls, result: orm.MatchResult) -> Self:
+        return cls(
+            match=MatchRow.from_match_date(result.match_date),
+            home_points=result.home_points,
+            away_points=result.away_points,
+        )
+
+
+class LocationRow(NamedTuple):
+    name: str
+    address: str
+
+
+class PlayerRow(NamedTuple):
+    name: str
+    url: str
+
+    @property
+    def player_nr(self) -> str:
+        return self.url.rsplit("/", 1)[-1]
+
+
+class SeasonRow(NamedTuple):
+    name: str
+    start_date: datetime.date
+    end_date: datetime.date
+    url: str
+
+
+class LocationSummary(NamedTuple):
+    name: str
+    address: str
+    home_teams: list[str]
+    times: collections.Counter[pendulum.Time]
+
+
+class TeamSummary(NamedTuple):
+    name: str
+    club: str
+    seasons: list[str]
+    home_locations: list[str]
+    matches: list[MatchRow]
+
+
+def _match_select() -> sqla.Select:
+    home = sqla.orm.aliased(orm.Team)
+    away = sqla.orm.aliased(orm.Team)
+    return (
+        sqla.select(
+            orm.MatchDate.url,
+            orm.MatchDate.date_time,
+            home.name,
+            away.name,
+            orm.Location.name,
+            orm.Season.url,
+        )
+        .join(home, orm.MatchDate.home_team_id == home.id)
+        .join(away, orm.MatchDate.away_team_id == away.id)
+        .join(orm.Location, orm.MatchDate.location_id == orm.Location.id)
+        .join(orm.Season, orm.MatchDate.season_id == orm.Season.id)
+    )
+
+
+def by_team(team_id: int) -> sqla.ColumnElement[bool]:
+    return (orm.MatchDate.home_team_id == team_id) | (orm.MatchDate.away_team_id == team_id)
+
+
+def matches(session: sqla.orm.Session, *filters: sqla.ColumnElement[bool]) -> list[MatchRow]:
+    """Match dates passing all ``filters``, by date."""
+    stmt = _match_select().filter(*filters).order_by(orm.MatchDate.utc_epoch)
+    return [MatchRow.from_row(row) for row in session.execute(stmt)]
+
+
+def results(session: sqla.orm.Session, *filters: sqla.ColumnElement[bool]) -> list[ResultRow]:
+    """Match results whose match dates pass all ``filters``, by date."""
+    stmt = (
+        _match_select()
+        .add_columns(orm.MatchResult.home_points, orm.MatchResult.away_points)
+        .join(orm.MatchResult, orm.MatchResult.match_date_id == orm.MatchDate.id)
+        .filter(*filters)
+        .order_by(orm.MatchDate.utc_epoch)
+    )
+    return [ResultRow(MatchRow.from_row(row[:-2]), *row[-2:]) for row in session.execute(stmt)]
+
+
+def match_urls(session: sqla.orm.Session) -> list[str]:
+    """Season qualified urls of all match dates, sorted."""
+    stmt = (
+        sqla.select(orm.Season.url, orm.MatchDate.url)
+        .join(orm.Season, orm.MatchDate.season_id == orm.Season.id)
+        .order_by(orm.Season.url, orm.MatchDate.url)
+    )
+    return [f"/{season_url}/{url}" for season_url, url in session.execute(stmt)]
+
+
+def locations(session: sqla.orm.Session) -> list[LocationRow]:
+    stmt = sqla.select(orm.Location.name, orm.Location.address).order_by(orm.Location.name)
+    return [LocationRow._make(row) for row in session.execute(stmt)]
+
+
+def players(session: sqla.orm.Session) -> list[PlayerRow]:
+    stmt = sqla.select(orm.Player.name, orm.Player.url)
+    return [PlayerRow._make(row) for row in session.execute(stmt)]
+
+
+def seasons(session: sqla.orm.Session) -> list[SeasonRow]:
+    stmt = sqla.select(
+        orm.Season.name, orm.Season.start_date, orm.Season.end_date, orm.Season.url
+    ).order_by(orm.Season.start_date)
+    return [SeasonRow._make(row) for row in session.execute(stmt)]
+
+
+@cache.memoize
+def location_summary(location_id: int) -> LocationSummary:
+    """The home teams and match times at a location, as shown by ``show location``."""
+    session = orm.db.get_session()
+    name, address = session.execute(
+        sqla.select(orm.Location.name, orm.Location.address).filter_by(id=location_id)
+    ).one()
+    home_teams = session.scalars(
+        sqla.select(orm.Team.name)
+        .join(orm.MatchDate, orm.MatchDate.home_team_id == orm.Team.id)
+        .filter(orm.MatchDate.location_id == location_id)
+        .distinct()
+        .order_by(orm.Team.name)
+    ).all()
+    times = collections.Counter(
+        orm.matchdate.to_local(date_time).time()
+        for date_time in session.scalars(
+            sqla.select(orm.MatchDate.date_time).filter_by(location_id=location_id)
+        )
+    )
+    return LocationSummary(name, address, list(home_teams), times)
+
+
+@cache.memoize
+def team_summary(team_id: int) -> TeamSummary:
+    """A team's club, seasons, home locations and matches, as shown by ``show team``."""
+    session = orm.db.get_session()
+    name, club = session.execute(
+        sqla.select(orm.Team.name, orm.Club.name)
+        .join(orm.Club, orm.Team.club_id == orm.Club.id)
+        .filter(orm.Team.id == team_id)
+    ).one()
+    team_seasons = orm.team.TeamSeasonAssociation
+    seasons = session.scalars(
+        sqla.select(orm.Season.url)
+        .join(team_seasons, team_seasons.season_id == orm.Season.id)
+        .filter(team_seasons.team_id == team_id)
+    ).all()
+    home_locations = session.scalars(
+        sqla.select(orm.Location.name)
+        .join(orm.MatchDate, orm.MatchDate.location_id == orm.Location.id)
+        .filter(orm.MatchDate.home_team_id == team_id)
+        .distinct()
+        .order_by(orm.Location.name)
+    ).all()
+    return TeamSummary(
+        name, club, list(seasons), list(home_locations), matches(session, by_team(team_id))
+    )
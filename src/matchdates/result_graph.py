@@ -0,0 +1,233 @@
+"""
+In memory player / pair / team / match graph for traversal queries.
+
+Built from the played match tables (:mod:`matchdates.orm.graph`) and the doubles
+pairs. Every entity gets a dense integer node number per kind, relations are
+stored as compressed sparse rows (CSR): for node ``i`` the neighbours are
+``indices[indptr[i]:indptr[i + 1]]``. The player to match relation also carries
+the team a player played for and a bit mask of the categories they played, so
+opponents and teammates can be told apart without going back to the database.
+
+The arrays are ``array.array`` of machine integers, a pickled graph reloads
+without rebuilding anything. It is saved per database together with the data
+generation (:mod:`matchdates.orm.generation`) and rebuilt when that changed.
+Graphs of databases in memory are never saved.
+
+Players without results are not in the graph, queries about them find nothing.
+"""
+from __future__ import annotations
+
+import array
+import collections
+import dataclasses
+import hashlib
+import pathlib
+import pickle
+from typing import Iterator, Self
+
+import sqlalchemy as sqla
+import sqlalchemy.orm
+
+from . import common_data, graph_utils, orm, settings
+from .sparse import Csr
+
+
+CATEGORY_BITS = {category: 1 << nr for nr, category in enumerate(common_data.ResultCategory)}
+
+
+@dataclasses.dataclass
+class ResultGraph:
+    """Players, pairs, teams and team matches (results) as integer nodes with CSR relations."""
+
+    player_ids: array.array
+    pair_ids: array.array
+    team_ids: array.array
+    match_ids: array.array
+    player_matches: Csr  # data: team, categories
+    match_players: Csr
+    pair_players: Csr
+    player_pairs: Csr
+    team_players: Csr
+    player_teams: Csr
+    generation: int = 0
+
+    def __post_init__(self) -> None:
+        self.player_nodes = {id: node for node, id in enumerate(self.player_ids)}
+
+    @classmethod
+    def build(cls, session: sqla.orm.Session | None = None) -> Self:
+        """Read the graph from the database, updating the played match tables first."""
+        session = session or orm.db.get_session()
+        graph_utils.update_results(session)
+        played = orm.graph.PlayedMatch
+        rows = session.execute(
+            sqla.select(played.player_id, played.match_result_id, played.team_id, played.category)
+            .order_by(played.player_id, played.match_result_id)
+        ).all()
+        pairs = session.execute(
+            sqla.select(
+                orm.DoublesPair.id, orm.DoublesPair.player_a_id, orm.DoublesPair.player_b_id
+            )
+            .filter(
+                orm.DoublesPair.player_a_id.is_not(None), orm.DoublesPair.player_b_id.is_not(None)
+            )
+            .order_by(orm.DoublesPair.id)
+        ).all()
+
+        player_ids = sorted(
+            {row.player_id for row in rows} | {id for pair in pairs for id in pair[1:]}
+        )
+        team_ids = sorted({row.team_id for row in rows})
+        match_ids = sorted({row.match_result_id for row in rows})
+        player_nodes = {id: node for node, id in enumerate(player_ids)}
+        team_nodes = {id: node for node, id in enumerate(team_ids)}
+        match_nodes = {id: node for node, id in enumerate(match_ids)}
+
+        # one edge per player and match, with all categories the player played in it
+        played_in: dict[tuple[int, int], list[int]] = {}
+        for player_id, match_id, team_id, category in rows:
+            key = (player_nodes[player_id], match_nodes[match_id])
+            edge = played_in.setdefault(key, [team_nodes[team_id], 0])
+            edge[1] |= CATEGORY_BITS[category]
+        player_matches = Csr.from_edges(
+            len(player_ids),
+            played_in.keys(),
+            team=(team for team, _ in played_in.values()),
+            categories=(categories for _, categories in played_in.values()),
+        )
+        team_players = Csr.from_edges(
+            len(team_ids), sorted({(team, player) for (player, _), (team, _) in played_in.items()})
+        )
+        pair_players = Csr.from_edges(
+            len(pairs),
+            (
+                (pair_node, player_nodes[player_id])
+                for pair_node, (_, *members) in enumerate(pairs)
+                for player_id in members
+            ),
+        )
+        return cls(
+            player_ids=array.array("q", player_ids),
+            pair_ids=array.array("q", (pair[0] for pair in pairs)),
+            team_ids=array.array("q", team_ids),
+            match_ids=array.array("q", match_ids),
+            player_matches=player_matches,
+            match_players=player_matches.transpose(len(match_ids)),
+            pair_players=pair_players,
+            player_pairs=pair_players.transpose(len(player_ids)),
+            team_players=team_players,
+            player_teams=team_players.transpose(len(player_ids)),
+            generation=orm.generation.current(session),
+        )
+
+    def save(self, path: pathlib.Path) -> None:
+        state = {field.name: getattr(self, field.name) for field in dataclasses.fields(self)}
+        path.write_bytes(pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL))
+
+    @classmethod
+    def load(cls, path: pathlib.Path) -> Self:
+        return cls(**pickle.loads(path.read_bytes()))
+
+    @classmethod
+    def load_or_build(cls, path: pathlib.Path | None = None) -> Self:
+        """Load the saved graph, or build and save it if the data changed since."""
+        session = orm.db.get_session()
+        if path is None:
+            database = orm.db.database_file()
+            if database is None:
+                return cls.build(session)
+            key = hashlib.sha256(database.encode()).hexdigest()
+            path = settings.get_crawl_datadir() / f"result_graph-{key}.pickle"
+        if path.exists():
+            graph = cls.load(path)
+            if graph.generation == orm.generation.current(session):
+                return graph
+        graph = cls.build(session)
+        graph.save(path)
+        return graph
+
+    def _played(self, player_node: int) -> Iterator[tuple[int, int, int]]:
+        """``(match, team, categories)`` for every match a player played."""
+        csr = self.player_matches
+        for edge in csr.edges(player_node):
+            yield csr.indices[edge], csr.data["team"][edge], csr.data["categories"][edge]
+
+    def _co_players(self, player_node: int, same_team: bool) -> set[int]:
+        co_players = set()
+        csr = self.match_players
+        for match, team, categories in self._played(player_node):
+            for edge in csr.edges(match):
+                if (csr.data["team"][edge] == team) is not same_team:
+                    continue
+                # opponents only count if they played in one of the same categories
+                if same_team or csr.data["categories"][edge] & categories:
+                    co_players.add(csr.indices[edge])
+        co_players.discard(player_node)
+        return co_players
+
+    def opponents(self, player_id: int) -> set[int]:
+        """Players that ``player_id`` played against directly."""
+        if (node := self.player_nodes.get(player_id)) is None:
+            return set()
+        nodes = self._co_players(node, same_team=False)
+        return {self.player_ids[node] for node in nodes}
+
+    def teammates(self, player_id: int) -> set[int]:
+        """Players that played in the same team match for the same team as ``player_id``."""
+        if (node := self.player_nodes.get(player_id)) is None:
+            return set()
+        nodes = self._co_players(node, same_team=True)
+        return {self.player_ids[node] for node in nodes}
+
+    def partners(self, player_id: int) -> set[int]:
+        """Players that ``player_id`` formed a doubles pair with."""
+        if (node := self.player_nodes.get(player_id)) is None:
+            return set()
+        return {
+            self.player_ids[partner]
+            for pair in self.player_pairs.neighbours(node)
+            for partner in self.pair_players.neighbours(pair)
+            if partner != node
+        }
+
+    def teams(self, player_id: int) -> set[int]:
+        """Teams that ``player_id`` played for."""
+        if (node := self.player_nodes.get(player_id)) is None:
+            return set()
+        return {self.team_ids[team] for team in self.player_teams.neighbours(node)}
+
+    def common_opponents(self, player_id: int, other_id: int) -> set[int]:
+        return self.opponents(player_id) & self.opponents(other_id)
+
+    def teammates_of_teammates(self, player_id: int) -> set[int]:
+        if (node := self.player_nodes.get(player_id)) is None:
+            return set()
+        direct = self._co_players(node, True)
+        second = set().union(*(self._co_players(mate, True) for mate in direct))
+        return {self.player_ids[mate] for mate in second - direct - {node}}
+
+    def shortest_connection(self, player_id: int, other_id: int) -> list[int] | None:
+        """
+        The shortest chain of players from one player to another, ``None`` if there is none.
+
+        Consecutive players in the chain played in the same team match, for either team.
+        """
+        start, goal = self.player_nodes.get(player_id), self.player_nodes.get(other_id)
+        if start is None or goal is None:
+            return None
+        previous = {start: start}
+        queue = collections.deque([start])
+        while queue:
+            node = queue.popleft()
+            if node == goal:
+                path = [node]
+                while node != start:
+                    node = previous[node]
+                    path.append(node)
+                return [self.player_ids[node] for node in reversed(path)]
+            for match in self.player_matches.neighbours(node):
+                for other in self.match_players.neighbours(match):
+                    if other not in previous:
+                        previous[other] = node
+                        queue.append(other)
+        return None
@@ -1,9 +1,70 @@
+"""
+Settings for mada and scrapy.
+
+The mada settings are read from ``mada.toml`` when first used, and again whenever
+the file changes. The upper case names are scrapy settings.
+"""
+from __future__ import annotations
+
+import contextlib
+import dataclasses
 import pathlib
+from typing import Any, Iterator
 
 import toml
 
 
+@dataclasses.dataclass(frozen=True, kw_only=True)
+class CrawlingSettings:
+    domain: str
+    league_uuid: str
+    draws: list[int]
+    datadir: pathlib.Path
+    data_min_age: int
+    cookies: dict[str, str] = dataclasses.field(default_factory=dict)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> CrawlingSettings:
+        return cls(**data | {"datadir": pathlib.Path(data["datadir"]).expanduser().absolute()})
+
+
+@dataclasses.dataclass(frozen=True, kw_only=True)
+class DisplaySettings:
+    club_name: str
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> DisplaySettings:
+        return cls(**data)
+
+
+@dataclasses.dataclass(frozen=True, kw_only=True)
+class DatabaseSettings:
+    sqlite_path: pathlib.Path
+    mongodb: str | None = None
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> DatabaseSettings:
+        return cls(**data | {"sqlite_path": pathlib.Path(data["sqlite_path"]).expanduser()})
+
+
+@dataclasses.dataclass(frozen=True, kw_only=True)
+class Settings:
+    crawling: CrawlingSettings
+    display: DisplaySettings
+    database: DatabaseSettings
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> Settings:
+        return cls(
+            crawling=CrawlingSettings.from_dict(data["crawling"]),
+            display=DisplaySettings.from_dict(data["display"]),
+            database=DatabaseSettings.from_dict(data["database"]),
+        )
+
+
 def get_settings_file() -> pathlib.Path:
+    if _settings_file is not None:
+        return _settings_file
     name = "mada.toml"
     config_dir_order = [
         pathlib.Path("."),  # workdir
@@ -17,19 +78,50 @@ def get_settings_file() -> pathlib.Path:
     raise FileNotFoundError("No config file found.")
 
 
-def get_crawl_datadir(settings: dict) -> pathlib.Path:
-    datadir = pathlib.Path(settings["crawling"]
-                           ["datadir"]).expanduser().absolute()
+_settings_file: pathlib.Path | None = None
+_cache: dict[pathlib.Path, tuple[int, Settings]] = {}
+
+
+def get() -> Settings:
+    """The current settings, parsed again only if the settings file changed."""
+    path = get_settings_file().absolute()
+    mtime = path.stat().st_mtime_ns
+    cached = _cache.get(path)
+    if cached is None or cached[0] != mtime:
+        cached = _cache[path] = (mtime, Settings.from_dict(toml.load(path)))
+    return cached[1]
+
+
+@contextlib.contextmanager
+def override(path: pathlib.Path | str) -> Iterator[Settings]:
+    """Use the settings from another file for the duration of the context."""
+    global _settings_file
+    previous = _settings_file
+    _settings_file = pathlib.Path(path)
+    try:
+        yield get()
+    finally:
+        _settings_file = previous
+
+
+def get_crawl_datadir() -> pathlib.Path:
+    datadir = get().crawling.datadir
     if not datadir.exists():
         datadir.mkdir()
     return datadir
 
 
-SETTINGS = toml.load(get_settings_file())
-
 # scrapy setting
 BOT_NAME = "mada"
 SPIDER_MODULES = ["matchdates.datespider", "matchdates.marespider"]
 HTTPCACHE_ENABLED = True
 HTTPCACHE_EXPIRATION_SECS = 3600
 LOG_LEVEL = "INFO"
+DOWNLOADER_MIDDLEWARES = {
+    "matchdates.middlewares.ArchiveMiddleware": 585,
+    "matchdates.middlewares.ValidatorStoreMiddleware": 580,
+}
+VALIDATOR_STORE_ENABLED = True
+ARCHIVE_ENABLED = True
+# not enabled for plain ``scrapy crawl``, the CLI opts in when streaming into the db
+ORM_ITEM_PIPELINES = {"matchdates.pipelines.OrmPipeline": 300}
@@ -0,0 +1,338 @@
+"""
+Monte Carlo simulation of the rest of a draw's season.
+
+Every discipline of every match date without a result is won by the home team
+with the probability the ratings (:mod:`matchdates.ratings`) give for the two
+teams' line-ups: the rating of the players who played that category for the
+team this season, weighted by how often they did. The team match points follow
+:func:`matchdates.data2orm.results.team_match_points` and are added to the
+points of the results so far. Teams with equal points are ranked like the
+standings (:mod:`matchdates.standings`): by discipline difference, simulated
+matches included, then by set difference. Sets are not simulated, so the set
+difference is that of the results so far. Teams still equal are ranked in random
+order.
+
+The simulations run in a process pool, in chunks of :data:`RUNS_PER_CHUNK` with
+a seed each, so the outcome depends on the seed and the number of runs only.
+The state of the season is placed in shared memory once, every worker only
+receives the block names and a seed.
+"""
+from __future__ import annotations
+
+import array
+import collections
+import concurrent.futures
+import dataclasses
+import os
+import random
+import statistics
+from multiprocessing import shared_memory
+from typing import Self
+
+import sqlalchemy as sqla
+import sqlalchemy.orm
+
+from . import common_data, orm, ratings
+from .data2orm.results import team_match_points
+from .orm.graph import PlayedMatch
+from .orm.standing import Standing
+
+
+__all__ = [
+    "DEFAULT_CATEGORIES",
+    "RUNS_PER_CHUNK",
+    "SeasonState",
+    "StandingsDistribution",
+    "simulate",
+]
+
+
+DEFAULT_CATEGORIES = (
+    common_data.ResultCategory.HE1,
+    common_data.ResultCategory.HE2,
+    common_data.ResultCategory.HE3,
+    common_data.ResultCategory.DE1,
+    common_data.ResultCategory.HD1,
+    common_data.ResultCategory.DD1,
+    common_data.ResultCategory.MX1,
+)
+RUNS_PER_CHUNK = 1_000
+
+
+def points_table(nr_categories: int) -> list[tuple[int, int]]:
+    """The home and away team match points for every number of disciplines won at home."""
+    table = []
+    for home_wins in range(nr_categories + 1):
+        wins = collections.Counter(
+            {common_data.Side.HOME: home_wins, common_data.Side.AWAY: nr_categories - home_wins}
+        )
+        points = team_match_points(wins)
+        table.append((points[common_data.Side.HOME], points[common_data.Side.AWAY]))
+    return table
+
+
+@dataclasses.dataclass(frozen=True)
+class SeasonState:
+    """The standings so far and the home win probabilities of the remaining disciplines."""
+
+    team_ids: list[int]
+    points: array.array
+    disciplines: array.array  # discipline difference
+    sets: array.array  # set difference
+    home: array.array
+    away: array.array
+    win_probability: array.array  # remaining match x category
+    nr_categories: int
+
+    @classmethod
+    def read(cls, session: sqla.orm.Session, draw: orm.Draw) -> Self:
+        """Read from the results, the standings, the played match graph and the rating snapshots."""
+        match_dates = session.execute(
+            sqla.select(
+                orm.MatchDate.home_team_id,
+                orm.MatchDate.away_team_id,
+                orm.MatchResult.home_points,
+                orm.MatchResult.away_points,
+            )
+            .outerjoin(orm.MatchResult, orm.MatchResult.match_date_id == orm.MatchDate.id)
+            .filter(orm.MatchDate.draw_id == draw.id)
+            .order_by(orm.MatchDate.utc_epoch)
+        ).all()
+        team_ids = sorted(
+            set(
+                session.scalars(
+                    sqla.select(orm.team.TeamDrawAssociation.team_id).filter_by(draw_id=draw.id)
+                )
+            )
+            | {team_id for row in match_dates for team_id in row[:2]}
+        )
+        team_nodes = {id: node for node, id in enumerate(team_ids)}
+
+        points = array.array("q", bytes(8 * len(team_ids)))
+        remaining = []
+        for home_id, away_id, home_points, away_points in match_dates:
+            if home_points is None:
+                remaining.append((team_nodes[home_id], team_nodes[away_id]))
+                continue
+            points[team_nodes[home_id]] += home_points
+            points[team_nodes[away_id]] += away_points
+
+        disciplines = array.array("q", bytes(8 * len(team_ids)))
+        sets = array.array("q", bytes(8 * len(team_ids)))
+        for team_id, discipline_difference, set_difference in session.execute(
+            sqla.select(
+                Standing.team_id,
+                Standing.disciplines_won - Standing.disciplines_lost,
+                Standing.sets_won - Standing.sets_lost,
+            ).filter(Standing.draw_id == draw.id)
+        ):
+            if team_id in team_nodes:
+                disciplines[team_nodes[team_id]] = discipline_difference
+                sets[team_nodes[team_id]] = set_difference
+
+        categories = session.scalars(
+            sqla.select(PlayedMatch.category)
+            .join(orm.MatchResult, orm.MatchResult.id == PlayedMatch.match_result_id)
+            .join(orm.MatchDate, orm.MatchDate.id == orm.MatchResult.match_date_id)
+            .filter(orm.MatchDate.draw_id == draw.id)
+            .distinct()
+        ).all()
+        categories = sorted(categories, key=list(common_data.ResultCategory).index) or list(
+            DEFAULT_CATEGORIES
+        )
+        strength = _line_up_strength(session, team_ids, draw.season_id)
+        win_probability = array.array(
+            "d",
+            (
+                ratings.expected_score(
+                    strength[team_ids[home], category], strength[team_ids[away], category]
+                )
+                for home, away in remaining
+                for category in categories
+            ),
+        )
+        return cls(
+            team_ids=team_ids,
+            points=points,
+            disciplines=disciplines,
+            sets=sets,
+            home=array.array("q", (home for home, _ in remaining)),
+            away=array.array("q", (away for _, away in remaining)),
+            win_probability=win_probability,
+            nr_categories=len(categories),
+        )
+
+
+def _weighted_mean(ratings_played: list[tuple[float, int]]) -> float:
+    values, weights = zip(*ratings_played)
+    return statistics.fmean(values, weights)
+
+
+def _line_up_strength(
+    session: sqla.orm.Session, team_ids: list[int], season_id: int
+) -> dict[tuple[int, common_data.ResultCategory], float]:
+    """
+    Mean rating per team and category of who played it this season, weighted by how often.
+
+    Categories a team did not play yet get the mean over all its players.
+    """
+    rows = session.execute(
+        sqla.select(
+            PlayedMatch.team_id, PlayedMatch.category, PlayedMatch.player_id, sqla.func.count()
+        )
+        .join(orm.MatchResult, orm.MatchResult.id == PlayedMatch.match_result_id)
+        .join(orm.MatchDate, orm.MatchDate.id == orm.MatchResult.match_date_id)
+        .filter(PlayedMatch.team_id.in_(team_ids), orm.MatchDate.season_id == season_id)
+        .group_by(PlayedMatch.team_id, PlayedMatch.category, PlayedMatch.player_id)
+    ).all()
+    current = ratings.snapshot(session)
+    by_team: dict[int, list[tuple[float, int]]] = {}
+    by_category: dict[tuple[int, common_data.ResultCategory], list[tuple[float, int]]] = {}
+    for team_id, category, player_id, played in rows:
+        rating = current.get(player_id, ratings.Rating()).rating
+        by_team.setdefault(team_id, []).append((rating, played))
+        by_category.setdefault((team_id, category), []).append((rating, played))
+
+    team_strength = {
+        team_id: _weighted_mean(by_team[team_id]) if team_id in by_team else ratings.INITIAL_RATING
+        for team_id in team_ids
+    }
+    return {
+        (team_id, category): (
+            _weighted_mean(by_category[team_id, category])
+            if (team_id, category) in by_category
+            else team_strength[team_id]
+        )
+        for team_id in team_ids
+        for category in common_data.ResultCategory
+    }
+
+
+@dataclasses.dataclass(frozen=True)
+class StandingsDistribution:
+    """How often every team finished in every rank, and with how many points in total."""
+
+    team_ids: list[int]
+    runs: int
+    rank_counts: array.array  # team x rank
+    point_sums: array.array
+
+    def rank_probabilities(self, team_id: int) -> list[float]:
+        """The probability of every rank, first to last."""
+        nr_teams = len(self.team_ids)
+        start = self.team_ids.index(team_id) * nr_teams
+        return [count / self.runs for count in self.rank_counts[start:start + nr_teams]]
+
+    def expected_points(self, team_id: int) -> float:
+        return self.point_sums[self.team_ids.index(team_id)] / self.runs
+
+
+@dataclasses.dataclass(frozen=True)
+class _SharedSeason:
+    """Names of the shared memory blocks holding a season state, passed to the workers."""
+
+    integers: str
+    probabilities: str
+    nr_teams: int
+    nr_matches: int
+    nr_categories: int
+
+
+def _simulate_runs(
+    shared: _SharedSeason, runs: int, seed: int
+) -> tuple[array.array, array.array]:
+    integers_block = shared_memory.SharedMemory(name=shared.integers)
+    probabilities_block = shared_memory.SharedMemory(name=shared.probabilities)
+    integers = integers_block.buf.cast("q")
+    probabilities = probabilities_block.buf.cast("d")
+    try:
+        nr_teams, nr_matches = shared.nr_teams, shared.nr_matches
+        base_points = list(integers[:nr_teams])
+        base_disciplines = list(integers[nr_teams:2 * nr_teams])
+        sets = list(integers[2 * nr_teams:3 * nr_teams])
+        start = 3 * nr_teams
+        home = list(integers[start:start + nr_matches])
+        away = list(integers[start + nr_matches:start + 2 * nr_matches])
+        win_probability = list(probabilities[:nr_matches * shared.nr_categories])
+    finally:
+        integers.release()
+        probabilities.release()
+        integers_block.close()
+        probabilities_block.close()
+
+    rng = random.Random(seed)
+    table = points_table(shared.nr_categories)
+    nr_categories = shared.nr_categories
+    rank_counts = array.array("q", bytes(8 * nr_teams * nr_teams))
+    point_sums = array.array("q", bytes(8 * nr_teams))
+    for _ in range(runs):
+        points = base_points.copy()
+        disciplines = base_disciplines.copy()
+        for match in range(nr_matches):
+            start = match * nr_categories
+            home_wins = sum(
+                rng.random() < probability
+                for probability in win_probability[start:start + nr_categories]
+            )
+            home_points, away_points = table[home_wins]
+            points[home[match]] += home_points
+            points[away[match]] += away_points
+            difference = 2 * home_wins - nr_categories
+            disciplines[home[match]] += difference
+            disciplines[away[match]] -= difference
+        order = sorted(
+            range(nr_teams),
+            key=lambda team: (points[team], disciplines[team], sets[team], rng.random()),
+            reverse=True,
+        )
+        for rank, team in enumerate(order):
+            rank_counts[team * nr_teams + rank] += 1
+            point_sums[team] += points[team]
+    return rank_counts, point_sums
+
+
+def simulate(
+    state: SeasonState, runs: int, workers: int | None = None, seed: int | None = None
+) -> StandingsDistribution:
+    """Simulate the rest of the season ``runs`` times, spread over ``workers`` processes."""
+    workers = workers or os.cpu_count() or 1
+    nr_teams, nr_matches = len(state.team_ids), len(state.home)
+    integers = (
+        array.array("q", state.points) + state.disciplines + state.sets + state.home + state.away
+    )
+    integers_block = shared_memory.SharedMemory(create=True, size=max(8, 8 * len(integers)))
+    probabilities_block = shared_memory.SharedMemory(
+        create=True, size=max(8, 8 * len(state.win_probability))
+    )
+    try:
+        integers_block.buf[:8 * len(integers)] = integers.tobytes()
+        probabilities_block.buf[:8 * len(state.win_probability)] = state.win_probability.tobytes()
+        shared = _SharedSeason(
+            integers=integers_block.name,
+            probabilities=probabilities_block.name,
+            nr_teams=nr_teams,
+            nr_matches=nr_matches,
+            nr_categories=state.nr_categories,
+        )
+        rng = random.Random(seed)
+        chunks = [min(RUNS_PER_CHUNK, runs - start) for start in range(0, runs, RUNS_PER_CHUNK)]
+        rank_counts = array.array("q", bytes(8 * nr_teams * nr_teams))
+        point_sums = array.array("q", bytes(8 * nr_teams))
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(_simulate_runs, shared, chunk, rng.getrandbits(64)) for chunk in chunks
+            ]
+            for future in concurrent.futures.as_completed(futures):
+                chunk_ranks, chunk_points = future.result()
+                for position, count in enumerate(chunk_ranks):
+                    rank_counts[position] += count
+                for position, count in enumerate(chunk_points):
+                    point_sums[position] += count
+    finally:
+        integers_block.close()
+        integers_block.unlink()
+        probabilities_block.close()
+        probabilities_block.unlink()
+    return StandingsDistribution(
+        team_ids=state.team_ids, runs=runs, rank_counts=rank_counts, point_sums=point_sums
+    )
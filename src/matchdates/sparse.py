@@ -0,0 +1,67 @@
+"""
+Compressed sparse row (CSR) adjacency on ``array.array``.
+
+For source node ``i`` the targets are ``indices[indptr[i]:indptr[i + 1]]``, per
+edge values live in the ``data`` arrays at the same positions.
+"""
+from __future__ import annotations
+
+import array
+import dataclasses
+from typing import Iterable, Self
+
+
+@dataclasses.dataclass(frozen=True)
+class Csr:
+    """Adjacency of ``len(indptr) - 1`` source nodes, with optional per edge data."""
+
+    indptr: array.array
+    indices: array.array
+    data: dict[str, array.array] = dataclasses.field(default_factory=dict)
+
+    @classmethod
+    def from_edges(
+        cls, nr_nodes: int, edges: Iterable[tuple[int, int]], **data: Iterable[int]
+    ) -> Self:
+        """Build from ``(source, target)`` pairs, which must be sorted by source."""
+        indptr = array.array("q", bytes(8 * (nr_nodes + 1)))
+        indices = array.array("q")
+        for source, target in edges:
+            indptr[source + 1] += 1
+            indices.append(target)
+        for node in range(nr_nodes):
+            indptr[node + 1] += indptr[node]
+        data_arrays = {name: array.array("q", values) for name, values in data.items()}
+        return cls(indptr, indices, data_arrays)
+
+    @property
+    def nr_nodes(self) -> int:
+        return len(self.indptr) - 1
+
+    def neighbours(self, node: int) -> array.array:
+        return self.indices[self.indptr[node]:self.indptr[node + 1]]
+
+    def edges(self, node: int) -> range:
+        """Positions of the edges of ``node`` in ``indices`` and the data arrays."""
+        return range(self.indptr[node], self.indptr[node + 1])
+
+    def transpose(self, nr_targets: int) -> Csr:
+        """The reverse relation, keeping the edge data."""
+        counts = array.array("q", bytes(8 * (nr_targets + 1)))
+        for target in self.indices:
+            counts[target + 1] += 1
+        for node in range(nr_targets):
+            counts[node + 1] += counts[node]
+        indptr = array.array("q", counts)
+        position = array.array("q", counts[:-1])
+        indices = array.array("q", bytes(8 * len(self.indices)))
+        data = {name: array.array("q", bytes(8 * len(self.indices))) for name in self.data}
+        for source in range(self.nr_nodes):
+            for edge in self.edges(source):
+                target = self.indices[edge]
+                slot = position[target]
+                position[target] += 1
+                indices[slot] = source
+                for name, values in self.data.items():
+                    data[name][slot] = values[edge]
+        return Csr(indptr, indices, data)
@@ -0,0 +1,173 @@
+"""
+Standings of the draws.
+
+The standings table (:class:`matchdates.orm.standing.Standing`) is updated by
+the result converter whenever a match result is created or changes: the
+outcome of the match date before and after the change are compared and only the
+difference is added to the two teams' rows, with one upsert per team.
+"""
+from __future__ import annotations
+
+import collections
+from typing import NamedTuple, Self
+
+import sqlalchemy as sqla
+import sqlalchemy.orm
+from sqlalchemy.dialects import sqlite
+
+from . import common_data, orm
+from .orm.standing import Standing
+
+
+__all__ = ["Outcome", "StandingRow", "table", "update"]
+
+
+COUNTS = (
+    "played",
+    "points",
+    "wins",
+    "draws",
+    "losses",
+    "disciplines_won",
+    "disciplines_lost",
+    "sets_won",
+    "sets_lost",
+)
+
+
+class Outcome(NamedTuple):
+    """What a match result counts for in the standings, from the home team's side."""
+
+    home_points: int
+    away_points: int
+    home_disciplines: int
+    away_disciplines: int
+    home_sets: int
+    away_sets: int
+
+    @classmethod
+    def of(cls, match_date: orm.MatchDate) -> Self | None:
+        """The outcome of the match date's result, ``None`` if it has none."""
+        result = match_date.match_result
+        if result is None:
+            return None
+        disciplines: collections.Counter[common_data.Side] = collections.Counter()
+        sets: collections.Counter[common_data.Side] = collections.Counter()
+        for singles in match_date.singles_results:
+            _count(disciplines, sets, singles.home_player_result, singles.away_player_result)
+        for doubles in match_date.doubles_results:
+            _count(disciplines, sets, doubles.home_pair_result, doubles.away_pair_result)
+        return cls(
+            home_points=result.home_points,
+            away_points=result.away_points,
+            home_disciplines=disciplines[common_data.Side.HOME],
+            away_disciplines=disciplines[common_data.Side.AWAY],
+            home_sets=sets[common_data.Side.HOME],
+            away_sets=sets[common_data.Side.AWAY],
+        )
+
+    def counts(self, home: bool) -> dict[str, int]:
+        """The standings counts of the home or away team."""
+        points, other_points = self.home_points, self.away_points
+        won, lost = self.home_disciplines, self.away_disciplines
+        sets_won, sets_lost = self.home_sets, self.away_sets
+        if not home:
+            points, other_points = other_points, points
+            won, lost = lost, won
+            sets_won, sets_lost = sets_lost, sets_won
+        return {
+            "played": 1,
+            "points": points,
+            "wins": int(points > other_points),
+            "draws": int(points == other_points),
+            "losses": int(points < other_points),
+            "disciplines_won": won,
+            "disciplines_lost": lost,
+            "sets_won": sets_won,
+            "sets_lost": sets_lost,
+        }
+
+
+def _count(
+    disciplines: collections.Counter[common_data.Side],
+    sets: collections.Counter[common_data.Side],
+    home: orm.result.PlayerResultBase | None,
+    away: orm.result.PlayerResultBase | None,
+) -> None:
+    # walkover winners are not stored, those disciplines count for neither side
+    if not home or not away:
+        return
+    if home.win and not away.win:
+        disciplines[common_data.Side.HOME] += 1
+    elif away.win and not home.win:
+        disciplines[common_data.Side.AWAY] += 1
+    for home_points, away_points in zip(home.points, away.points):
+        if home_points is None or away_points is None:
+            continue
+        sets[common_data.Side.HOME if home_points > away_points else common_data.Side.AWAY] += 1
+
+
+def update(
+    session: sqla.orm.Session,
+    match_date: orm.MatchDate,
+    before: Outcome | None,
+    after: Outcome | None,
+) -> None:
+    """Change the standings of the match date's draw from outcome ``before`` to ``after``."""
+    if before == after or match_date.draw_id is None:
+        return
+    no_counts = dict.fromkeys(COUNTS, 0)
+    for team_id, home in ((match_date.home_team_id, True), (match_date.away_team_id, False)):
+        old = before.counts(home) if before else no_counts
+        new = after.counts(home) if after else no_counts
+        insert = sqlite.insert(Standing).values(
+            draw_id=match_date.draw_id,
+            team_id=team_id,
+            **{name: new[name] - old[name] for name in COUNTS},
+        )
+        session.execute(
+            insert.on_conflict_do_update(
+                index_elements=[Standing.draw_id, Standing.team_id],
+                set_={name: getattr(Standing, name) + insert.excluded[name] for name in COUNTS},
+            )
+        )
+
+
+class StandingRow(NamedTuple):
+    team: str
+    played: int
+    points: int
+    wins: int
+    draws: int
+    losses: int
+    disciplines_won: int
+    disciplines_lost: int
+    sets_won: int
+    sets_lost: int
+
+
+def table(session: sqla.orm.Session, draw_id: int) -> list[StandingRow]:
+    """
+    The standings of a draw: by points, then discipline and set difference.
+
+    Teams of the draw without results yet are listed with all counts zero.
+    """
+    counts = {name: sqla.func.coalesce(getattr(Standing, name), 0) for name in COUNTS}
+    team_draw = orm.team.TeamDrawAssociation
+    stmt = (
+        sqla.select(orm.Team.name, *counts.values())
+        .select_from(team_draw)
+        .join(orm.Team, orm.Team.id == team_draw.team_id)
+        .outerjoin(
+            Standing,
+            (Standing.draw_id == team_draw.draw_id) & (Standing.team_id == team_draw.team_id),
+        )
+        .filter(team_draw.draw_id == draw_id)
+        .order_by(
+            counts["points"].desc(),
+            (counts["disciplines_won"] - counts["disciplines_lost"]).desc(),
+            (counts["sets_won"] - counts["sets_lost"]).desc(),
+            orm.Team.name,
+        )
+    )
+    return [StandingRow._make(row) for row in session.execute(stmt)]
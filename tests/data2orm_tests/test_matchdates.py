@@ -1,5 +1,6 @@
 import pytest
 import pendulum
+import sqlalchemy as sqla
 
 from matchdates import common_data as cd, data2orm, orm
 
@@ -171,6 +172,7 @@ def test_visit_matchdate(db_session, converter):
     ]
     assert new_matchdate.season.draws == [new_matchdate.draw]
     assert not new_matchdate.changelog
+    assert orm.generation.current(db_session) == 1
 
 
 def test_visit_matchdate_update(db_session, converter, matchdate):
@@ -206,3 +208,86 @@ def test_visit_matchdate_update(db_session, converter, matchdate):
     assert new_matchdate.id == matchdate.id
     assert (matchdate.local_date_time -
             matchdate.last_change.local_date_time).in_hours() == 1
+
+
+def make_matchdate_item(nr: int, date: pendulum.DateTime) -> cd.MatchDate:
+    return cd.MatchDate(
+        url=f"team-match/{nr}",
+        date=date,
+        home_team=cd.Team(
+            url=f"team/{nr % 3}",
+            name=f"Home {nr % 3}",
+            club=cd.Club(f"Home Club {nr % 3}")
+        ),
+        away_team=cd.Team(
+            url=f"team/{nr % 3 + 3}",
+            name=f"Away {nr % 3}",
+            club=cd.Club(f"Away Club {nr % 3}")
+        ),
+        location=cd.Location(f"Hall {nr % 3}", "Barstr. 1"),
+        draw=cd.Draw(f"draw/{nr % 2}"),
+        season=cd.Season(
+            name="Testseason",
+            url="season/1",
+            start_date=pendulum.Date(2024, 9, 1),
+            end_date=pendulum.Date(2025, 4, 30),
+        )
+    )
+
+
+def test_bulk_ingest(db_session):
+    start = pendulum.datetime(2024, 10, 1, 19)
+    items = [make_matchdate_item(i, start + pendulum.duration(days=i)) for i in range(12)]
+    converter = data2orm.matchdate.BulkMatchdateToOrm(session=db_session)
+    matchdates = converter.ingest(items)
+
+    assert len(matchdates) == 12
+    assert len(orm.MatchDate.all()) == 12
+    assert len(orm.Team.all()) == 6
+    assert len(orm.Club.all()) == 6
+    assert len(orm.Location.all()) == 3
+    assert len(orm.Draw.all()) == 2
+    assert len(orm.Season.all()) == 1
+    assert all(not m.changelog for m in matchdates)
+    assert orm.generation.current(db_session) > 0
+
+
+def test_bulk_ingest_update(db_session):
+    start = pendulum.datetime(2024, 10, 1, 19)
+    items = [make_matchdate_item(i, start + pendulum.duration(days=i)) for i in range(6)]
+    converter = data2orm.matchdate.MatchdateToOrm(session=db_session)
+    for item in items:
+        converter.visit(item)
+
+    items[0].date = items[0].date + pendulum.duration(hours=1)
+    bulk_converter = data2orm.matchdate.BulkMatchdateToOrm(session=db_session, chunk_size=4)
+    matchdates = bulk_converter.ingest(items)
+
+    assert len(orm.MatchDate.all()) == 6
+    assert len(orm.Team.all()) == 6
+    assert len(matchdates[0].changelog) == 1
+    assert all(not m.changelog for m in matchdates[1:])
+
+
+def test_bulk_ingest_query_count(db_session):
+    start = pendulum.datetime(2024, 10, 1, 19)
+    converter = data2orm.matchdate.BulkMatchdateToOrm(session=db_session)
+    converter.ingest(
+        [make_matchdate_item(i, start + pendulum.duration(days=i)) for i in range(30)]
+    )
+
+    statements = []
+
+    def count(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    sqla.event.listen(db_session.bind, "before_cursor_execute", count)
+    try:
+        data2orm.matchdate.BulkMatchdateToOrm(session=db_session).ingest(
+            [make_matchdate_item(i, start + pendulum.duration(days=i)) for i in range(30)]
+        )
+    finally:
+        sqla.event.remove(db_session.bind, "before_cursor_execute", count)
+
+    assert not [s for s in statements if not s.startswith("SELECT")]
+    assert len(statements) < 20
@@ -1,6 +1,9 @@
+import attrs
+import pendulum
 import pytest
+import sqlalchemy as sqla
 
-from matchdates import common_data as cd, data2orm, orm
+from matchdates import common_data as cd, data2orm, orm, standings
 
 
 @pytest.fixture
@@ -311,3 +314,137 @@ def test_visit_update_result(db_session, matchdate, team_result, match_result):
     assert len(orm.DoublesResult.all()) == ref_nr_doubles_results
     assert len(orm.Player.all()) == ref_nr_players
     assert len(orm.DoublesPair.all()) == ref_nr_pairs
+
+
+def test_visit_result_standings(db_session, matchdate, team_result, club, season):
+    idle = orm.Team(
+        name="BC Zürich-Affoltern 3", url="team/3", team_nr=3, club=club, seasons=[season]
+    )
+    for team in (matchdate.home_team, matchdate.away_team, idle):
+        team.draws.append(matchdate.draw)
+    db_session.add_all([matchdate, idle])
+    db_session.commit()
+    testee = data2orm.results.ResultToOrm(session=db_session, matchdate=matchdate)
+    testee.visit(team_result)
+    rows = standings.table(db_session, matchdate.draw_id)
+    assert [(row.team, row.points, row.wins, row.losses) for row in rows] == [
+        (matchdate.away_team.name, 2, 1, 0),
+        (matchdate.home_team.name, 1, 0, 1),
+        (idle.name, 0, 0, 0),
+    ]
+    assert (rows[0].disciplines_won, rows[0].disciplines_lost) == (4, 3)
+    assert (rows[0].sets_won, rows[0].sets_lost) == (8, 8)
+
+    testee.visit(team_result)
+    assert standings.table(db_session, matchdate.draw_id) == rows
+
+    mixed = attrs.evolve(
+        team_result.doubles[cd.ResultCategory.MX1],
+        set_1=cd.Set(17, 21),
+        set_2=cd.Set(18, 21),
+        winner=cd.Side.AWAY,
+    )
+    testee.visit(
+        attrs.evolve(team_result, doubles=team_result.doubles | {cd.ResultCategory.MX1: mixed})
+    )
+    changed = standings.table(db_session, matchdate.draw_id)
+    assert (changed[0].played, changed[0].points) == (1, 2)
+    assert (changed[0].disciplines_won, changed[0].disciplines_lost) == (5, 2)
+    assert (changed[0].sets_won, changed[0].sets_lost) == (10, 6)
+
+
+@pytest.fixture
+def matchdates(db_session, matchdate) -> list[orm.MatchDate]:
+    matchdates = [matchdate] + [
+        orm.MatchDate(
+            url=f"match/{i}",
+            date_time=matchdate.date_time + pendulum.duration(days=i),
+            location=matchdate.location,
+            home_team=matchdate.home_team,
+            away_team=matchdate.away_team,
+            season=matchdate.season,
+            draw=matchdate.draw,
+        )
+        for i in range(2, 11)
+    ]
+    db_session.add_all(matchdates)
+    db_session.commit()
+    return matchdates
+
+
+def make_team_results(
+    team_result: cd.TeamMatchResult, matchdates: list[orm.MatchDate]
+) -> list[cd.TeamMatchResult]:
+    return [
+        attrs.evolve(team_result, url=f"{m.season.url}/{m.url}") for m in matchdates
+    ]
+
+
+def test_bulk_ingest(db_session, matchdates, team_result):
+    data2orm.results.BulkResultToOrm(session=db_session).ingest(
+        make_team_results(team_result, matchdates)
+    )
+    for matchdate in matchdates:
+        assert matchdate.match_result.winner == orm.result.WinningTeam.AWAY
+        assert len(matchdate.singles_results) == 4
+        assert len(matchdate.doubles_results) == 3
+    assert len(orm.MatchResult.all()) == len(matchdates)
+    assert len(orm.Player.all()) == 10
+    assert len(orm.DoublesPair.all()) == 6
+
+
+def test_replay_keeps_fetch_time(db_session, matchdates, team_result):
+    items = make_team_results(team_result, matchdates[:1])
+    data2orm.results.BulkResultToOrm(session=db_session).ingest(items)
+    fetched = matchdates[0].match_result.fetched_date_time
+    data2orm.results.BulkResultToOrm(session=db_session, replay=True).ingest(items)
+    assert matchdates[0].match_result.fetched_date_time == fetched
+
+
+def test_bulk_ingest_unknown_matchdate(db_session, matchdates, team_result, caplog):
+    items = make_team_results(team_result, matchdates[:2])
+    unknown = attrs.evolve(team_result, url=f"{matchdates[0].season.url}/match/99")
+    results = data2orm.results.BulkResultToOrm(session=db_session).ingest([unknown, *items])
+    assert [result.match_date for result in results] == matchdates[:2]
+    assert "match/99" in caplog.text
+
+
+def test_bulk_ingest_same_as_visit(db_session, matchdates, team_result):
+    items = make_team_results(team_result, matchdates)
+    data2orm.results.ResultToOrm(session=db_session, matchdate=matchdates[0]).visit(items[0])
+    counts = [
+        len(model.all())
+        for model in (orm.MatchResult, orm.SinglesResult, orm.DoublesResult, orm.Player, orm.DoublesPair)
+    ]
+    data2orm.results.BulkResultToOrm(session=db_session).ingest(items[:1])
+    assert counts == [
+        len(model.all())
+        for model in (orm.MatchResult, orm.SinglesResult, orm.DoublesResult, orm.Player, orm.DoublesPair)
+    ]
+
+
+def count_statements(db_session, items: list[cd.TeamMatchResult]) -> list[str]:
+    statements = []
+
+    def count(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    sqla.event.listen(db_session.bind, "before_cursor_execute", count)
+    try:
+        data2orm.results.BulkResultToOrm(session=db_session).ingest(items)
+    finally:
+        sqla.event.remove(db_session.bind, "before_cursor_execute", count)
+    return statements
+
+
+def test_bulk_ingest_query_count(db_session, matchdates, team_result):
+    items = make_team_results(team_result, matchdates)
+    data2orm.results.BulkResultToOrm(session=db_session).ingest(items)
+
+    few = count_statements(db_session, items[:2])
+    many = count_statements(db_session, items)
+
+    assert not [s for s in many if s.startswith("INSERT")]
+    assert len([s for s in many if s.startswith("SELECT")]) == len(
+        [s for s in few if s.startswith("SELECT")]
+    )
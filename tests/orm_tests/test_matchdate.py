@@ -52,6 +52,25 @@ def test_update_datetime(db_session, matchdate):
     assert reloaded.local_date_time == new_dt
 
 
+def test_derived_times(db_session, matchdate):
+    db_session.add(matchdate)
+    db_session.commit()
+    assert matchdate.utc_epoch == int(matchdate.date_time.timestamp())
+    assert matchdate.local_date == matchdate.local_date_time.date()
+
+    new_dt = pendulum.local(2025, 3, 30, 1, 30)
+    matchdate.date_time = new_dt
+    assert matchdate.local_date_time == new_dt
+    db_session.commit()
+    db_session.expire_all()
+
+    reloaded = db_session.get(orm.matchdate.MatchDate, matchdate.id)
+    assert reloaded.utc_epoch == int(new_dt.timestamp())
+    assert reloaded.local_date == new_dt.date()
+    assert reloaded.local_date_time == new_dt
+    assert reloaded.local_date_time is reloaded.local_date_time
+
+
 def test_update_location(db_session, matchdate):
     db_session.add(matchdate)
     db_session.commit()
@@ -1,4 +1,5 @@
 import pytest
+import sqlalchemy as sqla
 
 from matchdates import orm
 
@@ -72,3 +73,29 @@ def test_fail_create_duplicate_to_stored(db_session):
         _ = orm.DoublesPair({wata, higa})
     with pytest.raises(ValueError):
         _ = orm.DoublesPair({higa, wata})
+
+
+def test_doubles_pair_key(db_session):
+    wata = orm.Player(url="player/2", name="Yuta Watanabe")
+    higa = orm.Player(url="player/1", name="Arisa Higashino")
+    pair = orm.DoublesPair(players={wata, higa})
+    db_session.add_all([wata, higa, pair])
+    db_session.commit()
+
+    assert (pair.player_a_id, pair.player_b_id) == (higa.id, wata.id)
+    assert orm.DoublesPair.find(wata, higa) is pair
+    assert orm.DoublesPair.find(higa, wata) is pair
+
+
+def test_doubles_pair_key_unique(db_session):
+    wata = orm.Player(url="player/1", name="Yuta Watanabe")
+    higa = orm.Player(url="player/2", name="Arisa Higashino")
+    db_session.add_all([wata, higa, orm.DoublesPair(players={wata, higa})])
+    db_session.commit()
+
+    duplicate = orm.DoublesPair(players=set())
+    duplicate.player_a, duplicate.player_b = wata, higa
+    db_session.add(duplicate)
+    with pytest.raises(sqla.exc.IntegrityError):
+        db_session.commit()
+    db_session.rollback()
@@ -0,0 +1,79 @@
+from typing import Iterator
+
+import pytest
+import scrapy
+
+from matchdates import archive, middlewares
+
+
+class TitleSpider(scrapy.Spider):
+    name = "titlespider"
+
+    def parse_page(self, response: scrapy.http.Response) -> Iterator[dict[str, str]]:
+        yield {"url": response.url, "title": response.css("title::text").get()}
+        yield response.follow("/elsewhere", callback=self.parse_page)
+
+
+def page(title: str) -> bytes:
+    return f"<html><head><title>{title}</title></head><body></body></html>".encode()
+
+
+@pytest.fixture
+def page_archive(tmp_path):
+    testee = archive.PageArchive(tmp_path / "archive")
+    yield testee
+    testee.close()
+
+
+def test_store_deduplicates(page_archive):
+    hash_a = page_archive.store(
+        "https://example.com/a", page("same"), spider="titlespider", callback="parse_page"
+    )
+    hash_b = page_archive.store(
+        "https://example.com/b", page("same"), spider="titlespider", callback="parse_page"
+    )
+    assert hash_a == hash_b
+    assert len(list((page_archive.path / "objects").glob("*/*.gz"))) == 1
+    assert page_archive.load(hash_a) == page("same")
+
+
+def test_latest_version(page_archive):
+    page_archive.store(
+        "https://example.com/a", page("old"), spider="titlespider", callback="parse_page"
+    )
+    new_hash = page_archive.store(
+        "https://example.com/a", page("new"), spider="titlespider", callback="parse_page"
+    )
+    latest = page_archive.latest("titlespider", "parse_page")
+    assert [(url, body_hash) for url, body_hash, *_ in latest] == [
+        ("https://example.com/a", new_hash)
+    ]
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_replay(page_archive, processes):
+    for nr in range(5):
+        page_archive.store(
+            f"https://example.com/{nr}", page(f"page {nr}"),
+            spider="titlespider", callback="parse_page"
+        )
+    page_archive.store(
+        "https://example.com/draw", page("draw"), spider="titlespider", callback="parse"
+    )
+    items = list(
+        archive.replay(TitleSpider, page_archive, callback="parse_page", processes=processes)
+    )
+    assert sorted(item["title"] for item in items) == [f"page {nr}" for nr in range(5)]
+
+
+def test_archive_middleware(page_archive):
+    spider = TitleSpider()
+    middleware = middlewares.ArchiveMiddleware(page_archive)
+    request = scrapy.http.Request("https://example.com/1", callback=spider.parse_page)
+    response = scrapy.http.HtmlResponse(
+        url=request.url, body=page("page 1"), encoding="utf-8", request=request
+    )
+    assert middleware.process_response(request, response, spider) is response
+    assert [url for url, *_ in page_archive.latest("titlespider", "parse_page")] == [
+        "https://example.com/1"
+    ]
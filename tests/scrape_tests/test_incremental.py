@@ -0,0 +1,53 @@
+import datetime
+
+import scrapy
+
+from matchdates import datespider
+
+
+DRAW_PAGE = """
+<html><body>
+<ol>
+  <li class="match-group__item">
+    <a class="team-match__wrapper" href="/league/abc/team-match/1">
+      <time datetime="2024-10-01T19:30:00">Di 01.10.2024 19:30</time>
+    </a>
+  </li>
+  <li class="match-group__item">
+    <a class="team-match__wrapper" href="/league/abc/team-match/2">
+      <time datetime="2024-10-02T20:00:00">Mi 02.10.2024 20:00</time>
+    </a>
+  </li>
+  <li class="match-group__item">
+    <a class="team-match__wrapper" href="/league/abc/team-match/3">
+      <time datetime="2024-10-03T19:00:00">Do 03.10.2024 19:00</time>
+    </a>
+  </li>
+</ol>
+</body></html>
+"""
+
+
+def draw_response() -> scrapy.http.HtmlResponse:
+    return scrapy.http.HtmlResponse(
+        url="https://www.swiss-badminton.ch/league/abc/draw/1",
+        body=DRAW_PAGE,
+        encoding="utf-8",
+    )
+
+
+def test_parse_draw_full():
+    spider = datespider.MatchDateSpider()
+    requests = list(spider.parse_draw(draw_response()))
+    assert len(requests) == 3
+
+
+def test_parse_draw_incremental():
+    spider = datespider.MatchDateSpider(
+        known_dates={
+            "team-match/1": datetime.datetime(2024, 10, 1, 19, 30),
+            "team-match/2": datetime.datetime(2024, 10, 2, 19, 0),
+        }
+    )
+    requests = list(spider.parse_draw(draw_response()))
+    assert sorted(r.url.rsplit("/", 1)[-1] for r in requests) == ["2", "3"]
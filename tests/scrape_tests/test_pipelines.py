@@ -0,0 +1,75 @@
+import pendulum
+import pytest
+import scrapy.exceptions
+
+from matchdates import common_data as cd, orm, pipelines
+
+
+def make_item(nr: int) -> cd.MatchDate:
+    return cd.MatchDate(
+        url=f"https://www.swiss-badminton.ch/league/abc/team-match/{nr}",
+        date=pendulum.datetime(2024, 10, 1, 19) + pendulum.duration(days=nr),
+        home_team=cd.Team(name="Home 1", url="/league/abc/team/1", club=cd.Club("Home")),
+        away_team=cd.Team(name="Away 1", url="/league/abc/team/2", club=cd.Club("Away")),
+        location=cd.Location("Hall", "Barstr. 1"),
+        draw=cd.Draw("/league/abc/draw/1"),
+        season=cd.Season(
+            name="Testseason",
+            url="/league/abc",
+            start_date=pendulum.Date(2024, 9, 1),
+            end_date=pendulum.Date(2025, 4, 30),
+        )
+    )
+
+
+def test_orm_pipeline_matchdates(db_session):
+    pipeline = pipelines.OrmPipeline(chunk_size=2)
+    pipeline.open_spider(None)
+    for nr in range(5):
+        pipeline.process_item(make_item(nr), None)
+    pipeline.close_spider(None)
+
+    assert len(orm.MatchDate.all()) == 5
+    assert len(orm.Team.all()) == 2
+
+
+def test_orm_pipeline_results(db_session):
+    pipeline = pipelines.OrmPipeline(chunk_size=2)
+    pipeline.open_spider(None)
+    pipeline.process_item(make_item(1), None)
+    pipeline.process_item(
+        cd.TeamMatchResult(
+            singles={},
+            doubles={
+                category: cd.DoublesResult(home_pair=None, away_pair=None, winner=winner)
+                for category, winner in zip(
+                    [cd.ResultCategory.HD1, cd.ResultCategory.DD1,
+                     cd.ResultCategory.MX1, cd.ResultCategory.MX2],
+                    [cd.Side.HOME, cd.Side.HOME, cd.Side.HOME, cd.Side.AWAY]
+                )
+            },
+            winner=cd.Side.HOME,
+            url="/league/abc/team-match/1",
+        ),
+        None
+    )
+    pipeline.close_spider(None)
+
+    matchdate = orm.MatchDate.one(url="team-match/1")
+    assert matchdate.match_result.home_points == 3
+    assert matchdate.match_result.away_points == 1
+
+
+def test_orm_pipeline_drops_unknown_results(db_session):
+    pipeline = pipelines.OrmPipeline(chunk_size=2)
+    pipeline.open_spider(None)
+    with pytest.raises(scrapy.exceptions.DropItem):
+        pipeline.process_item(
+            cd.TeamMatchResult(
+                singles={}, doubles={}, winner=cd.Side.HOME, url="/league/abc/team-match/9"
+            ),
+            None,
+        )
+    pipeline.close_spider(None)
+
+    assert not orm.MatchResult.all()
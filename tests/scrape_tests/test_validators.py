@@ -0,0 +1,112 @@
+import pytest
+import scrapy
+from scrapy.statscollectors import MemoryStatsCollector
+from scrapy.utils.test import get_crawler
+
+from matchdates import middlewares
+
+
+URL = "https://www.swiss-badminton.ch/league/abc/team-match/1"
+
+
+@pytest.fixture
+def middleware(tmp_path):
+    crawler = get_crawler()
+    store = middlewares.ValidatorStore(tmp_path / "validators.sqlite")
+    yield middlewares.ValidatorStoreMiddleware(store, MemoryStatsCollector(crawler))
+    store.close()
+
+
+def make_response(request, body=b"<html>1</html>", status=200):
+    return scrapy.http.HtmlResponse(
+        url=request.url,
+        status=status,
+        body=body,
+        headers={"ETag": '"abc"', "Last-Modified": "Tue, 01 Oct 2024 19:00:00 GMT"},
+        request=request,
+    )
+
+
+def ingest(middleware, request, response):
+    """Let ``response`` through the middleware and its item into the database."""
+    response = middleware.process_response(request, response, None)
+    middleware.item_scraped({}, response, None)
+    middleware.items_committed()
+    return response
+
+
+def test_first_fetch_is_parsed(middleware):
+    request = scrapy.http.Request(URL, meta={"skip_unchanged": True})
+    middleware.process_request(request, None)
+    assert b"If-None-Match" not in request.headers
+    response = make_response(request)
+    assert middleware.process_response(request, response, None) is response
+
+
+def test_conditional_headers(middleware):
+    request = scrapy.http.Request(URL, meta={"skip_unchanged": True})
+    ingest(middleware, request, make_response(request))
+
+    again = scrapy.http.Request(URL, meta={"skip_unchanged": True})
+    middleware.process_request(again, None)
+    assert again.headers[b"If-None-Match"] == b'"abc"'
+    assert again.headers[b"If-Modified-Since"] == b"Tue, 01 Oct 2024 19:00:00 GMT"
+    with pytest.raises(scrapy.exceptions.IgnoreRequest):
+        middleware.process_response(again, make_response(again, body=b"", status=304), None)
+
+
+def test_unchanged_body_is_skipped(middleware):
+    request = scrapy.http.Request(URL, meta={"skip_unchanged": True})
+    ingest(middleware, request, make_response(request))
+    again = scrapy.http.Request(URL, meta={"skip_unchanged": True})
+    with pytest.raises(scrapy.exceptions.IgnoreRequest):
+        middleware.process_response(again, make_response(again), None)
+    changed = make_response(again, body=b"<html>2</html>")
+    assert middleware.process_response(again, changed, None) is changed
+
+
+def test_validators_wait_for_ingestion(middleware):
+    request = scrapy.http.Request(URL, meta={"skip_unchanged": True})
+    response = middleware.process_response(request, make_response(request), None)
+    middleware.item_scraped({}, response, None)
+    assert middleware.store.get(URL) is None
+
+    # the crawl failed before its items were committed, the next one parses the page again
+    middleware.spider_opened(None)
+    middleware.items_committed()
+    again = scrapy.http.Request(URL, meta={"skip_unchanged": True})
+    response = make_response(again)
+    assert middleware.process_response(again, response, None) is response
+
+    middleware.item_scraped({}, response, None)
+    middleware.items_committed()
+    assert middleware.store.get(URL).etag == '"abc"'
+
+
+def test_unchanged_urls(middleware):
+    request = scrapy.http.Request(URL, meta={"skip_unchanged": True})
+    ingest(middleware, request, make_response(request))
+    assert middleware.store.unchanged() == []
+    with pytest.raises(scrapy.exceptions.IgnoreRequest):
+        middleware.process_response(request, make_response(request), None)
+    assert middleware.store.unchanged() == [URL]
+
+    middleware.spider_opened(None)
+    assert middleware.store.unchanged() == []
+
+
+def test_store_per_database(tmp_path, monkeypatch):
+    monkeypatch.setattr(middlewares.settings, "get_crawl_datadir", lambda: tmp_path)
+    first = middlewares.ValidatorStore.for_database("/data/first.db")
+    first.put(URL, middlewares.Validators(etag=None, last_modified=None, body_hash="1"))
+    second = middlewares.ValidatorStore.for_database("/data/second.db")
+    assert first.get(URL) and second.get(URL) is None
+    first.close()
+    second.close()
+
+
+def test_unmarked_requests_pass(middleware):
+    request = scrapy.http.Request(URL)
+    middleware.process_response(request, make_response(request), None)
+    response = make_response(request)
+    assert middleware.process_response(request, response, None) is response
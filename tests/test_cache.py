@@ -0,0 +1,81 @@
+import pytest
+import sqlalchemy as sqla
+
+from matchdates import cache, orm, readmodel
+from matchdates.orm.base import Base
+
+
+@pytest.fixture
+def file_db(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, "cache_dir", lambda: tmp_path / "cache")
+    ctx = orm.db.DbContext.push(f"sqlite:///{tmp_path / 'mada.sqlite'}")
+    Base.metadata.create_all(ctx.engine)
+    yield ctx.session
+    orm.db.DbContext.pop()
+
+
+calls = []
+
+
+@cache.memoize
+def count_locations(prefix: str) -> int:
+    calls.append(prefix)
+    session = orm.db.get_session()
+    return session.scalar(
+        sqla.select(sqla.func.count(orm.Location.id)).filter(orm.Location.name.startswith(prefix))
+    )
+
+
+def test_memoize(file_db, location):
+    calls.clear()
+    file_db.add(location)
+    file_db.commit()
+    assert count_locations("Bad") == 1
+    assert count_locations("Bad") == 1
+    assert count_locations("Bed") == 0
+    assert calls == ["Bad", "Bed"]
+
+    # not written by a visitor, the cache does not know
+    file_db.add(orm.Location(name="Badhall", address=""))
+    file_db.commit()
+    assert count_locations("Bad") == 1
+
+    file_db.add(orm.Location(name="Badtown", address=""))
+    orm.generation.bump(file_db)
+    file_db.commit()
+    assert orm.generation.current(file_db) == 1
+    assert count_locations("Bad") == 3
+    assert calls == ["Bad", "Bed", "Bad"]
+
+
+def test_bump_needs_changes(file_db, location):
+    orm.generation.bump(file_db)
+    file_db.commit()
+    assert orm.generation.current(file_db) == 0
+
+    file_db.add(location)
+    orm.generation.bump(file_db)
+    file_db.rollback()
+    file_db.commit()
+    assert orm.generation.current(file_db) == 0
+
+
+def test_memory_db_not_cached(db_session, location):
+    calls.clear()
+    db_session.add(location)
+    db_session.commit()
+    count_locations("Bad")
+    count_locations("Bad")
+    assert calls == ["Bad", "Bad"]
+
+
+def test_summaries_cached(file_db, matchdate):
+    file_db.add(matchdate)
+    file_db.commit()
+    summary = readmodel.location_summary(matchdate.location.id)
+    assert summary.home_teams == ["BC Zürich-Affoltern 1"]
+    assert sum(summary.times.values()) == 1
+    assert readmodel.location_summary(matchdate.location.id) == summary
+    team = readmodel.team_summary(matchdate.home_team.id)
+    assert team.home_locations == ["Badcity Badminton Center"]
+    assert [m.url for m in team.matches] == ["match/1"]
@@ -0,0 +1,168 @@
+import subprocess
+import sys
+
+import click
+import pendulum
+import pytest
+import sqlalchemy as sqla
+from click.testing import CliRunner
+
+from matchdates import orm, settings, standings
+from matchdates.cli import main
+
+
+def test_help_imports_no_commands():
+    script = (
+        "import sys\n"
+        "from matchdates.cli import main\n"
+        "try:\n"
+        "    main(['--help'])\n"
+        "except SystemExit:\n"
+        "    pass\n"
+        "print(' '.join(sys.modules))\n"
+    )
+    loaded = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True, check=True
+    ).stdout.splitlines()[-1].split()
+    assert not [
+        module for module in loaded
+        if module.split(".")[0] in ("scrapy", "sqlalchemy", "pendulum", "tabulate", "thefuzz")
+    ]
+    assert "matchdates.cli.reload" not in loaded
+
+
+def test_lazy_help_matches_commands():
+    ctx = click.Context(main)
+    for name, (_, short_help) in main.lazy_subcommands.items():
+        limit = 80 - 6 - max(len(name) for name in main.list_commands(ctx))
+        assert main.get_command(ctx, name).get_short_help_str(limit) == short_help
+
+
+def add_matches(db_session, count: int) -> None:
+    template = db_session.scalars(orm.MatchDate.select().limit(1)).one()
+    first = len(orm.MatchDate.all())
+    db_session.add_all(
+        orm.MatchDate(
+            url=f"team-match/{nr}",
+            date_time=template.date_time + pendulum.duration(hours=nr),
+            location=template.location,
+            home_team=template.home_team,
+            away_team=template.away_team,
+            season=template.season,
+            draw=template.draw,
+        )
+        for nr in range(first, first + count)
+    )
+    db_session.commit()
+
+
+def count_statements(db_session, args: list[str]) -> int:
+    statements = []
+
+    def count(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    db_session.expunge_all()
+    sqla.event.listen(db_session.bind, "before_cursor_execute", count)
+    try:
+        result = CliRunner().invoke(main, args)
+    finally:
+        sqla.event.remove(db_session.bind, "before_cursor_execute", count)
+    assert result.exit_code == 0, result.output
+    return len(statements)
+
+
+@pytest.mark.parametrize(
+    "args",
+    [["list", "matches"], ["list", "results"], ["upcoming", "1", "--unit", "months"], ["calendar"]],
+)
+def test_listing_query_count(db_session, matchdate, match_result, args):
+    db_session.add_all([matchdate, match_result])
+    db_session.commit()
+    add_matches(db_session, 2)
+    few = count_statements(db_session, args)
+    add_matches(db_session, 20)
+    assert count_statements(db_session, args) == few
+
+
+@pytest.mark.parametrize("args", [["show", "team", "BC Zürich-Affoltern 1"], ["show", "location", "Badcity"]])
+def test_show(db_session, matchdate, args):
+    db_session.add(matchdate)
+    db_session.commit()
+    result = CliRunner().invoke(main, args)
+    assert result.exit_code == 0, result.output
+
+
+@pytest.mark.parametrize(
+    "args", [["list", "urls"], ["list", "locations"], ["list", "players"], ["list", "seasons"]]
+)
+def test_list(db_session, matchdate, anas, args):
+    db_session.add_all([matchdate, anas])
+    db_session.commit()
+    result = CliRunner().invoke(main, args)
+    assert result.exit_code == 0, result.output
+
+
+def test_graph_affi_players(db_session, match_result):
+    db_session.add(match_result)
+    db_session.commit()
+    result = CliRunner().invoke(main, ["graph", "affi-players"])
+    assert result.exit_code == 0, result.output
+    assert "Anders Antonsen" in result.output
+
+
+def test_graph_connect(db_session, match_result, tmp_path, monkeypatch):
+    db_session.add(match_result)
+    db_session.commit()
+    monkeypatch.setattr(settings, "get_crawl_datadir", lambda: tmp_path)
+    result = CliRunner().invoke(main, ["graph", "connect", "Anders Antonsen", "Kodai Naraoke"])
+    assert result.exit_code == 0, result.output
+    assert result.output.strip() == "Anders Antonsen - Kodai Naraoke"
+    result = CliRunner().invoke(main, ["graph", "connect", "Anders Antonsen", "Nobody"])
+    assert result.exit_code == 2
+
+
+def test_list_players_by_team(db_session, match_result):
+    db_session.add(match_result)
+    db_session.commit()
+    team_name = match_result.match_date.home_team.name
+    season_name = match_result.match_date.season.name
+    result = CliRunner().invoke(main, ["list", "players", "--by-team", team_name])
+    assert result.exit_code == 0, result.output
+    assert f"Season {season_name}:" in result.output
+    assert "Anders Antonsen" in result.output
+    assert "Kodai Naraoke" not in result.output
+
+
+def test_simulate(db_session, match_result):
+    db_session.add(match_result)
+    db_session.commit()
+    result = CliRunner().invoke(main, ["simulate", "1", "--runs", "10", "--workers", "1"])
+    assert result.exit_code == 0, result.output
+    assert "0 matches left, 10 simulations" in result.output
+    assert "100.0%" in result.output
+
+
+def test_standings(db_session, match_result):
+    matchdate = match_result.match_date
+    for team in (matchdate.home_team, matchdate.away_team):
+        team.draws.append(matchdate.draw)
+    db_session.add(match_result)
+    db_session.commit()
+    standings.update(db_session, matchdate, None, standings.Outcome.of(matchdate))
+    db_session.commit()
+    result = CliRunner().invoke(main, ["standings", "1"])
+    assert result.exit_code == 0, result.output
+    first, second = result.output.splitlines()[2:]
+    assert first.split()[:5] == ["1", "BC", "Zürich-Affoltern", "1", "1"]
+    assert second.split()[:5] == ["2", "BC", "Zürich-Affoltern", "2", "1"]
+
+
+def test_results_load_stream(db_session, monkeypatch):
+    from matchdates.cli import results
+
+    crawls = []
+    monkeypatch.setattr(results, "recrawl", lambda matches, **kwargs: crawls.append(kwargs))
+    result = CliRunner().invoke(main, ["results", "load", "--all", "--stream"])
+    assert result.exit_code == 0, result.output
+    assert crawls == [{"conditional": True, "stream": True}]
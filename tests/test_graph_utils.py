@@ -0,0 +1,68 @@
+import pendulum
+import sqlalchemy as sqla
+
+from matchdates import common_data, graph_utils, orm
+from matchdates.orm.graph import PlayedMatch, PlayedTeamMatch
+
+
+def links(session) -> set[tuple[str, common_data.ResultCategory, str, bool, bool | None]]:
+    return set(
+        session.execute(
+            sqla.select(
+                orm.Player.name, PlayedMatch.category, orm.Team.name, PlayedMatch.home, PlayedMatch.won
+            )
+            .join(orm.Player, orm.Player.id == PlayedMatch.player_id)
+            .join(orm.Team, orm.Team.id == PlayedMatch.team_id)
+        ).all()
+    )
+
+
+def test_update_results(db_session, match_result):
+    db_session.add(match_result)
+    db_session.commit()
+    home, away = match_result.match_date.home_team.name, match_result.match_date.away_team.name
+
+    assert graph_utils.update_results(db_session) == 1
+    played = links(db_session)
+    assert ("Anders Antonsen", common_data.ResultCategory.HE1, home, True, True) in played
+    assert ("Kodai Naraoke", common_data.ResultCategory.HE1, away, False, False) in played
+    assert {
+        (name, team) for name, category, team, *_ in played
+        if category == common_data.ResultCategory.HD1
+    } == {
+        ("Anders Antonsen", home),
+        ("Victor Axelsen", home),
+        ("Kodai Naraoke", away),
+        ("Yuta Watanabe", away),
+    }
+    team_matches = db_session.scalars(sqla.select(PlayedTeamMatch)).all()
+    assert len(team_matches) == len({name for name, *_ in played})
+
+    assert graph_utils.update_results(db_session) == 0
+
+    match_result.fetched_date_time = pendulum.now()
+    db_session.commit()
+    assert graph_utils.update_results(db_session) == 1
+    assert links(db_session) == played
+
+
+def test_players_by_club(db_session, match_result):
+    db_session.add(match_result)
+    db_session.commit()
+    graph_utils.update_results(db_session)
+    players = {p.player_name: p for p in graph_utils.players_by_club("BC Zürich-Affoltern 1")}
+    assert players["Anders Antonsen"].team_names == {"BC Zürich-Affoltern 1"}
+    assert players["Anders Antonsen"].played == 2
+    assert "Kodai Naraoke" not in players
+
+
+def test_update_results_incomplete_pair(db_session, doubles_result, match_result, anas):
+    doubles_result.home_pair_result.doubles_pair = orm.DoublesPair(players={anas})
+    db_session.add(match_result)
+    db_session.commit()
+
+    assert graph_utils.update_results(db_session) == 1
+    assert {
+        (name, home) for name, category, _, home, _ in links(db_session)
+        if category == common_data.ResultCategory.HD1
+    } == {("Kodai Naraoke", False), ("Yuta Watanabe", False)}
@@ -0,0 +1,47 @@
+import pathlib
+
+import pytest
+import sqlalchemy as sqla
+from alembic import command
+from alembic.config import Config
+
+from matchdates import orm
+
+
+ROOT = pathlib.Path(__file__).parents[1]
+
+
+@pytest.fixture
+def migrated_db(tmp_path):
+    ctx = orm.db.DbContext.push(f"sqlite:///{tmp_path / 'matchdates.sqlite'}")
+    # without the ini file alembic leaves the logging configuration alone
+    config = Config()
+    config.set_main_option("script_location", str(ROOT / "alembic"))
+    yield config, ctx.engine
+    orm.db.DbContext.pop()
+
+
+def test_doubles_pair_key_merges_duplicates(migrated_db):
+    config, engine = migrated_db
+    command.upgrade(config, "5c0e1f7a9b21")
+    with engine.begin() as connection:
+        for statement in [
+            "INSERT INTO player (id, url, name) VALUES (1, 'player/1', 'A'), (2, 'player/2', 'B')",
+            "INSERT INTO doubles_pair (id) VALUES (1), (2)",
+            "INSERT INTO player_doubles_association VALUES (1, 1), (1, 2), (2, 1), (2, 2)",
+            "INSERT INTO pair_teams_association (team_id, pair_id) VALUES (2, 1), (2, 2)",
+            "INSERT INTO home_pair_result (doubles_pair_id, doubles_result_id) VALUES (2, 1)",
+            "INSERT INTO away_pair_result (doubles_pair_id, doubles_result_id) VALUES (1, 2)",
+        ]:
+            connection.execute(sqla.text(statement))
+
+    command.upgrade(config, "8d3b6a2f41c7")
+    with engine.connect() as connection:
+        def rows(query):
+            return connection.execute(sqla.text(query)).all()
+
+        assert rows("SELECT id, player_a_id, player_b_id FROM doubles_pair") == [(1, 1, 2)]
+        assert rows("SELECT doubles_pair_id FROM home_pair_result") == [(1,)]
+        assert rows("SELECT doubles_pair_id FROM away_pair_result") == [(1,)]
+        assert rows("SELECT team_id, pair_id FROM pair_teams_association") == [(2, 1)]
+        assert rows("SELECT count(*) FROM player_doubles_association") == [(2,)]
@@ -0,0 +1,64 @@
+import pendulum
+
+from matchdates import common_data, orm, participation
+
+
+def test_by_team_and_season(db_session, match_result):
+    db_session.add(match_result)
+    db_session.commit()
+    matchdate = match_result.match_date
+    matrix = participation.ParticipationMatrix.build(db_session)
+    assert list(matrix.match_ids) == [matchdate.id]
+
+    counts = matrix.by_team_and_season()
+    assert set(counts) == {
+        (matchdate.home_team_id, matchdate.season_id),
+        (matchdate.away_team_id, matchdate.season_id),
+    }
+    home = counts[matchdate.home_team_id, matchdate.season_id]
+    anas = next(player for player in matchdate.home_team.players if player.name.startswith("Anders"))
+    assert home[anas.id] == participation.PlayerCounts(
+        events_for_team=1, events_total=1, matches_for_team=2, matches_total=2
+    )
+    # every singles result has one home player, every doubles result two
+    assert sum(player.matches_for_team for player in home.values()) == len(
+        matchdate.singles_results
+    ) + 2 * len(matchdate.doubles_results)
+
+
+def test_player_in_two_teams_and_seasons(db_session, match_result, team2, anas, location):
+    db_session.add(match_result)
+    matchdate = match_result.match_date
+    next_season = orm.Season(
+        name="Test Season 2025-26",
+        url="season/12346",
+        start_date=pendulum.Date(2025, 8, 1),
+        end_date=pendulum.Date(2026, 5, 31),
+    )
+    # anas moved to the second team, which plays at home the next season
+    moved = orm.MatchDate(
+        url="match/2",
+        date_time=pendulum.datetime(2025, 10, 1, 19),
+        location=location,
+        home_team=team2,
+        away_team=matchdate.home_team,
+        season=next_season,
+    )
+    singles = orm.result.SinglesResult(match_date=moved, category=common_data.ResultCategory.HE1)
+    orm.result.HomePlayerResult(player=anas, singles_result=singles, win=True)
+    incomplete = orm.result.DoublesResult(match_date=moved, category=common_data.ResultCategory.HD1)
+    orm.result.HomePairResult(
+        doubles_pair=orm.DoublesPair(players={anas}), doubles_result=incomplete
+    )
+    db_session.add_all([next_season, moved])
+    db_session.commit()
+
+    counts = participation.ParticipationMatrix.build(db_session).by_team_and_season()
+    first = counts[matchdate.home_team_id, matchdate.season_id][anas.id]
+    second = counts[team2.id, next_season.id][anas.id]
+    assert first == participation.PlayerCounts(
+        events_for_team=1, events_total=2, matches_for_team=2, matches_total=3
+    )
+    assert second == participation.PlayerCounts(
+        events_for_team=1, events_total=2, matches_for_team=1, matches_total=3
+    )
@@ -0,0 +1,112 @@
+import pendulum
+
+from matchdates import orm, queries
+
+
+def make_match(nr: int, date_time: pendulum.DateTime, template: orm.MatchDate) -> orm.MatchDate:
+    return orm.MatchDate(
+        url=f"team-match/{nr}",
+        date_time=date_time,
+        location=template.location,
+        home_team=template.home_team,
+        away_team=template.away_team,
+        season=template.season,
+        draw=template.draw,
+    )
+
+
+def make_result(
+    match: orm.MatchDate,
+    fetched: pendulum.DateTime | None,
+    checked: pendulum.DateTime | None = None,
+) -> orm.MatchResult:
+    return orm.MatchResult(
+        match_date=match,
+        winner=orm.result.WinningTeam.HOME,
+        walkover=False,
+        home_points=2,
+        away_points=1,
+        fetched_date_time=fetched,
+        checked_date_time=checked,
+    )
+
+
+def test_matches_needing_results(db_session, matchdate):
+    now = pendulum.datetime(2025, 1, 31, 12)
+    played = pendulum.datetime(2025, 1, 10, 19)
+    no_result = make_match(1, played, matchdate)
+    settling = make_match(2, played, matchdate)
+    settled = make_match(3, played, matchdate)
+    never_stamped = make_match(4, played, matchdate)
+    future = make_match(5, now + pendulum.duration(days=3), matchdate)
+    checked_unchanged = make_match(6, played, matchdate)
+    db_session.add_all(
+        [no_result, settling, settled, never_stamped, future, checked_unchanged, matchdate]
+    )
+    db_session.add_all([
+        make_result(settling, played + pendulum.duration(days=1)),
+        make_result(settled, played + pendulum.duration(days=10)),
+        make_result(never_stamped, None),
+        make_result(
+            checked_unchanged,
+            played + pendulum.duration(days=1),
+            checked=played + pendulum.duration(days=10),
+        ),
+    ])
+    db_session.commit()
+
+    selected = queries.matches_needing_results(matchdate.season, settle_days=7, now=now)
+    assert [m.url for m in selected] == ["team-match/1", "team-match/2", "team-match/4"]
+
+
+def test_league_clashes(db_session, matchdate, team1, team2, club, season):
+    team3 = orm.Team(name="BC Zürich-Affoltern 3", url="team/3", team_nr=3, club=club, seasons=[season])
+    evening = pendulum.datetime(2024, 11, 5, 19)
+    first = make_match(1, evening, matchdate)
+    second = make_match(2, evening + pendulum.duration(hours=2), matchdate)
+    second.away_team = team3
+    other_day = make_match(3, evening + pendulum.duration(days=1), matchdate)
+    db_session.add_all([first, second, other_day, team3])
+    db_session.commit()
+
+    clashes = queries.league_clashes(evening)
+    assert list(clashes) == [team1.name]
+    [clash] = clashes[team1.name]
+    assert clash.day.date() == evening.date()
+    assert sorted(m.url for m in clash.matches) == ["team-match/1", "team-match/2"]
+    assert clash.severity is queries.MatchClashSeverity.UNPLAYABLE
+
+    def clash_urls(clashes):
+        return [sorted(m.url for m in clash.matches) for clash in clashes]
+
+    expected = {name: clash_urls(team_clashes) for name, team_clashes in clashes.items()}
+    assert {
+        team.name: clash_urls(team_clashes)
+        for team in (team1, team2, team3)
+        if (team_clashes := list(queries.match_clashes(team, evening)))
+    } == expected
+
+
+def test_player_clashes(db_session, matchdate, team1, team2, club, season):
+    team3 = orm.Team(name="BC Zürich-Affoltern 3", url="team/3", team_nr=3, club=club, seasons=[season])
+    team4 = orm.Team(name="BC Zürich-Affoltern 4", url="team/4", team_nr=4, club=club, seasons=[season])
+    evening = pendulum.datetime(2024, 11, 5, 19)
+    first = make_match(1, evening, matchdate)
+    second = make_match(2, evening + pendulum.duration(hours=1), matchdate)
+    second.home_team, second.away_team = team3, team4
+    other_day = make_match(3, evening + pendulum.duration(days=1), matchdate)
+    other_day.home_team, other_day.away_team = team3, team4
+    # plays for both teams of the same match, which is not a clash
+    both_sides = orm.Player(url="player/1", name="Both Sides", teams=[team1, team2])
+    double_booked = orm.Player(url="player/2", name="Double Booked", teams=[team1, team3])
+    single_team = orm.Player(url="player/3", name="Single Team", teams=[team4])
+    db_session.add_all([first, second, other_day, team3, team4, both_sides, double_booked, single_team])
+    db_session.commit()
+
+    clashes = queries.player_clashes(evening)
+    assert list(clashes) == ["Double Booked"]
+    [clash] = clashes["Double Booked"]
+    assert clash.day.date() == evening.date()
+    assert clash.team_names == [team1.name, team3.name]
+    assert [m.url for m in clash.matches] == ["team-match/1", "team-match/2"]
+    assert clash.severity is queries.MatchClashSeverity.UNPLAYABLE
@@ -0,0 +1,88 @@
+import pendulum
+import pytest
+import sqlalchemy as sqla
+
+from matchdates import orm
+
+
+def query_plan(session: sqla.orm.Session, stmt: sqla.Select) -> list[str]:
+    """The ``EXPLAIN QUERY PLAN`` details of the SQL that ``stmt`` executes."""
+    captured = []
+
+    def capture(conn, cursor, statement, parameters, *args):
+        captured.append((statement, parameters))
+
+    sqla.event.listen(session.bind, "before_cursor_execute", capture)
+    try:
+        session.execute(stmt).all()
+    finally:
+        sqla.event.remove(session.bind, "before_cursor_execute", capture)
+    statement, parameters = captured[0]
+    return [
+        row[3] for row in
+        session.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+    ]
+
+
+def date_range() -> sqla.Select:
+    today = pendulum.today()
+    return orm.MatchDate.select().filter(
+        (orm.MatchDate.date_time >= today.naive())
+        & (orm.MatchDate.date_time <= today.add(days=7).naive())
+    )
+
+
+@pytest.mark.parametrize(
+    "stmt, index",
+    [
+        (date_range, "ix_matchdate_date_time"),
+        (
+            lambda: orm.MatchDate.select().filter(
+                orm.MatchDate.utc_epoch.between(0, orm.matchdate.epoch(pendulum.today()))
+            ),
+            "ix_matchdate_utc_epoch",
+        ),
+        (
+            lambda: orm.MatchDate.select().filter_by(local_date=pendulum.today().date()),
+            "ix_matchdate_local_date",
+        ),
+        (
+            lambda: orm.MatchDate.select().filter_by(url="team-match/1"),
+            "sqlite_autoindex_matchdate_1",
+        ),
+        (
+            lambda: orm.MatchDate.select().filter_by(home_team_id=1),
+            "ix_matchdate_home_team_id",
+        ),
+        (
+            lambda: orm.MatchDate.select().filter_by(away_team_id=1),
+            "ix_matchdate_away_team_id",
+        ),
+        (
+            lambda: sqla.select(orm.graph.PlayedMatch).filter_by(team_id=1),
+            "ix_played_match_team_id",
+        ),
+        (
+            lambda: sqla.select(orm.standing.Standing).filter_by(draw_id=1),
+            "sqlite_autoindex_standing_1",
+        ),
+        (
+            lambda: orm.MatchResult.select().filter_by(match_date_id=1),
+            "ix_match_result_match_date_id",
+        ),
+        (
+            lambda: orm.SinglesResult.select().filter_by(match_date_id=1),
+            "ix_singles_result_match_date_id",
+        ),
+        (
+            lambda: orm.DoublesResult.select().filter_by(match_date_id=1),
+            "ix_doubles_result_match_date_id",
+        ),
+    ],
+)
+def test_uses_index(db_session, matchdate, stmt, index):
+    db_session.add(matchdate)
+    db_session.commit()
+    plan = query_plan(db_session, stmt())
+    assert not [step for step in plan if step.startswith("SCAN")]
+    assert [step for step in plan if index in step]
@@ -0,0 +1,72 @@
+import array
+import datetime
+
+import pendulum
+import pytest
+import sqlalchemy as sqla
+
+from matchdates import orm, ratings
+from matchdates.orm.rating import PlayerRating
+
+
+def player_ratings(session) -> dict[str, ratings.Rating]:
+    names = dict(session.execute(sqla.select(orm.Player.id, orm.Player.name)).all())
+    return {names[id]: rating for id, rating in ratings.snapshot(session).items()}
+
+
+def test_rate_by_day():
+    day = datetime.date(2024, 9, 1).toordinal()
+    history = ratings.ResultHistory(
+        day=array.array("q", [day, day, day + 7]),
+        home_a=array.array("q", [1, 1, 1]),
+        home_b=array.array("q", [0, 2, 0]),
+        away_a=array.array("q", [3, 3, 3]),
+        away_b=array.array("q", [0, 4, 0]),
+        score=array.array("d", [1.0, 0.0, 1.0]),
+    )
+    current: dict[int, ratings.Rating] = {}
+    days = list(ratings.rate(history, current))
+
+    assert [day for day, _ in days] == [datetime.date(2024, 9, 1), datetime.date(2024, 9, 8)]
+    # both results of the first day are scored against the initial ratings
+    first = days[0][1]
+    assert first[1].rating == pytest.approx(ratings.INITIAL_RATING)
+    assert first[2].rating == pytest.approx(ratings.INITIAL_RATING - ratings.K_FACTOR / 2)
+    assert first[1].played == 2
+    assert set(days[1][1]) == {1, 3}
+    assert current[1].rating > current[3].rating
+
+
+def test_update(db_session, doubles_result, match_result):
+    db_session.add(match_result)
+    db_session.commit()
+
+    assert ratings.update(db_session) == 1
+    rated = player_ratings(db_session)
+    # won HE1 by the win flags, lost HD1 by sets
+    assert rated["Anders Antonsen"] == ratings.Rating(ratings.INITIAL_RATING, 2)
+    assert rated["Rasmus Gemke"].rating > ratings.INITIAL_RATING
+    assert rated["Endo Kirakawa"].rating < ratings.INITIAL_RATING
+    assert ratings.update(db_session) == 0
+
+    # fetching the same result again changes nothing
+    match_result.fetched_date_time = pendulum.now()
+    db_session.commit()
+    assert ratings.update(db_session) == 0
+
+    # HD1 now goes to the home pair
+    doubles_result.home_pair_result.set_3_points = 23
+    db_session.commit()
+    assert ratings.update(db_session) == 1
+    assert player_ratings(db_session)["Anders Antonsen"].rating > ratings.INITIAL_RATING
+    assert db_session.scalar(sqla.select(sqla.func.count()).select_from(PlayerRating)) == len(rated)
+
+
+def test_update_incomplete_pairs(db_session, doubles_result, match_result):
+    db_session.add(match_result)
+    incomplete = next(iter(doubles_result.home_pair_result.doubles_pair.players))
+    doubles_result.home_pair_result.doubles_pair = orm.DoublesPair(players={incomplete})
+    db_session.commit()
+
+    assert ratings.update(db_session) == 1
+    assert ratings.update(db_session) == 0
@@ -0,0 +1,38 @@
+from matchdates import format, readmodel
+
+
+def test_matches(db_session, matchdate, team1):
+    db_session.add(matchdate)
+    db_session.commit()
+    rows = readmodel.matches(db_session)
+    assert rows == [readmodel.MatchRow.from_match_date(matchdate)]
+    row = rows[0]
+    assert (row.home_team, row.away_team) == ("BC Zürich-Affoltern 1", "BC Zürich-Affoltern 2")
+    assert row.location == "Badcity Badminton Center"
+    assert row.local_date_time == matchdate.local_date_time
+    assert "local_date_time" in row._fields
+    assert row.full_url == matchdate.full_url
+    assert not hasattr(row, "__dict__")
+    assert readmodel.matches(db_session, readmodel.by_team(team1.id)) == rows
+    assert readmodel.matches(db_session, readmodel.by_team(team1.id + 100)) == []
+
+
+def test_match_table_unchanged(db_session, matchdate, match_result):
+    db_session.add_all([matchdate, match_result])
+    db_session.commit()
+    assert format.tabulate_match_rows(readmodel.matches(db_session)) == (
+        format.tabulate_match_dates([matchdate])
+    )
+    assert format.tabulate_result_rows(readmodel.results(db_session)) == (
+        format.tabulate_match_results([match_result])
+    )
+
+
+def test_listings(db_session, matchdate):
+    db_session.add(matchdate)
+    db_session.commit()
+    assert readmodel.match_urls(db_session) == ["/season/12345/match/1"]
+    assert readmodel.locations(db_session) == [
+        ("Badcity Badminton Center", matchdate.location.address)
+    ]
+    assert [s.url for s in readmodel.seasons(db_session)] == ["season/12345"]
@@ -0,0 +1,77 @@
+import pendulum
+
+from matchdates import orm, result_graph, sparse
+
+
+def player_ids(db_session) -> dict[str, int]:
+    return {player.name: player.id for player in orm.Player.all()}
+
+
+def test_csr_transpose():
+    csr = sparse.Csr.from_edges(3, [(0, 1), (0, 2), (2, 0)], weight=[5, 6, 7])
+    assert list(csr.neighbours(0)) == [1, 2]
+    assert list(csr.neighbours(1)) == []
+    reverse = csr.transpose(3)
+    assert [list(reverse.neighbours(node)) for node in range(3)] == [[2], [0], [0]]
+    assert list(reverse.data["weight"]) == [7, 5, 6]
+
+
+def test_queries(db_session, match_result):
+    db_session.add(match_result)
+    db_session.commit()
+    ids = player_ids(db_session)
+    graph = result_graph.ResultGraph.build(db_session)
+
+    anas, kodai, victor, yuta = (
+        ids[name]
+        for name in ["Anders Antonsen", "Kodai Naraoke", "Victor Axelsen", "Yuta Watanabe"]
+    )
+    assert {kodai, yuta} <= graph.opponents(anas)
+    assert victor not in graph.opponents(anas)
+    assert victor in graph.teammates(anas)
+    assert graph.partners(anas) == {victor}
+    assert graph.teams(anas) == {match_result.match_date.home_team.id}
+    assert graph.common_opponents(anas, victor) >= {kodai, yuta}
+    assert graph.teammates_of_teammates(anas) == set()
+    assert graph.shortest_connection(anas, kodai) == [anas, kodai]
+    assert graph.shortest_connection(anas, anas) == [anas]
+
+
+def test_players_without_results(db_session, doubles_result, match_result, team1):
+    newcomer = orm.Player(url="player/99", name="New Comer", teams=[team1])
+    # a pair is incomplete while only one of its players is known
+    doubles_result.home_pair_result.doubles_pair = orm.DoublesPair(players={newcomer})
+    db_session.add_all([match_result, newcomer])
+    db_session.commit()
+    anas = player_ids(db_session)["Anders Antonsen"]
+    graph = result_graph.ResultGraph.build(db_session)
+
+    assert graph.opponents(newcomer.id) == set()
+    assert graph.partners(newcomer.id) == set()
+    assert graph.teams(newcomer.id) == set()
+    assert graph.teammates_of_teammates(newcomer.id) == set()
+    assert graph.shortest_connection(anas, newcomer.id) is None
+
+
+def test_load_or_build(db_session, match_result, tmp_path):
+    db_session.add(match_result)
+    db_session.commit()
+    path = tmp_path / "graph.pickle"
+    built = result_graph.ResultGraph.load_or_build(path)
+    loaded = result_graph.ResultGraph.load(path)
+    assert loaded.player_matches == built.player_matches
+    assert loaded.player_nodes == built.player_nodes
+
+    # a newer data generation rebuilds the graph
+    match_result.fetched_date_time = pendulum.now()
+    orm.generation.bump(db_session)
+    db_session.commit()
+    assert result_graph.ResultGraph.load_or_build(path).generation == built.generation + 1
+
+
+def test_load_or_build_in_memory(db_session, match_result, tmp_path, monkeypatch):
+    monkeypatch.setattr(result_graph.settings, "get_crawl_datadir", lambda: tmp_path)
+    db_session.add(match_result)
+    db_session.commit()
+    assert result_graph.ResultGraph.load_or_build().player_ids
+    assert not list(tmp_path.iterdir())
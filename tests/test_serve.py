@@ -0,0 +1,65 @@
+import io
+import sys
+import threading
+
+from matchdates import client
+from matchdates.cli import serve
+
+
+def test_serve_command(db_session, matchdate, tmp_path):
+    db_session.add(matchdate)
+    db_session.commit()
+    season_name = matchdate.season.name
+    path = tmp_path / "mada.sock"
+    out, err = io.StringIO(), io.StringIO()
+    exit_codes = []
+
+    def run_client(argv):
+        exit_codes.append(client.send(client.connect(path), argv, stdout=out, stderr=err))
+
+    with serve.CommandServer(path) as server:
+        server.warm_up()
+        for argv in (["list", "seasons"], ["no-such-command"], ["serve"]):
+            thread = threading.Thread(target=run_client, args=(argv,))
+            thread.start()
+            server.handle_request()
+            thread.join()
+
+    assert not path.exists()
+    assert exit_codes == [0, 2, 2]
+    assert season_name in out.getvalue()
+    assert "No such command" in err.getvalue()
+    assert "can not start another daemon" in err.getvalue()
+
+
+def test_crawls_run_in_process(tmp_path, monkeypatch):
+    crawled = []
+    monkeypatch.setattr(serve.main, "main", lambda argv, **kwargs: crawled.append(argv))
+    path = tmp_path / "mada.sock"
+    exit_codes = []
+
+    def run_client(argv):
+        exit_codes.append(client.send(client.connect(path), argv))
+
+    with serve.CommandServer(path) as server:
+        for argv in (["reload", "--stream"], ["results", "load", "--allow-rescrape"]):
+            thread = threading.Thread(target=run_client, args=(argv,))
+            thread.start()
+            server.handle_request()
+            thread.join()
+
+    # the client runs both crawls itself, the daemon's reactor is never started
+    assert exit_codes == [None, None]
+    assert crawled == []
+
+
+def test_run_exit_message(tmp_path, monkeypatch):
+    monkeypatch.setattr(serve.main, "main", lambda *args, **kwargs: sys.exit("database is locked"))
+    messages = []
+    with serve.CommandServer(tmp_path / "mada.sock") as server:
+        assert server.run(["list", "seasons"], messages.append) == 1
+    assert messages == [{"err": "database is locked\n"}]
+
+
+def test_connect_without_daemon(tmp_path):
+    assert client.connect(tmp_path / "mada.sock") is None
@@ -0,0 +1,58 @@
+import os
+import pathlib
+
+from matchdates import settings
+
+
+SETTINGS_TOML = """
+[crawling]
+domain = "example.com"
+league_uuid = "LEAGUE"
+draws = [1, 2]
+datadir = "{datadir}"
+data_min_age = 10
+
+[crawling.cookies]
+st = "cookie"
+
+[display]
+club_name = "{club_name}"
+
+[database]
+sqlite_path = "~/mada.sqlite"
+"""
+
+
+def write_settings(path: pathlib.Path, club_name: str = "BC Test") -> pathlib.Path:
+    path.write_text(SETTINGS_TOML.format(datadir=path.parent / "data", club_name=club_name))
+    return path
+
+
+def test_typed_sections(tmp_path):
+    with settings.override(write_settings(tmp_path / "mada.toml")) as current:
+        assert current.crawling.draws == [1, 2]
+        assert current.crawling.cookies == {"st": "cookie"}
+        assert current.crawling.datadir == tmp_path / "data"
+        assert current.display.club_name == "BC Test"
+        assert current.database.sqlite_path == pathlib.Path("~/mada.sqlite").expanduser()
+        assert current.database.mongodb is None
+        assert settings.get_crawl_datadir().is_dir()
+
+
+def test_reload_on_change(tmp_path):
+    path = write_settings(tmp_path / "mada.toml")
+    with settings.override(path):
+        first = settings.get()
+        assert settings.get() is first
+
+        write_settings(path, club_name="BC Changed")
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        assert settings.get().display.club_name == "BC Changed"
+
+
+def test_override_restores(tmp_path):
+    before = settings.get_settings_file()
+    with settings.override(write_settings(tmp_path / "mada.toml")):
+        assert settings.get_settings_file() == tmp_path / "mada.toml"
+    assert settings.get_settings_file() == before
@@ -0,0 +1,86 @@
+import array
+
+import pendulum
+import pytest
+
+from matchdates import graph_utils, orm, ratings, simulation
+
+
+def team_nodes(db_session, state) -> dict[str, int]:
+    return {db_session.get(orm.Team, id).name: node for node, id in enumerate(state.team_ids)}
+
+
+@pytest.fixture
+def season_state(db_session, match_result):
+    matchdate = match_result.match_date
+    db_session.add_all(
+        [
+            match_result,
+            orm.MatchDate(
+                url="match/2",
+                date_time=matchdate.date_time + pendulum.duration(days=14),
+                location=matchdate.location,
+                home_team=matchdate.away_team,
+                away_team=matchdate.home_team,
+                season=matchdate.season,
+                draw=matchdate.draw,
+            ),
+        ]
+    )
+    db_session.commit()
+    graph_utils.update_results(db_session)
+    ratings.update(db_session)
+    return simulation.SeasonState.read(db_session, matchdate.draw)
+
+
+def test_points_table():
+    assert simulation.points_table(7) == [
+        (0, 3), (0, 3), (1, 2), (1, 2), (2, 1), (2, 1), (3, 0), (3, 0)
+    ]
+    assert simulation.points_table(4)[1] == (1, 3)
+
+
+def test_season_state(db_session, season_state):
+    nodes = team_nodes(db_session, season_state)
+    first, second = nodes["BC Zürich-Affoltern 1"], nodes["BC Zürich-Affoltern 2"]
+    assert (season_state.points[first], season_state.points[second]) == (2, 1)
+    assert (list(season_state.home), list(season_state.away)) == ([second], [first])
+    assert season_state.nr_categories == len(simulation.DEFAULT_CATEGORIES)
+    assert len(season_state.win_probability) == season_state.nr_categories
+    assert all(0 < probability < 1 for probability in season_state.win_probability)
+
+
+def test_simulate(db_session, season_state):
+    distribution = simulation.simulate(season_state, 200, workers=2, seed=1)
+    for team_id in season_state.team_ids:
+        assert sum(distribution.rank_probabilities(team_id)) == pytest.approx(1)
+    nodes = team_nodes(db_session, season_state)
+    first = season_state.team_ids[nodes["BC Zürich-Affoltern 1"]]
+    second = season_state.team_ids[nodes["BC Zürich-Affoltern 2"]]
+    assert distribution.expected_points(first) > distribution.expected_points(second)
+    assert 2 <= distribution.expected_points(first) <= 5
+    assert simulation.simulate(season_state, 200, workers=2, seed=1) == distribution
+
+
+def test_simulate_independent_of_workers(season_state):
+    runs = simulation.RUNS_PER_CHUNK * 2 + 1
+    assert simulation.simulate(season_state, runs, workers=1, seed=3) == simulation.simulate(
+        season_state, runs, workers=3, seed=3
+    )
+
+
+def test_ties_by_discipline_difference(season_state):
+    nr_teams = len(season_state.team_ids)
+    # no matches left, equal points: the discipline difference decides
+    tied = simulation.SeasonState(
+        team_ids=season_state.team_ids,
+        points=array.array("q", [3] * nr_teams),
+        disciplines=array.array("q", range(nr_teams)),
+        sets=array.array("q", [0] * nr_teams),
+        home=array.array("q"),
+        away=array.array("q"),
+        win_probability=array.array("d"),
+        nr_categories=season_state.nr_categories,
+    )
+    distribution = simulation.simulate(tied, 10, workers=1, seed=1)
+    assert distribution.rank_probabilities(season_state.team_ids[-1])[0] == 1